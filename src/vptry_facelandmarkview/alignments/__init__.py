@@ -5,11 +5,18 @@ This module provides different methods for aligning face landmarks,
 allowing users to experiment with different alignment strategies.
 """
 
+from functools import partial
 from typing import Callable, Optional
 import numpy as np
 import numpy.typing as npt
 
-from vptry_facelandmarkview.alignments.default import align_landmarks_default
+from vptry_facelandmarkview.alignments.common import AlignmentIndices
+from vptry_facelandmarkview.alignments.default import (
+    ProcrustesAligner,
+    align_landmarks_batch,
+    align_landmarks_default,
+    rigid_transforms_batch,
+)
 from vptry_facelandmarkview.alignments.scipy_procrustes import (
     align_landmarks_scipy_procrustes,
 )
@@ -20,7 +27,7 @@ AlignmentFunction = Callable[
     [
         npt.NDArray[np.float64],  # landmarks to align
         npt.NDArray[np.float64],  # base landmarks
-        Optional[set[int] | list[int]],  # optional alignment indices
+        Optional[AlignmentIndices],  # optional alignment indices
     ],
     npt.NDArray[np.float64],  # aligned landmarks
 ]
@@ -32,6 +39,14 @@ ALIGNMENT_METHODS: dict[str, AlignmentFunction] = {
     "anatomic0": align_landmarks_anatomic0,
 }
 
+# Aligner bound to fixed base landmarks: takes landmarks, returns aligned landmarks
+Aligner = Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]]
+
+# Methods that can precompute the base-side work once per base frame
+ALIGNER_CLASSES: dict[str, Callable[..., Aligner]] = {
+    "default": ProcrustesAligner,
+}
+
 # Default alignment method
 DEFAULT_ALIGNMENT_METHOD = "default"
 
@@ -51,6 +66,36 @@ def get_alignment_method(name: str) -> AlignmentFunction:
     return ALIGNMENT_METHODS[name]
 
 
+def create_aligner(
+    name: str,
+    base_landmarks: npt.NDArray[np.float64],
+    alignment_indices: Optional[AlignmentIndices] = None,
+) -> Aligner:
+    """Create an aligner for the named method bound to fixed base landmarks
+
+    Methods with an aligner class precompute the base-side work once; other
+    methods fall back to calling the alignment function each time.
+
+    Args:
+        name: Name of the alignment method
+        base_landmarks: Base landmarks to align to (n_points, 3)
+        alignment_indices: Optional landmark indices to use for alignment
+
+    Returns:
+        Callable taking landmarks (n_points, 3) and returning them aligned
+
+    Raises:
+        KeyError: If alignment method not found
+    """
+    if name in ALIGNER_CLASSES:
+        return ALIGNER_CLASSES[name](base_landmarks, alignment_indices)
+    return partial(
+        get_alignment_method(name),
+        base_landmarks=base_landmarks,
+        alignment_indices=alignment_indices,
+    )
+
+
 def get_available_alignment_methods() -> list[str]:
     """Get list of available alignment method names
 
@@ -62,11 +107,18 @@ def get_available_alignment_methods() -> list[str]:
 
 __all__ = [
     "AlignmentFunction",
+    "AlignmentIndices",
+    "Aligner",
     "ALIGNMENT_METHODS",
+    "ALIGNER_CLASSES",
     "DEFAULT_ALIGNMENT_METHOD",
+    "ProcrustesAligner",
+    "create_aligner",
     "get_alignment_method",
     "get_available_alignment_methods",
+    "align_landmarks_batch",
     "align_landmarks_default",
     "align_landmarks_scipy_procrustes",
     "align_landmarks_anatomic0",
+    "rigid_transforms_batch",
 ]
@@ -12,6 +12,10 @@ from typing import Optional
 import numpy as np
 import numpy.typing as npt
 
+from vptry_facelandmarkview.alignments.common import (
+    AlignmentIndices,
+    resolve_alignment_indices,
+)
 from vptry_facelandmarkview.constants import NOSE_LANDMARKS, ANATOMIC0_MIDPOINT_PAIRS
 
 logger = logging.getLogger(__name__)
@@ -20,7 +24,7 @@ logger = logging.getLogger(__name__)
 def align_landmarks_anatomic0(
     landmarks: npt.NDArray[np.float64],
     base_landmarks: npt.NDArray[np.float64],
-    alignment_indices: Optional[set[int] | list[int]] = None,
+    alignment_indices: Optional[AlignmentIndices] = None,
 ) -> npt.NDArray[np.float64]:
     """Align landmarks using anatomic0 method with nose landmarks and midpoints.
 
@@ -33,7 +37,7 @@ def align_landmarks_anatomic0(
     Args:
         landmarks: Landmarks to align (n_points, 3)
         base_landmarks: Base landmarks to align to (n_points, 3)
-        alignment_indices: Optional set or list of landmark indices to use for
+        alignment_indices: Optional set, list or tuple of landmark indices to use for
             calculating alignment. If provided, overrides the default anatomic0
             landmarks. If None, uses nose landmarks and computed midpoints.
 
@@ -52,16 +56,10 @@ def align_landmarks_anatomic0(
 
     # If alignment_indices is provided, use those instead of anatomic0 defaults
     if alignment_indices is not None:
-        # Convert to list if it's a set for indexing
-        indices_list = (
-            list(alignment_indices)
-            if isinstance(alignment_indices, set)
-            else alignment_indices
-        )
-
-        # Validate indices
+        # Validate indices and convert them to a (cached) index array
         max_idx = len(landmarks)
-        if any(idx < 0 or idx >= max_idx for idx in indices_list):
+        indices_list = resolve_alignment_indices(alignment_indices, max_idx)
+        if indices_list is None:
             logger.warning(
                 f"Invalid alignment indices provided (range: 0-{max_idx - 1}). "
                 "Using anatomic0 landmarks for alignment."
@@ -72,7 +70,8 @@ def align_landmarks_anatomic0(
             landmarks_for_alignment = landmarks[indices_list]
             base_for_alignment = base_landmarks[indices_list]
             logger.debug(
-                f"Using {len(indices_list)} custom landmarks for alignment calculation"
+                "Using %d custom landmarks for alignment calculation",
+                len(indices_list),
             )
             # Skip to alignment computation
             use_custom_indices = True
@@ -139,9 +138,11 @@ def align_landmarks_anatomic0(
             )
 
         logger.debug(
-            f"Using anatomic0 method with {len(anatomic_indices)} nose landmarks "
-            f"and {len(midpoint_landmarks)} midpoints "
-            f"(total: {len(landmarks_for_alignment)} points)"
+            "Using anatomic0 method with %d nose landmarks and %d midpoints "
+            "(total: %d points)",
+            len(anatomic_indices),
+            len(midpoint_landmarks),
+            len(landmarks_for_alignment),
         )
         use_custom_indices = False
 
@@ -159,17 +160,23 @@ def align_landmarks_anatomic0(
     U, _, Vt = np.linalg.svd(H)
 
     # Compute rotation matrix
-    # Need to handle reflection case
-    d = np.linalg.det(Vt.T @ U.T)
-    rotation = Vt.T @ np.diag([1, 1, d]) @ U.T
+    # Need to handle reflection case: flip the last row of Vt in place
+    # instead of multiplying in diag([1, 1, -1])
+    rotation = Vt.T @ U.T
+    if np.linalg.det(rotation) < 0:
+        Vt[-1] *= -1
+        rotation = Vt.T @ U.T
 
     # Apply rotation and translation to ALL original landmarks
-    all_landmarks_centered = landmarks - landmarks_center
-    aligned = (rotation @ all_landmarks_centered.T).T + base_center
+    # (row vectors, so R x becomes x @ R.T with no transposed copies)
+    aligned = (landmarks - landmarks_center) @ rotation.T
+    aligned += base_center
 
-    logger.debug(
-        f"Anatomic0 alignment: translation={base_center - landmarks_center}, "
-        f"rotation_det={np.linalg.det(rotation):.3f}"
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Anatomic0 alignment: translation=%s, rotation_det=%.3f",
+            base_center - landmarks_center,
+            np.linalg.det(rotation),
+        )
 
     return aligned
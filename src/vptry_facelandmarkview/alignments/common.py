@@ -0,0 +1,53 @@
+"""
+Helpers shared by the alignment methods.
+"""
+
+from functools import lru_cache
+from typing import Optional
+import numpy as np
+import numpy.typing as npt
+
+# Landmark indices accepted by the alignment functions
+AlignmentIndices = set[int] | list[int] | tuple[int, ...] | npt.NDArray[np.intp]
+
+
+@lru_cache(maxsize=32)
+def _index_array(indices: tuple[int, ...]) -> npt.NDArray[np.intp]:
+    """Build a read-only index array for a hashable tuple of landmark indices"""
+    index_array = np.array(indices, dtype=np.intp)
+    index_array.setflags(write=False)
+    return index_array
+
+
+def resolve_alignment_indices(
+    alignment_indices: AlignmentIndices, n_points: int
+) -> Optional[npt.NDArray[np.intp]]:
+    """Convert alignment indices to an index array usable for gathering landmarks
+
+    Index arrays are memoized on the (sorted, for sets) tuple of indices, so
+    passing the same constant (e.g. DEFAULT_ALIGNMENT_LANDMARKS) every frame
+    does not rebuild it.
+
+    Integer arrays are used as-is, without going through the cache.
+
+    Args:
+        alignment_indices: Set, list, tuple or integer array of landmark indices
+        n_points: Number of landmarks the indices will be applied to
+
+    Returns:
+        Index array, or None if any index is out of range for n_points
+    """
+    if isinstance(alignment_indices, np.ndarray):
+        index_array = alignment_indices
+    elif isinstance(alignment_indices, tuple):
+        index_array = _index_array(alignment_indices)
+    elif isinstance(alignment_indices, set):
+        index_array = _index_array(tuple(sorted(alignment_indices)))
+    else:
+        index_array = _index_array(tuple(alignment_indices))
+
+    if len(index_array) > 0 and (
+        index_array.min() < 0 or index_array.max() >= n_points
+    ):
+        return None
+    return index_array
@@ -9,13 +9,223 @@ from typing import Optional
 import numpy as np
 import numpy.typing as npt
 
+from vptry_facelandmarkview.alignments.common import (
+    AlignmentIndices,
+    resolve_alignment_indices,
+)
+from vptry_facelandmarkview.kernels import HAVE_NUMBA, kabsch_align
+
 logger = logging.getLogger(__name__)
 
 
+# Solve for the rotation with Horn's quaternion method; set to False to use
+# the SVD solution instead (e.g. to validate results)
+USE_HORN_QUATERNION = True
+
+
+def rotation_from_covariance_svd(H: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+    """Optimal rotation for a 3x3 cross-covariance matrix via SVD
+
+    Args:
+        H: Cross-covariance X^T Y of centered source X and target Y
+
+    Returns:
+        3x3 rotation matrix R minimizing sum |R x_i - y_i|^2
+    """
+    U, _, Vt = np.linalg.svd(H)
+
+    # Compute rotation matrix
+    # Need to handle reflection case: flip the last row of Vt in place
+    # instead of multiplying in diag([1, 1, -1])
+    rotation = Vt.T @ U.T
+    if np.linalg.det(rotation) < 0:
+        Vt[-1] *= -1
+        rotation = Vt.T @ U.T
+    return rotation
+
+
+def rotation_from_covariance_horn(
+    H: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """Optimal rotation for a 3x3 cross-covariance matrix via Horn's quaternion
+
+    The optimal unit quaternion is the eigenvector of the largest eigenvalue
+    of a symmetric 4x4 matrix built from H. A unit quaternion is always a
+    proper rotation, so no reflection fix-up is needed.
+
+    Args:
+        H: Cross-covariance X^T Y of centered source X and target Y
+
+    Returns:
+        3x3 rotation matrix R minimizing sum |R x_i - y_i|^2
+    """
+    if not H.any():
+        # No information about orientation (e.g. all points coincide); the
+        # eigenvector would be arbitrary, so match the SVD result instead
+        return np.eye(3)
+
+    (sxx, sxy, sxz), (syx, syy, syz), (szx, szy, szz) = H
+    N = np.array(
+        [
+            [sxx + syy + szz, syz - szy, szx - sxz, sxy - syx],
+            [syz - szy, sxx - syy - szz, sxy + syx, szx + sxz],
+            [szx - sxz, sxy + syx, -sxx + syy - szz, syz + szy],
+            [sxy - syx, szx + sxz, syz + szy, -sxx - syy + szz],
+        ]
+    )
+    # eigh returns eigenvalues in ascending order
+    _, eigenvectors = np.linalg.eigh(N)
+    w, x, y, z = eigenvectors[:, -1]
+    return np.array(
+        [
+            [w * w + x * x - y * y - z * z, 2 * (x * y - w * z), 2 * (x * z + w * y)],
+            [2 * (x * y + w * z), w * w - x * x + y * y - z * z, 2 * (y * z - w * x)],
+            [2 * (x * z - w * y), 2 * (y * z + w * x), w * w - x * x - y * y + z * z],
+        ]
+    )
+
+
+class ProcrustesAligner:
+    """Kabsch (Procrustes) alignment to a fixed set of base landmarks
+
+    Everything that depends only on the base landmarks (alignment subset,
+    center, centered subset) is computed once in __init__, so aligning many
+    frames to the same base only pays for the per-frame work.
+    """
+
+    def __init__(
+        self,
+        base_landmarks: npt.NDArray[np.float64],
+        alignment_indices: Optional[AlignmentIndices] = None,
+    ) -> None:
+        """
+        Args:
+            base_landmarks: Base landmarks to align to (n_points, 3)
+            alignment_indices: Optional set, list or tuple of landmark indices to use for
+                calculating alignment. If provided, only these landmarks are used
+                to compute the transformation, which is then applied to all landmarks.
+                If None, all landmarks are used for alignment calculation.
+        """
+        self.base_landmarks = base_landmarks
+        self.indices: Optional[npt.NDArray[np.intp]] = None
+
+        n_points = len(base_landmarks)
+        if n_points == 0:
+            return
+
+        # If alignment_indices is provided, use only those landmarks for computing alignment
+        base_for_alignment = base_landmarks
+        if alignment_indices is not None:
+            # Validate indices and convert them to a (cached) index array
+            self.indices = resolve_alignment_indices(alignment_indices, n_points)
+            if self.indices is None:
+                logger.warning(
+                    f"Invalid alignment indices provided (range: 0-{n_points - 1}). "
+                    "Using all landmarks for alignment."
+                )
+            elif len(self.indices) == 0:
+                logger.warning(
+                    "Empty alignment indices provided. "
+                    "Using all landmarks for alignment."
+                )
+                self.indices = None
+            else:
+                # Use only specified landmarks for alignment calculation
+                base_for_alignment = base_landmarks[self.indices]
+                logger.debug(
+                    f"Using {len(self.indices)} landmarks for alignment calculation"
+                )
+
+        self.base_center = base_for_alignment.mean(axis=0)
+        self.base_centered = base_for_alignment - self.base_center
+
+        # Inputs for the compiled kernel: float64 and contiguous; the index
+        # array is ignored when fitting on all landmarks
+        self._kernel_use_all = self.indices is None
+        self._kernel_indices = (
+            np.empty(0, dtype=np.intp) if self.indices is None else self.indices
+        )
+        self._kernel_base_centered = np.ascontiguousarray(
+            self.base_centered, dtype=np.float64
+        )
+        self._kernel_base_center = self.base_center.astype(np.float64)
+
+        # Reused gather buffer for the alignment subset (NumPy path)
+        self._subset_buf: Optional[npt.NDArray[np.floating]] = None
+
+    def __call__(self, landmarks: npt.NDArray[np.float64]) -> npt.NDArray[np.float64]:
+        """Align landmarks to the base landmarks
+
+        Args:
+            landmarks: Landmarks to align (n_points, 3)
+
+        Returns:
+            Aligned landmarks (n_points, 3)
+        """
+        if len(landmarks) == 0 or len(self.base_landmarks) == 0:
+            return landmarks
+
+        if len(landmarks) != len(self.base_landmarks):
+            logger.warning(
+                f"Landmark count mismatch: {len(landmarks)} vs {len(self.base_landmarks)}. "
+                "Returning unaligned landmarks."
+            )
+            return landmarks
+
+        if USE_HORN_QUATERNION and HAVE_NUMBA:
+            # Whole alignment in one compiled loop (numba installed)
+            return kabsch_align(
+                np.ascontiguousarray(landmarks),
+                self._kernel_indices,
+                self._kernel_use_all,
+                self._kernel_base_centered,
+                self._kernel_base_center,
+            )
+
+        if self.indices is None:
+            landmarks_for_alignment = landmarks
+            # Center the landmarks (the base side was centered in __init__)
+            landmarks_center = landmarks_for_alignment.mean(axis=0)
+            landmarks_centered = landmarks_for_alignment - landmarks_center
+        else:
+            # Gather the subset into a buffer reused across frames and
+            # center it in place
+            buf = self._subset_buf
+            if buf is None or buf.dtype != landmarks.dtype:
+                buf = np.empty((len(self.indices), 3), dtype=landmarks.dtype)
+                self._subset_buf = buf
+            landmarks_centered = np.take(landmarks, self.indices, axis=0, out=buf)
+            landmarks_center = landmarks_centered.mean(axis=0)
+            landmarks_centered -= landmarks_center
+
+        # Compute optimal rotation (Kabsch problem)
+        # H = X^T * Y where X is source (centered landmarks) and Y is target (centered base)
+        H = landmarks_centered.T @ self.base_centered
+        rotation = (
+            rotation_from_covariance_horn(H)
+            if USE_HORN_QUATERNION
+            else rotation_from_covariance_svd(H)
+        )
+
+        # Apply rotation and translation to ALL landmarks
+        # (row vectors, so R x becomes x @ R.T with no transposed copies)
+        aligned = (landmarks - landmarks_center) @ rotation.T
+        aligned += self.base_center
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Alignment: translation=%s, rotation_det=%.3f",
+                self.base_center - landmarks_center,
+                np.linalg.det(rotation),
+            )
+
+        return aligned
+
+
 def align_landmarks_default(
     landmarks: npt.NDArray[np.float64],
     base_landmarks: npt.NDArray[np.float64],
-    alignment_indices: Optional[set[int] | list[int]] = None,
+    alignment_indices: Optional[AlignmentIndices] = None,
 ) -> npt.NDArray[np.float64]:
     """Align landmarks to base landmarks using Procrustes alignment (Kabsch algorithm)
 
@@ -23,10 +233,13 @@ def align_landmarks_default(
     the optimal rigid transformation (translation + rotation) to align
     the landmarks to the base landmarks.
 
+    To align many frames to the same base, build a ProcrustesAligner once
+    and call it for each frame instead.
+
     Args:
         landmarks: Landmarks to align (n_points, 3)
         base_landmarks: Base landmarks to align to (n_points, 3)
-        alignment_indices: Optional set or list of landmark indices to use for
+        alignment_indices: Optional set, list or tuple of landmark indices to use for
             calculating alignment. If provided, only these landmarks are used
             to compute the transformation, which is then applied to all landmarks.
             If None, all landmarks are used for alignment calculation.
@@ -44,60 +257,117 @@ def align_landmarks_default(
         )
         return landmarks
 
-    # If alignment_indices is provided, use only those landmarks for computing alignment
-    if alignment_indices is not None:
-        # Convert to list if it's a set for indexing
-        indices_list = (
-            list(alignment_indices)
-            if isinstance(alignment_indices, set)
-            else alignment_indices
+    return ProcrustesAligner(base_landmarks, alignment_indices)(landmarks)
+
+
+def rigid_transforms_batch(
+    frames: npt.NDArray[np.float64],
+    base_landmarks: npt.NDArray[np.float64],
+    alignment_indices: Optional[AlignmentIndices] = None,
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """Rigid transforms aligning many frames to the same base landmarks
+
+    The centroids, cross-covariances and SVDs of all frames are computed
+    with batched NumPy calls. Once solved, aligning frame f is a single
+    ``frames[f] @ rotations[f].T + translations[f]``.
+
+    Args:
+        frames: Frames to align (n_frames, n_points, 3). Frames are not
+            NaN-filtered; a NaN among the fitted landmarks makes that
+            frame's transform NaN.
+        base_landmarks: Base landmarks to align to (n_points, 3)
+        alignment_indices: Optional landmark indices to use for alignment.
+            Empty or out-of-range indices fall back to all landmarks.
+
+    Returns:
+        Tuple of (rotations (n_frames, 3, 3), translations (n_frames, 3)).
+        Identity transforms are returned if there are no frames or
+        landmarks, or the landmark counts don't match.
+    """
+    n_frames = frames.shape[0]
+    identity = (
+        np.broadcast_to(np.eye(3), (n_frames, 3, 3)).copy(),
+        np.zeros((n_frames, 3)),
+    )
+    if n_frames == 0 or frames.shape[1] == 0:
+        return identity
+
+    if frames.shape[1] != len(base_landmarks):
+        logger.warning(
+            f"Landmark count mismatch: {frames.shape[1]} vs {len(base_landmarks)}. "
+            "Returning unaligned landmarks."
         )
+        return identity
 
-        # Validate indices
-        max_idx = len(landmarks)
-        if any(idx < 0 or idx >= max_idx for idx in indices_list):
+    indices = None
+    if alignment_indices is not None:
+        indices = resolve_alignment_indices(alignment_indices, frames.shape[1])
+        if indices is None:
             logger.warning(
-                f"Invalid alignment indices provided (range: 0-{max_idx - 1}). "
+                f"Invalid alignment indices provided (range: 0-{frames.shape[1] - 1}). "
                 "Using all landmarks for alignment."
             )
-            landmarks_for_alignment = landmarks
-            base_for_alignment = base_landmarks
-        else:
-            # Use only specified landmarks for alignment calculation
-            landmarks_for_alignment = landmarks[indices_list]
-            base_for_alignment = base_landmarks[indices_list]
-            logger.debug(
-                f"Using {len(indices_list)} landmarks for alignment calculation"
+        elif len(indices) == 0:
+            logger.warning(
+                "Empty alignment indices provided. Using all landmarks for alignment."
             )
-    else:
-        # Use all landmarks for alignment
-        landmarks_for_alignment = landmarks
-        base_for_alignment = base_landmarks
+            indices = None
 
-    # Center both sets of landmarks (for alignment calculation)
-    landmarks_center = landmarks_for_alignment.mean(axis=0)
-    base_center = base_for_alignment.mean(axis=0)
+    frames_fit = frames if indices is None else frames[:, indices]
+    base_fit = base_landmarks if indices is None else base_landmarks[indices]
 
-    landmarks_centered = landmarks_for_alignment - landmarks_center
-    base_centered = base_for_alignment - base_center
+    frame_centers = frames_fit.mean(axis=1)
+    base_center = base_fit.mean(axis=0)
 
-    # Compute optimal rotation using SVD (Kabsch algorithm)
-    # H = X^T * Y where X is source (centered landmarks) and Y is target (centered base)
-    H = landmarks_centered.T @ base_centered
+    # One 3x3 cross-covariance per frame (a single batched matmul, much
+    # faster than the equivalent einsum), then one batched SVD
+    frames_centered = frames_fit - frame_centers[:, np.newaxis]
+    H = np.swapaxes(frames_centered, 1, 2) @ (base_fit - base_center)
     U, _, Vt = np.linalg.svd(H)
 
-    # Compute rotation matrix
-    # Need to handle reflection case
-    d = np.linalg.det(Vt.T @ U.T)
-    rotation = Vt.T @ np.diag([1, 1, d]) @ U.T
+    # Handle the reflection case by flipping the last singular vector
+    d = np.sign(np.linalg.det(Vt.transpose(0, 2, 1) @ U.transpose(0, 2, 1)))
+    Vt[:, 2, :] *= d[:, np.newaxis]
+    rotations = Vt.transpose(0, 2, 1) @ U.transpose(0, 2, 1)
 
-    # Apply rotation and translation to ALL landmarks
-    all_landmarks_centered = landmarks - landmarks_center
-    aligned = (rotation @ all_landmarks_centered.T).T + base_center
+    # Row-vector form: aligned = (p - c) @ R.T + base_center
+    translations = base_center - np.einsum("fi,fji->fj", frame_centers, rotations)
+    return rotations, translations
 
-    logger.debug(
-        f"Alignment: translation={base_center - landmarks_center}, "
-        f"rotation_det={np.linalg.det(rotation):.3f}"
-    )
 
+def align_landmarks_batch(
+    frames: npt.NDArray[np.float64],
+    base_landmarks: npt.NDArray[np.float64],
+    alignment_indices: Optional[AlignmentIndices] = None,
+) -> npt.NDArray[np.float64]:
+    """Align many frames to the same base landmarks in one vectorized pass
+
+    Same result as calling align_landmarks_default per frame, but solved
+    for all frames at once with rigid_transforms_batch.
+
+    Args:
+        frames: Frames to align (n_frames, n_points, 3). Frames are not
+            NaN-filtered; a NaN among the fitted landmarks makes that whole
+            frame NaN.
+        base_landmarks: Base landmarks to align to (n_points, 3)
+        alignment_indices: Optional landmark indices to use for alignment
+
+    Returns:
+        Aligned frames (n_frames, n_points, 3)
+    """
+    if frames.shape[0] == 0 or frames.shape[1] == 0:
+        return frames
+
+    if frames.shape[1] != len(base_landmarks):
+        logger.warning(
+            f"Landmark count mismatch: {frames.shape[1]} vs {len(base_landmarks)}. "
+            "Returning unaligned landmarks."
+        )
+        return frames
+
+    rotations, translations = rigid_transforms_batch(
+        frames, base_landmarks, alignment_indices
+    )
+    aligned = frames @ rotations.transpose(0, 2, 1)
+    aligned += translations[:, np.newaxis]
     return aligned
@@ -10,13 +10,18 @@ import numpy as np
 import numpy.typing as npt
 from scipy.spatial import procrustes
 
+from vptry_facelandmarkview.alignments.common import (
+    AlignmentIndices,
+    resolve_alignment_indices,
+)
+
 logger = logging.getLogger(__name__)
 
 
 def align_landmarks_scipy_procrustes(
     landmarks: npt.NDArray[np.float64],
     base_landmarks: npt.NDArray[np.float64],
-    alignment_indices: Optional[set[int] | list[int]] = None,
+    alignment_indices: Optional[AlignmentIndices] = None,
 ) -> npt.NDArray[np.float64]:
     """Align landmarks to base landmarks using scipy's procrustes analysis
 
@@ -27,7 +32,7 @@ def align_landmarks_scipy_procrustes(
     Args:
         landmarks: Landmarks to align (n_points, 3)
         base_landmarks: Base landmarks to align to (n_points, 3)
-        alignment_indices: Optional set or list of landmark indices to use for
+        alignment_indices: Optional set, list or tuple of landmark indices to use for
             calculating alignment. If provided, only these landmarks are used
             to compute the transformation, which is then applied to all landmarks.
             If None, all landmarks are used for alignment calculation.
@@ -47,16 +52,10 @@ def align_landmarks_scipy_procrustes(
 
     # If alignment_indices is provided, use only those landmarks for computing alignment
     if alignment_indices is not None:
-        # Convert to list if it's a set for indexing
-        indices_list = (
-            list(alignment_indices)
-            if isinstance(alignment_indices, set)
-            else alignment_indices
-        )
-
-        # Validate indices
+        # Validate indices and convert them to a (cached) index array
         max_idx = len(landmarks)
-        if any(idx < 0 or idx >= max_idx for idx in indices_list):
+        indices_list = resolve_alignment_indices(alignment_indices, max_idx)
+        if indices_list is None:
             logger.warning(
                 f"Invalid alignment indices provided (range: 0-{max_idx - 1}). "
                 "Using all landmarks for alignment."
@@ -68,7 +67,7 @@ def align_landmarks_scipy_procrustes(
             landmarks_for_alignment = landmarks[indices_list]
             base_for_alignment = base_landmarks[indices_list]
             logger.debug(
-                f"Using {len(indices_list)} landmarks for alignment calculation"
+                "Using %d landmarks for alignment calculation", len(indices_list)
             )
     else:
         # Use all landmarks for alignment
@@ -88,7 +87,7 @@ def align_landmarks_scipy_procrustes(
         base_for_alignment, landmarks_for_alignment
     )
 
-    logger.debug(f"Scipy procrustes disparity: {disparity:.6f}")
+    logger.debug("Scipy procrustes disparity: %.6f", disparity)
 
     # Get the original base frame parameters for back-transformation
     base_center = base_for_alignment.mean(axis=0)
@@ -104,12 +103,14 @@ def align_landmarks_scipy_procrustes(
     aligned_subset = aligned_subset_std * base_norm + base_center
 
     logger.debug(
-        f"Transformed from standardized space (norm=1, center=0) back to base frame "
-        f"(norm={base_norm:.3f}, center={base_center})"
+        "Transformed from standardized space (norm=1, center=0) back to base frame "
+        "(norm=%.3f, center=%s)",
+        base_norm,
+        base_center,
     )
 
     # If we used a subset for alignment, apply the same transformation to all landmarks
-    if alignment_indices is not None and len(indices_list) < len(landmarks):
+    if len(landmarks_for_alignment) < len(landmarks):
         # We need to apply the same transformation that scipy.procrustes computed
         # to all landmarks, not just the subset.
 
@@ -139,7 +140,7 @@ def align_landmarks_scipy_procrustes(
         R = Vt.T @ np.diag([1, 1, d]) @ U.T
 
         # Compute the optimal scale (what scipy.procrustes computes)
-        scale = np.trace(base_normalized.T @ (R @ landmarks_normalized.T).T)
+        scale = np.trace(base_normalized.T @ (landmarks_normalized @ R.T))
 
         # Now apply the full transformation to ALL landmarks:
         # 1. Center at landmarks_center
@@ -152,10 +153,14 @@ def align_landmarks_scipy_procrustes(
         all_landmarks_normalized = all_landmarks_centered / landmarks_norm
         aligned = scale * (all_landmarks_normalized @ R.T) * base_norm + base_center
 
-        logger.debug(
-            f"Applied transformation to all {len(landmarks)} landmarks "
-            f"(scale={scale:.3f}, rotation det={np.linalg.det(R):.3f})"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Applied transformation to all %d landmarks "
+                "(scale=%.3f, rotation det=%.3f)",
+                len(landmarks),
+                scale,
+                np.linalg.det(R),
+            )
     else:
         # All landmarks were used for alignment
         aligned = aligned_subset
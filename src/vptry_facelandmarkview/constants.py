@@ -27,6 +27,13 @@ BACKGROUND_COLOR = (1.0, 1.0, 1.0, 1.0)  # White
 PERSPECTIVE_FOV = 45.0
 PERSPECTIVE_NEAR = 0.1
 PERSPECTIVE_FAR = 100.0
+# Driver point/line smoothing is a slow per-fragment path on most drivers,
+# so it is off unless explicitly requested
+SMOOTH_PRIMITIVES = False
+
+# Minimum time between widget updates while scrubbing the frame slider
+# (~one display refresh at 60 Hz)
+FRAME_UPDATE_INTERVAL_MS = 16
 
 # Projection widget constants
 PROJECTION_SIZE_PX = (
@@ -87,7 +94,7 @@ class DisplayState:
 # that remain relatively stable across facial expressions
 
 # Nose landmarks (stable across expressions)
-NOSE_LANDMARKS = [
+NOSE_LANDMARKS = (
     122,
     196,
     3,
@@ -112,26 +119,27 @@ NOSE_LANDMARKS = [
     198,
     131,
     115,
-]
+)
 
 # Forehead landmarks (very stable, minimal expression movement)
-FOREHEAD_LANDMARKS = [
+FOREHEAD_LANDMARKS = (
     109,
     10,
     338,
     108,
     151,
     357,
-]
+)
 
 # Combined stable landmarks for default alignment
+# (tuples so they cannot be mutated and can be used as cache keys)
 DEFAULT_ALIGNMENT_LANDMARKS = NOSE_LANDMARKS + FOREHEAD_LANDMARKS
 
 # Landmark pairs for anatomic0 alignment method
 # These pairs define midpoints used for stable anatomic alignment
-# Format: list of tuples where each tuple contains two landmark indices
-ANATOMIC0_MIDPOINT_PAIRS = [
+# Format: tuple of pairs where each pair contains two landmark indices
+ANATOMIC0_MIDPOINT_PAIRS = (
     (33, 133),  # Eye region midpoint
     (362, 263),  # Eye region midpoint
     # Space for additional midpoint pairs in the future
-]
+)
@@ -0,0 +1,213 @@
+"""
+Shared computation of NaN-filtered, aligned landmarks for a pair of frames.
+
+The projection and histogram widgets all need the same intermediate
+results for a given (base frame, current frame, alignment options) tuple.
+FrameDeltaModel computes them once and lets every widget reuse them.
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+import numpy.typing as npt
+
+from vptry_facelandmarkview.constants import DEFAULT_ALIGNMENT_LANDMARKS
+from vptry_facelandmarkview.kernels import sq_distances as sq_distances_kernel
+from vptry_facelandmarkview.kernels import valid_mask as valid_mask_kernel
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, eq=False)
+class FrameDelta:
+    """Filtered and aligned landmarks for a (base, current) frame pair
+
+    Instances compare by identity, so they can be used in cache keys.
+
+    Attributes:
+        base_valid: Valid base landmarks (n_base_valid, 3)
+        current_aligned: Valid current landmarks, aligned if enabled
+        base_both: Base landmarks valid in both frames (n_both, 3)
+        current_both: Matching current landmarks, aligned if enabled
+        sq_distances: Squared distances from base_both to current_both
+    """
+
+    base_valid: npt.NDArray[np.float32]
+    current_aligned: npt.NDArray[np.float32]
+    base_both: npt.NDArray[np.float32]
+    current_both: npt.NDArray[np.float32]
+    sq_distances: npt.NDArray[np.float32]
+
+
+class FrameDeltaModel:
+    """Memoizes FrameDelta results for the most recently used frame pairs"""
+
+    def __init__(self, maxsize: int = 4) -> None:
+        self._source: Optional[npt.NDArray[np.floating]] = None
+        self._data: Optional[npt.NDArray[np.float32]] = None
+        self._valid: Optional[npt.NDArray[np.bool_]] = None
+        self._maxsize = maxsize
+        self._cache: OrderedDict[tuple, Optional[FrameDelta]] = OrderedDict()
+
+        # Aligner for the most recent (base frame, method, indices), so frame
+        # changes don't redo the base-side alignment work
+        self._aligner_key: Optional[tuple] = None
+        self._aligner = None
+
+    @property
+    def data(self) -> Optional[npt.NDArray[np.float32]]:
+        """Landmark data as a contiguous float32 array"""
+        return self._data
+
+    def set_data(
+        self,
+        data: npt.NDArray[np.floating],
+        valid_mask: Optional[npt.NDArray[np.bool_]] = None,
+    ) -> None:
+        """Set the landmark data, dropping cached results if it changed
+
+        Setting the same array again is a no-op, so several widgets sharing
+        one model can all forward their set_data calls to it.
+
+        Args:
+            data: Landmark data (n_frames, n_landmarks, 3)
+            valid_mask: Optional precomputed (n_frames, n_landmarks) mask of
+                landmarks without NaN; computed here if not given
+        """
+        if data is self._source:
+            return
+        self._source = data
+        self._data = np.ascontiguousarray(data, dtype=np.float32)
+        # NaN masks for every frame at once, so a frame change is a row lookup
+        n_frames, n_landmarks = self._data.shape[:2]
+        if valid_mask is not None and valid_mask.shape == (n_frames, n_landmarks):
+            self._valid = valid_mask
+        else:
+            self._valid = valid_mask_kernel(self._data.reshape(-1, 3)).reshape(
+                n_frames, n_landmarks
+            )
+        self._cache.clear()
+        self._aligner_key = None
+        self._aligner = None
+
+    def get(
+        self,
+        base_frame: int,
+        current_frame: int,
+        align_faces: bool,
+        use_static_points: bool,
+        alignment_method: str,
+        alignment_landmarks: Optional[list[int]],
+    ) -> Optional[FrameDelta]:
+        """Get filtered/aligned landmarks for the given frames and options
+
+        Returns:
+            FrameDelta, or None if there is no data or no valid base landmarks
+        """
+        if self._data is None:
+            return None
+
+        alignment_indices = None
+        if align_faces and use_static_points:
+            alignment_indices = (
+                alignment_landmarks
+                if alignment_landmarks is not None
+                else DEFAULT_ALIGNMENT_LANDMARKS
+            )
+
+        key = (
+            base_frame,
+            current_frame,
+            alignment_method if align_faces else None,
+            None if alignment_landmarks is None else tuple(alignment_landmarks),
+            use_static_points and align_faces,
+        )
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        delta = self._compute(
+            base_frame,
+            current_frame,
+            alignment_method if align_faces else None,
+            alignment_indices,
+            key[3:],
+        )
+        self._cache[key] = delta
+        if len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+        return delta
+
+    def _compute(
+        self,
+        base_frame: int,
+        current_frame: int,
+        alignment_method: Optional[str],
+        alignment_indices,
+        indices_key: tuple,
+    ) -> Optional[FrameDelta]:
+        """Run the filter/align/diff pipeline for one frame pair"""
+        base_landmarks = self._data[base_frame]
+        current_landmarks = self._data[current_frame]
+
+        base_valid_mask = self._valid[base_frame]
+        current_valid_mask = self._valid[current_frame]
+        base_valid = base_landmarks[base_valid_mask]
+        current_valid = current_landmarks[current_valid_mask]
+
+        if len(base_valid) == 0:
+            logger.warning("No valid base landmarks for frame delta")
+            return None
+
+        # Select from the already-filtered arrays rather than the full frames
+        base_both = base_valid[current_valid_mask[base_valid_mask]]
+        current_both = current_valid[base_valid_mask[current_valid_mask]]
+
+        current_aligned = current_valid
+        if alignment_method is not None:
+            # Import alignment method
+            from vptry_facelandmarkview.alignments import create_aligner
+
+            aligner_key = (base_frame, alignment_method, indices_key)
+            if self._aligner_key != aligner_key:
+                self._aligner = create_aligner(
+                    alignment_method, base_valid, alignment_indices
+                )
+                self._aligner_key = aligner_key
+
+            if len(current_valid) > 0:
+                current_aligned = self._aligner(current_valid)
+
+            if len(current_both) == len(current_valid) and len(base_both) == len(
+                base_valid
+            ):
+                # Same landmarks valid in both frames: nothing new to align
+                current_both = current_aligned
+            elif len(current_both) > 0:
+                current_both = create_aligner(
+                    alignment_method, base_both, alignment_indices
+                )(current_both)
+
+        sq_distances = sq_distances_kernel(
+            np.ascontiguousarray(base_both),
+            np.ascontiguousarray(current_both, dtype=base_both.dtype),
+        )
+
+        logger.debug(
+            "Computed frame delta for frames %d -> %d: %d base, %d current, %d in both",
+            base_frame,
+            current_frame,
+            len(base_valid),
+            len(current_valid),
+            len(base_both),
+        )
+        return FrameDelta(
+            base_valid=base_valid,
+            current_aligned=current_aligned,
+            base_both=base_both,
+            current_both=current_both,
+            sq_distances=sq_distances,
+        )
@@ -10,13 +10,12 @@ import numpy as np
 import numpy.typing as npt
 from PySide6.QtWidgets import QWidget
 from PySide6.QtCore import Qt, QPoint
+from PySide6.QtGui import QSurfaceFormat
 from PySide6.QtOpenGLWidgets import QOpenGLWidget
 import OpenGL.GL as gl
-import OpenGL.GLU as glu
 
 from vptry_facelandmarkview.constants import (
     SCALE_MARGIN,
-    DEFAULT_ALIGNMENT_LANDMARKS,
     BASE_LANDMARK_COLOR,
     CURRENT_LANDMARK_COLOR,
     VECTOR_COLOR,
@@ -24,6 +23,7 @@ from vptry_facelandmarkview.constants import (
     AXIS_Y_COLOR,
     AXIS_Z_COLOR,
     DisplayState,
+    SMOOTH_PRIMITIVES,
     DEFAULT_ROTATION_X,
     DEFAULT_ROTATION_Y,
     DEFAULT_ZOOM,
@@ -41,9 +41,13 @@ from vptry_facelandmarkview.constants import (
     PERSPECTIVE_FAR,
 )
 from vptry_facelandmarkview.utils import (
-    filter_nan_landmarks,
+    DEFAULT_ALIGNMENT_INDICES,
     calculate_center_and_scale,
+    camera_matrix,
     draw_landmarks,
+    perspective_matrix,
+    scale_landmarks_for_display,
+    valid_landmark_mask,
 )
 
 logger = logging.getLogger(__name__)
@@ -54,30 +58,68 @@ class LandmarkGLWidget(QOpenGLWidget):
 
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
-        self.data: Optional[npt.NDArray[np.float64]] = None
+
+        # Request a lean framebuffer: points and lines don't need MSAA or a
+        # stencil buffer, and skipping the multisample resolve saves
+        # framebuffer traffic every frame
+        fmt = QSurfaceFormat()
+        fmt.setDepthBufferSize(24)
+        fmt.setStencilBufferSize(0)
+        fmt.setSamples(0)
+        fmt.setSwapInterval(1)
+        self.setFormat(fmt)
+
+        self.data: Optional[npt.NDArray[np.float32]] = None
+        # Per-frame landmark validity (n_frames, n_landmarks)
+        self._valid_mask: Optional[npt.NDArray[np.bool_]] = None
         self.state = DisplayState()
 
+        # Base frame view transform, cached until the base frame or data change
+        self._base_center: Optional[npt.NDArray[np.float32]] = None
+        self._base_scale: float = 1.0
+        self._base_scaled: Optional[npt.NDArray[np.float32]] = None
+
         # Camera controls
         self.rotation_x: float = DEFAULT_ROTATION_X
         self.rotation_y: float = DEFAULT_ROTATION_Y
         self.zoom: float = DEFAULT_ZOOM
         self.last_pos: Optional[QPoint] = None
-
-    def set_data(self, data: npt.NDArray[np.float64]) -> None:
-        """Set the landmark data"""
+        self._camera_key: Optional[tuple[float, float, float]] = None
+        self._camera_mtx: Optional[npt.NDArray[np.float32]] = None
+        # Projection matrix loaded by resizeGL, used for frustum culling
+        self._projection_mtx: Optional[npt.NDArray[np.float32]] = None
+
+        # Last viewport size seen by resizeGL, used to skip redundant resizes
+        self._last_size: tuple[int, int] = (0, 0)
+
+    def set_data(
+        self,
+        data: npt.NDArray[np.float32],
+        valid_mask: Optional[npt.NDArray[np.bool_]] = None,
+    ) -> None:
+        """Set the landmark data and, optionally, its precomputed NaN mask"""
         logger.info(f"Setting data with shape: {data.shape}")
-        self.data = data
+        # The viewer passes a contiguous float32 array, which is kept as-is
+        # (no copy), so all widgets read the same buffer
+        self.data = np.ascontiguousarray(data, dtype=np.float32)
+        self._valid_mask = (
+            valid_mask
+            if valid_mask is not None and valid_mask.shape == self.data.shape[:2]
+            else valid_landmark_mask(self.data)
+        )
+        self._base_scaled = None
         self.update()
 
     def set_base_frame(self, frame: int) -> None:
         """Set the base frame"""
         logger.debug(f"Setting base frame to: {frame}")
         self.state.base_frame = frame
+        self._base_scaled = None
         self.update()
 
     def set_current_frame(self, frame: int) -> None:
         """Set the current frame"""
-        logger.debug(f"Setting current frame to: {frame}")
+        logger.debug("Setting current frame to: %d", frame)
         self.state.current_frame = frame
         self.update()
 
@@ -117,38 +159,69 @@ class LandmarkGLWidget(QOpenGLWidget):
         gl.glEnable(gl.GL_DEPTH_TEST)
         gl.glEnable(gl.GL_BLEND)
         gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
-        gl.glEnable(gl.GL_POINT_SMOOTH)
-        gl.glEnable(gl.GL_LINE_SMOOTH)
-        gl.glHint(gl.GL_POINT_SMOOTH_HINT, gl.GL_NICEST)
-        gl.glHint(gl.GL_LINE_SMOOTH_HINT, gl.GL_NICEST)
+        if SMOOTH_PRIMITIVES:
+            gl.glEnable(gl.GL_POINT_SMOOTH)
+            gl.glEnable(gl.GL_LINE_SMOOTH)
+            gl.glHint(gl.GL_POINT_SMOOTH_HINT, gl.GL_NICEST)
+            gl.glHint(gl.GL_LINE_SMOOTH_HINT, gl.GL_NICEST)
+        else:
+            gl.glDisable(gl.GL_POINT_SMOOTH)
+            gl.glDisable(gl.GL_LINE_SMOOTH)
         gl.glClearColor(*BACKGROUND_COLOR)
+        # A fresh context has no projection set up yet
+        self._last_size = (0, 0)
 
     def resizeGL(self, w: int, h: int) -> None:
         """Handle window resize"""
+        if (w, h) == self._last_size:
+            logger.debug(f"Resize GL: size unchanged ({w}x{h}), skipping")
+            return
+        self._last_size = (w, h)
+
         logger.info(f"Resize GL: width={w}, height={h}")
         gl.glViewport(0, 0, w, h)
         gl.glMatrixMode(gl.GL_PROJECTION)
-        gl.glLoadIdentity()
         aspect = w / h if h > 0 else 1.0
         logger.debug(f"Aspect ratio: {aspect}")
-        glu.gluPerspective(PERSPECTIVE_FOV, aspect, PERSPECTIVE_NEAR, PERSPECTIVE_FAR)
+        self._projection_mtx = perspective_matrix(
+            PERSPECTIVE_FOV, aspect, PERSPECTIVE_NEAR, PERSPECTIVE_FAR
+        )
+        gl.glLoadMatrixf(self._projection_mtx)
         gl.glMatrixMode(gl.GL_MODELVIEW)
 
+    def _compute_camera_mtx(self) -> npt.NDArray[np.float32]:
+        """Return the camera modelview matrix, rebuilding it only when moved"""
+        key = (self.rotation_x, self.rotation_y, self.zoom)
+        if self._camera_mtx is None or key != self._camera_key:
+            self._camera_mtx = camera_matrix(
+                self.zoom, self.rotation_x, self.rotation_y
+            )
+            self._camera_key = key
+        return self._camera_mtx
+
     def paintGL(self) -> None:
         """Render the scene"""
         logger.debug("paintGL called")
         gl.glClear(gl.GL_COLOR_BUFFER_BIT | gl.GL_DEPTH_BUFFER_BIT)
-        gl.glLoadIdentity()
 
         # Set camera position
-        gl.glTranslatef(0.0, 0.0, -self.zoom)
-        gl.glRotatef(self.rotation_x, 1.0, 0.0, 0.0)
-        gl.glRotatef(self.rotation_y, 0.0, 1.0, 0.0)
+        camera_mtx = self._compute_camera_mtx()
+        gl.glLoadMatrixf(camera_mtx)
+        # Both matrices are column-major, so row vectors go through
+        # camera then projection when multiplied in this order
+        clip_mtx = (
+            camera_mtx @ self._projection_mtx
+            if self._projection_mtx is not None
+            else None
+        )
         logger.debug(
-            f"Camera: zoom={self.zoom}, rotation_x={self.rotation_x}, rotation_y={self.rotation_y}"
+            "Camera: zoom=%s, rotation_x=%s, rotation_y=%s",
+            self.zoom,
+            self.rotation_x,
+            self.rotation_y,
         )
 
-        if self.data is None:
+        if self.data is None or self._valid_mask is None:
             logger.warning("paintGL: No data to render")
             return
 
@@ -159,14 +232,16 @@ class LandmarkGLWidget(QOpenGLWidget):
             f"Rendering frame {self.state.current_frame} (base: {self.state.base_frame})"
         )
         logger.debug(
-            f"Base landmarks shape: {base_landmarks.shape}, Current landmarks shape: {current_landmarks.shape}"
+            "Base landmarks shape: %s, Current landmarks shape: %s",
+            base_landmarks.shape,
+            current_landmarks.shape,
         )
 
-        # Filter out NaN values using module-level function
-        base_landmarks_valid, base_valid_mask = filter_nan_landmarks(base_landmarks)
-        current_landmarks_valid, current_valid_mask = filter_nan_landmarks(
-            current_landmarks
-        )
+        # Filter out NaN values using the masks precomputed in set_data
+        base_valid_mask = self._valid_mask[self.state.base_frame]
+        current_valid_mask = self._valid_mask[self.state.current_frame]
+        base_landmarks_valid = base_landmarks[base_valid_mask]
+        current_landmarks_valid = current_landmarks[current_valid_mask]
 
         nan_count_base = (~base_valid_mask).sum()
         nan_count_current = (~current_valid_mask).sum()
@@ -181,17 +256,34 @@ class LandmarkGLWidget(QOpenGLWidget):
             return
 
         # Calculate center and scale from base frame only (with 20% margin)
-        center, scale = calculate_center_and_scale(base_landmarks_valid)
+        if self._base_scaled is None:
+            self._base_center, self._base_scale = calculate_center_and_scale(
+                base_landmarks_valid
+            )
+            self._base_scaled = scale_landmarks_for_display(
+                base_landmarks_valid, self._base_center, self._base_scale
+            )
+        center, scale = self._base_center, self._base_scale
 
         logger.info(
             f"Data center: {center}, scale: {scale} (calculated from base frame with {SCALE_MARGIN}x margin)"
         )
         logger.debug(
-            f"Valid landmarks: base={len(base_landmarks_valid)}, current={len(current_landmarks_valid)}"
+            "Valid landmarks: base=%d, current=%d",
+            len(base_landmarks_valid),
+            len(current_landmarks_valid),
         )
 
         # Draw base frame landmarks (blue)
-        draw_landmarks(base_landmarks_valid, center, scale, BASE_LANDMARK_COLOR, "base")
+        draw_landmarks(
+            base_landmarks_valid,
+            center,
+            scale,
+            BASE_LANDMARK_COLOR,
+            "base",
+            presented_points=self._base_scaled,
+            clip_matrix=clip_mtx,
+        )
 
         # Create alignment function if enabled
         alignment_fn = None
@@ -209,10 +301,10 @@ class LandmarkGLWidget(QOpenGLWidget):
                 alignment_indices = (
                     self.state.alignment_landmarks
                     if self.state.alignment_landmarks is not None
-                    else DEFAULT_ALIGNMENT_LANDMARKS
+                    else DEFAULT_ALIGNMENT_INDICES
                 )
                 logger.debug(
-                    f"Using {len(alignment_indices)} static points for alignment"
+                    "Using %d static points for alignment", len(alignment_indices)
                 )
 
             # Create a partial function that aligns to base landmarks
@@ -230,14 +322,17 @@ class LandmarkGLWidget(QOpenGLWidget):
             CURRENT_LANDMARK_COLOR,
             "current",
             alignment_fn=alignment_fn,
+            clip_matrix=clip_mtx,
         )
 
         # Draw vectors if enabled (only for landmarks that are valid in both frames)
         if self.state.show_vectors and len(current_landmarks_valid) > 0:
-            # Match valid landmarks from both frames
-            both_valid_mask = base_valid_mask & current_valid_mask
-            base_landmarks_both = base_landmarks[both_valid_mask]
-            current_landmarks_both = current_landmarks[both_valid_mask]
+            # Match valid landmarks from both frames, selecting from the
+            # already-filtered arrays rather than the full frames
+            base_in_both = current_valid_mask[base_valid_mask]
+            current_in_both = base_valid_mask[current_valid_mask]
+            base_landmarks_both = base_landmarks_valid[base_in_both]
+            current_landmarks_both = current_landmarks_valid[current_in_both]
 
             # Apply alignment to current landmarks if enabled
             if self.state.align_faces and len(current_landmarks_both) > 0:
@@ -252,7 +347,7 @@ class LandmarkGLWidget(QOpenGLWidget):
                     vector_alignment_indices = (
                         self.state.alignment_landmarks
                         if self.state.alignment_landmarks is not None
-                        else DEFAULT_ALIGNMENT_LANDMARKS
+                        else DEFAULT_ALIGNMENT_INDICES
                     )
                 else:
                     vector_alignment_indices = None
@@ -263,21 +358,22 @@ class LandmarkGLWidget(QOpenGLWidget):
                 )
 
             if len(base_landmarks_both) > 0:
-                logger.debug(f"Drawing {len(base_landmarks_both)} vectors (green)")
+                logger.debug("Drawing %d vectors (green)", len(base_landmarks_both))
+                # Reuse the cached base points for landmarks valid in both frames
+                scaled_base_both = self._base_scaled[base_in_both]
+                scaled_curr_both = scale_landmarks_for_display(
+                    current_landmarks_both, center, scale
+                )
+                # Interleave base/current endpoints so each consecutive pair is one line
+                vertices = np.empty((2 * len(scaled_base_both), 3), dtype=np.float32)
+                vertices[0::2] = scaled_base_both
+                vertices[1::2] = scaled_curr_both
                 gl.glLineWidth(VECTOR_LINE_WIDTH)
                 gl.glColor4f(*VECTOR_COLOR)
-                gl.glBegin(gl.GL_LINES)
-                for base_pt, curr_pt in zip(
-                    base_landmarks_both, current_landmarks_both
-                ):
-                    scaled_base = (base_pt - center) * scale
-                    scaled_curr = (curr_pt - center) * scale
-                    # Flip Y coordinates
-                    scaled_base[1] = -scaled_base[1]
-                    scaled_curr[1] = -scaled_curr[1]
-                    gl.glVertex3f(scaled_base[0], scaled_base[1], scaled_base[2])
-                    gl.glVertex3f(scaled_curr[0], scaled_curr[1], scaled_curr[2])
-                gl.glEnd()
+                gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+                gl.glVertexPointerf(vertices)
+                gl.glDrawArrays(gl.GL_LINES, 0, len(vertices))
+                gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
 
         # Draw coordinate axes
         self._draw_axes()
@@ -8,11 +8,10 @@ from typing import Optional
 import numpy as np
 import numpy.typing as npt
 from PySide6.QtWidgets import QWidget
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPainter, QColor, QPen, QFont
+from PySide6.QtCore import Qt, QRect
+from PySide6.QtGui import QPainter, QColor, QPen, QFont, QPixmap
 
-from vptry_facelandmarkview.constants import DEFAULT_ALIGNMENT_LANDMARKS
-from vptry_facelandmarkview.utils import filter_nan_landmarks
+from vptry_facelandmarkview.frame_delta import FrameDeltaModel
 
 logger = logging.getLogger(__name__)
 
@@ -30,9 +29,12 @@ GRID_COLOR = QColor(200, 200, 200)  # Light gray grid
 class HistogramWidget(QWidget):
     """Widget for displaying a histogram of distances between base and current frame landmarks"""
 
+    # Shared label font, created on first use (fonts need a QGuiApplication)
+    _label_font: Optional[QFont] = None
+
     def __init__(self, parent: Optional[QWidget] = None) -> None:
         super().__init__(parent)
-        self.data: Optional[npt.NDArray[np.float64]] = None
+        self.data: Optional[npt.NDArray[np.float32]] = None
         self.base_frame: int = 0
         self.current_frame: int = 0
         self.align_faces: bool = False
@@ -40,35 +42,62 @@ class HistogramWidget(QWidget):
         self.alignment_method: str = "default"
         self.alignment_landmarks: Optional[list[int]] = None
 
-        # Cached histogram data
-        self.distances: Optional[npt.NDArray[np.float64]] = None
-        self.hist_values: Optional[npt.NDArray[np.int_]] = None
-        self.bin_edges: Optional[npt.NDArray[np.float64]] = None
-        self.outlier_count: int = 0
-        self.max_distance: float = 0.0
+        # Filtered/aligned landmarks, shared with other widgets when injected
+        self._frame_delta_model = FrameDeltaModel()
+
+        # Cached histogram data, recomputed lazily when marked dirty
+        self._sq_distances: Optional[npt.NDArray[np.float64]] = None
+        self._distances: Optional[npt.NDArray[np.float64]] = None
+        self._hist_values: Optional[npt.NDArray[np.int_]] = None
+        self._bin_edges: Optional[npt.NDArray[np.float64]] = None
+        self._outlier_count: int = 0
+        self._max_distance: float = 0.0
+        self._dirty: bool = True
+
+        # Cached bar layout, keyed on the plot area size
+        self._bar_cache_key: Optional[tuple[int, int]] = None
+        self._bar_rects: list[QRect] = []
+        self._outlier_rect: Optional[QRect] = None
+
+        # Cached "Mean: ...  Var: ..." label
+        self._stats_text: Optional[str] = None
+
+        # Whole-widget rendering, keyed on size and device pixel ratio
+        self._cache_pix: Optional[QPixmap] = None
+        self._cache_key: Optional[tuple] = None
 
         self.setMinimumSize(100, 100)
 
-    def set_data(self, data: npt.NDArray[np.float64]) -> None:
-        """Set the landmark data"""
+    def set_data(
+        self,
+        data: npt.NDArray[np.float32],
+        valid_mask: Optional[npt.NDArray[np.bool_]] = None,
+    ) -> None:
+        """Set the landmark data and, optionally, its precomputed NaN mask"""
         logger.debug(f"Histogram: Setting data with shape: {data.shape}")
-        self.data = data
-        self._update_histogram()
-        self.update()
+        # The model keeps a float32 copy, shared with the other widgets
+        self._frame_delta_model.set_data(data, valid_mask)
+        self.data = self._frame_delta_model.data
+        self._mark_dirty()
+
+    def set_frame_delta_model(self, model: FrameDeltaModel) -> None:
+        """Use a frame delta model shared with other widgets"""
+        self._frame_delta_model = model
+        if self.data is not None:
+            model.set_data(self.data)
+        self._mark_dirty()
 
     def set_base_frame(self, frame: int) -> None:
         """Set the base frame"""
         logger.debug(f"Histogram: Setting base frame to: {frame}")
         self.base_frame = frame
-        self._update_histogram()
-        self.update()
+        self._mark_dirty()
 
     def set_current_frame(self, frame: int) -> None:
         """Set the current frame"""
-        logger.debug(f"Histogram: Setting current frame to: {frame}")
+        logger.debug("Histogram: Setting current frame to: %d", frame)
         self.current_frame = frame
-        self._update_histogram()
-        self.update()
+        self._mark_dirty()
 
     def set_show_vectors(self, show: bool) -> None:
         """Set whether to show vectors (not used for histogram, but part of protocol)"""
@@ -78,22 +107,19 @@ class HistogramWidget(QWidget):
         """Set whether to align faces to base frame"""
         logger.debug(f"Histogram: Setting align_faces to: {align}")
         self.align_faces = align
-        self._update_histogram()
-        self.update()
+        self._mark_dirty()
 
     def set_use_static_points(self, use_static: bool) -> None:
         """Set whether to use only static points for alignment"""
         logger.debug(f"Histogram: Setting use_static_points to: {use_static}")
         self.use_static_points = use_static
-        self._update_histogram()
-        self.update()
+        self._mark_dirty()
 
     def set_alignment_method(self, method: str) -> None:
         """Set the alignment method to use"""
         logger.debug(f"Histogram: Setting alignment_method to: {method}")
         self.alignment_method = method
-        self._update_histogram()
-        self.update()
+        self._mark_dirty()
 
     def set_alignment_landmarks(self, landmarks: list[int]) -> None:
         """Set custom landmarks to use for alignment calculation"""
@@ -101,116 +127,257 @@ class HistogramWidget(QWidget):
             f"Histogram: Setting alignment_landmarks to {len(landmarks)} landmarks"
         )
         self.alignment_landmarks = landmarks
-        self._update_histogram()
+        self._mark_dirty()
+
+    def _mark_dirty(self) -> None:
+        """Mark histogram data stale; several setters in a row cost one update"""
+        self._dirty = True
         self.update()
 
-    def _calculate_distances(self) -> Optional[npt.NDArray[np.float64]]:
-        """Calculate Euclidean distances between base and current frame landmarks
+    def _ensure_histogram(self) -> None:
+        """Recompute histogram data if any input changed since the last use"""
+        if self._dirty:
+            self._update_histogram()
+            self._dirty = False
+
+    @property
+    def distances(self) -> Optional[npt.NDArray[np.float64]]:
+        """Distances between base and current frame landmarks"""
+        self._ensure_histogram()
+        # Only take the square root of every distance when actually needed
+        if self._distances is None and self._sq_distances is not None:
+            self._distances = np.sqrt(self._sq_distances)
+        return self._distances
+
+    @property
+    def hist_values(self) -> Optional[npt.NDArray[np.int_]]:
+        """Histogram bin counts (excluding outliers)"""
+        self._ensure_histogram()
+        return self._hist_values
+
+    @property
+    def bin_edges(self) -> Optional[npt.NDArray[np.float64]]:
+        """Histogram bin edges"""
+        self._ensure_histogram()
+        return self._bin_edges
+
+    @property
+    def outlier_count(self) -> int:
+        """Number of distances above the outlier percentile"""
+        self._ensure_histogram()
+        return self._outlier_count
+
+    @property
+    def max_distance(self) -> float:
+        """Largest distance, including outliers"""
+        self._ensure_histogram()
+        return self._max_distance
+
+    def _calculate_squared_distances(self) -> Optional[npt.NDArray[np.float64]]:
+        """Calculate squared Euclidean distances between base and current frame landmarks
 
         Returns:
-            Array of distances for valid landmarks, or None if no valid data
+            Array of squared distances for valid landmarks, or None if no valid data
         """
         if self.data is None:
             return None
 
-        base_landmarks = self.data[self.base_frame]
-        current_landmarks = self.data[self.current_frame]
-
-        # Filter out NaN values
-        base_landmarks_valid, base_valid_mask = filter_nan_landmarks(base_landmarks)
-        current_landmarks_valid, current_valid_mask = filter_nan_landmarks(
-            current_landmarks
+        delta = self._frame_delta_model.get(
+            self.base_frame,
+            self.current_frame,
+            self.align_faces,
+            self.use_static_points,
+            self.alignment_method,
+            self.alignment_landmarks,
         )
-
-        # Get landmarks that are valid in both frames
-        both_valid_mask = base_valid_mask & current_valid_mask
-        base_landmarks_both = base_landmarks[both_valid_mask]
-        current_landmarks_both = current_landmarks[both_valid_mask]
-
-        if len(base_landmarks_both) == 0:
+        if delta is None or len(delta.sq_distances) == 0:
             logger.warning("No valid landmarks to calculate distances")
             return None
 
-        # Apply alignment if enabled
-        if self.align_faces:
-            # Import alignment method
-            from vptry_facelandmarkview.alignments import get_alignment_method
+        # Square roots are taken later, only where needed
+        sq_distances = delta.sq_distances
+        logger.debug("Calculated %d squared distances", len(sq_distances))
 
-            # Get the selected alignment function
-            align_func = get_alignment_method(self.alignment_method)
-
-            alignment_indices = None
-            if self.use_static_points:
-                alignment_indices = (
-                    self.alignment_landmarks
-                    if self.alignment_landmarks is not None
-                    else DEFAULT_ALIGNMENT_LANDMARKS
-                )
-
-            current_landmarks_both = align_func(
-                current_landmarks_both,
-                base_landmarks_both,
-                alignment_indices=alignment_indices,
-            )
-
-        # Calculate Euclidean distances
-        distances = np.linalg.norm(current_landmarks_both - base_landmarks_both, axis=1)
-        logger.debug(
-            f"Calculated {len(distances)} distances, range: [{distances.min():.4f}, {distances.max():.4f}]"
-        )
-
-        return distances
+        return sq_distances
 
     def _update_histogram(self) -> None:
         """Update histogram data based on current state"""
-        distances = self._calculate_distances()
-
-        if distances is None or len(distances) == 0:
-            self.distances = None
-            self.hist_values = None
-            self.bin_edges = None
-            self.outlier_count = 0
-            self.max_distance = 0.0
+        self._bar_cache_key = None  # Bar layout depends on the histogram
+        self._stats_text = None
+        self._cache_pix = None
+        sq_distances = self._calculate_squared_distances()
+
+        if sq_distances is None or len(sq_distances) == 0:
+            self._sq_distances = None
+            self._distances = None
+            self._hist_values = None
+            self._bin_edges = None
+            self._outlier_count = 0
+            self._max_distance = 0.0
             return
 
-        self.distances = distances
-        self.max_distance = distances.max()
-
-        # Calculate the 95th percentile for the histogram range
-        percentile_95 = np.percentile(distances, OUTLIER_PERCENTILE)
+        self._sq_distances = sq_distances
+        self._distances = None  # Computed on demand by the distances property
+        self._max_distance = float(np.sqrt(sq_distances.max()))
+
+        # Calculate the 95th percentile for the histogram range. Square root is
+        # monotonic, so the two order statistics around the percentile can be
+        # found on squared distances with an O(N) partition instead of a sort,
+        # then interpolated linearly like np.percentile does.
+        n = len(sq_distances)
+        position = OUTLIER_PERCENTILE / 100 * (n - 1)
+        lower = int(np.floor(position))
+        upper = min(lower + 1, n - 1)
+        partitioned = np.partition(sq_distances, (lower, upper))
+        lower_value = np.sqrt(partitioned[lower])
+        upper_value = np.sqrt(partitioned[upper])
+        percentile_95 = lower_value + (upper_value - lower_value) * (position - lower)
 
         # Round x-max (95th percentile) to nearest 0.005 for easier frame comparison
         # e.g., if percentile is 0.0052, round up to 0.01; if 0.0035, round to 0.005
         percentile_95_rounded = np.ceil(percentile_95 / 0.005) * 0.005
 
-        # Count outliers (values above 95th percentile)
-        outlier_mask = distances > percentile_95
-        self.outlier_count = outlier_mask.sum()
+        # Count outliers (values above 95th percentile). When the percentile
+        # falls exactly on a sample, compare against that sample directly so
+        # rounding in sqrt/square can't turn it into an outlier.
+        if position == lower or lower_value == upper_value:
+            threshold_sq = partitioned[lower]
+        else:
+            threshold_sq = percentile_95 * percentile_95
+        outlier_mask = sq_distances > threshold_sq
+        self._outlier_count = outlier_mask.sum()
 
-        # Create histogram for non-outliers
-        non_outlier_distances = distances[~outlier_mask]
+        # Create histogram for non-outliers. Boolean indexing already made a
+        # copy, so take the square root in place (sq_distances itself is shared)
+        non_outlier_distances = sq_distances[~outlier_mask]
+        np.sqrt(non_outlier_distances, out=non_outlier_distances)
 
         if len(non_outlier_distances) > 0:
             # Create histogram with bins from 0 to rounded 95th percentile
-            self.hist_values, self.bin_edges = np.histogram(
+            self._hist_values, self._bin_edges = np.histogram(
                 non_outlier_distances,
                 bins=HISTOGRAM_BINS,
                 range=(0, percentile_95_rounded),
             )
             logger.debug(
-                f"Histogram created: {len(non_outlier_distances)} values, "
-                f"{self.outlier_count} outliers, "
-                f"range: [0, {percentile_95_rounded:.4f}] (rounded from {percentile_95:.4f})"
+                "Histogram created: %d values, %d outliers, "
+                "range: [0, %.4f] (rounded from %.4f)",
+                len(non_outlier_distances),
+                self._outlier_count,
+                percentile_95_rounded,
+                percentile_95,
             )
         else:
             # All values are outliers (rare case)
-            self.hist_values = np.zeros(HISTOGRAM_BINS, dtype=np.int_)
-            self.bin_edges = np.linspace(0, percentile_95_rounded, HISTOGRAM_BINS + 1)
+            self._hist_values = np.zeros(HISTOGRAM_BINS, dtype=np.int_)
+            self._bin_edges = np.linspace(0, percentile_95_rounded, HISTOGRAM_BINS + 1)
             logger.debug("All distances are outliers")
 
+    def _compute_bar_rects(
+        self,
+        margin_left: int,
+        margin_top: int,
+        height: int,
+        bar_width: float,
+        max_count: int,
+    ) -> tuple[list[QRect], Optional[QRect]]:
+        """Lay out the histogram bars for the current widget size
+
+        Returns:
+            Tuple of (rects for non-empty bins, rect for the outlier bar or None)
+        """
+        bar_rects = []
+        for i, count in enumerate(self._hist_values):
+            if count > 0:
+                bar_height = (count / max_count) * height
+                x = margin_left + i * bar_width
+                y = margin_top + height - bar_height
+                bar_rects.append(
+                    QRect(int(x), int(y), int(bar_width - 1), int(bar_height))
+                )
+
+        outlier_rect = None
+        if self._outlier_count > 0:
+            bar_height = (self._outlier_count / max_count) * height
+            x = margin_left + len(self._hist_values) * bar_width
+            y = margin_top + height - bar_height
+            outlier_rect = QRect(int(x), int(y), int(bar_width - 1), int(bar_height))
+
+        return bar_rects, outlier_rect
+
+    @classmethod
+    def _get_label_font(cls) -> QFont:
+        """Small font for axis labels, built once for all histogram widgets"""
+        if cls._label_font is None:
+            font = QFont()
+            font.setPointSize(7)
+            cls._label_font = font
+        return cls._label_font
+
+    def _get_stats_text(self) -> Optional[str]:
+        """Formatted mean/variance of the distances, cached until the next update
+
+        Values are shown ×100 for readability; the scale is applied to the
+        scalar results rather than to a copy of the distances array.
+        """
+        if self._stats_text is None:
+            distances = self.distances
+            if distances is None or len(distances) == 0:
+                return None
+            mean_dist = 100 * float(distances.mean())
+            var_dist = 10000 * float(distances.var())
+            self._stats_text = f"Mean: {mean_dist:.3f}  Var: {var_dist:.3f}"
+        return self._stats_text
+
+    def resizeEvent(self, event) -> None:
+        """Drop the cached rendering; it no longer matches the widget size"""
+        self._cache_pix = None
+        super().resizeEvent(event)
+
     def paintEvent(self, event) -> None:
         """Paint the histogram"""
+        # Only the damaged region needs repainting; nothing to do if it is empty
+        dirty_rect = event.rect()
+        if dirty_rect.isEmpty():
+            return
+
+        # Recompute histogram data once if any setter ran since the last paint
+        self._ensure_histogram()
+
+        # Render into a pixmap only when the histogram or size changed; expose
+        # events just blit the damaged part of it
+        cache_key = (self.size(), self.devicePixelRatioF())
+        if self._cache_pix is None or self._cache_key != cache_key:
+            self._cache_pix = self._render_pixmap()
+            self._cache_key = cache_key
+
         painter = QPainter(self)
+        painter.drawPixmap(dirty_rect, self._cache_pix, self._source_rect(dirty_rect))
+
+    def _source_rect(self, rect: QRect) -> QRect:
+        """Map a widget rect to the matching rect in the (device pixel) cache"""
+        ratio = self._cache_pix.devicePixelRatio()
+        return QRect(
+            int(rect.x() * ratio),
+            int(rect.y() * ratio),
+            int(rect.width() * ratio),
+            int(rect.height() * ratio),
+        )
+
+    def _render_pixmap(self) -> QPixmap:
+        """Render the whole histogram into a pixmap at the widget's size"""
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(self.size() * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        painter = QPainter(pixmap)
+        try:
+            self._render(painter)
+        finally:
+            painter.end()
+        return pixmap
+
+    def _render(self, painter: QPainter) -> None:
+        """Draw background, bars, axes and labels"""
         painter.setRenderHint(QPainter.Antialiasing)
 
         # Fill background
@@ -251,26 +418,22 @@ class HistogramWidget(QWidget):
         # e.g., if max is 13, round up to 50; if 52, round up to 100
         max_count = int(np.ceil(max_count_raw / 50) * 50)
 
-        # Draw histogram bars
-        for i, count in enumerate(self.hist_values):
-            if count > 0:
-                bar_height = (count / max_count) * height
-                x = margin_left + i * bar_width
-                y = margin_top + height - bar_height
-
-                painter.fillRect(
-                    int(x), int(y), int(bar_width - 1), int(bar_height), BAR_COLOR
-                )
-
-        # Draw outlier bar (red) if there are any outliers
-        if self.outlier_count > 0:
-            bar_height = (self.outlier_count / max_count) * height
-            x = margin_left + n_bins * bar_width
-            y = margin_top + height - bar_height
-
-            painter.fillRect(
-                int(x), int(y), int(bar_width - 1), int(bar_height), OUTLIER_BAR_COLOR
+        # Bar geometry only changes with the histogram or the widget size
+        bar_cache_key = (width, height)
+        if self._bar_cache_key != bar_cache_key:
+            self._bar_rects, self._outlier_rect = self._compute_bar_rects(
+                margin_left, margin_top, height, bar_width, max_count
             )
+            self._bar_cache_key = bar_cache_key
+
+        # Draw histogram bars, and the outlier bar (red) if there are any outliers
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(BAR_COLOR)
+        painter.drawRects(self._bar_rects)
+        if self._outlier_rect is not None:
+            painter.setBrush(OUTLIER_BAR_COLOR)
+            painter.drawRect(self._outlier_rect)
+        painter.setBrush(Qt.NoBrush)
 
         # Draw axes
         painter.setPen(QPen(AXIS_COLOR, 2))
@@ -286,9 +449,7 @@ class HistogramWidget(QWidget):
 
         # Draw x-axis labels
         painter.setPen(TEXT_COLOR)
-        font = QFont()
-        font.setPointSize(7)
-        painter.setFont(font)
+        painter.setFont(self._get_label_font())
 
         # Label for y-axis max (at the top)
         painter.drawText(margin_left - 25, margin_top + 5, f"{max_count}")
@@ -315,11 +476,7 @@ class HistogramWidget(QWidget):
                 )
 
         # Draw mean and variance below the histogram
-        # Note: Display values before ×100 scaling
-        if self.distances is not None and len(self.distances) > 0:
-            mean_dist = (100 * self.distances).mean()
-            var_dist = (100 * self.distances).var()
-
+        stats_text = self._get_stats_text()
+        if stats_text is not None:
             painter.setPen(TEXT_COLOR)
-            stats_text = f"Mean: {mean_dist:.3f}  Var: {var_dist:.3f}"
             painter.drawText(margin_left, margin_top + height + 30, stats_text)
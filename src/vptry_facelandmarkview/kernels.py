@@ -0,0 +1,271 @@
+"""
+Small numeric kernels on the frame-scrubbing hot path.
+
+When numba is installed the kernels are JIT-compiled into single loops
+without temporaries; otherwise equivalent NumPy expressions are used.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+try:
+    # Optional: removes interpreter and temporary-array overhead
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _valid_mask_numpy(landmarks: npt.NDArray[np.floating]) -> npt.NDArray[np.bool_]:
+    """NumPy fallback for valid_mask"""
+    return ~np.isnan(landmarks).any(axis=1)
+
+
+def _nan_summary_numpy(
+    landmarks: npt.NDArray[np.floating],
+) -> tuple[npt.NDArray[np.bool_], int]:
+    """NumPy fallback for nan_summary"""
+    nan_values = np.isnan(landmarks)
+    return ~nan_values.any(axis=1), int(nan_values.sum())
+
+
+def _sq_distances_numpy(
+    a: npt.NDArray[np.floating], b: npt.NDArray[np.floating]
+) -> npt.NDArray[np.floating]:
+    """NumPy fallback for sq_distances"""
+    diff = b - a
+    return np.einsum("ij,ij->i", diff, diff)
+
+
+def _valid_mask_loop(landmarks: npt.NDArray[np.floating]) -> npt.NDArray[np.bool_]:
+    """Boolean mask of landmarks without NaN coordinates
+
+    Args:
+        landmarks: Landmark array (n_landmarks, 3)
+
+    Returns:
+        Boolean array (n_landmarks,)
+    """
+    n = landmarks.shape[0]
+    mask = np.empty(n, dtype=np.bool_)
+    for i in range(n):
+        mask[i] = not (
+            np.isnan(landmarks[i, 0])
+            or np.isnan(landmarks[i, 1])
+            or np.isnan(landmarks[i, 2])
+        )
+    return mask
+
+
+def _nan_summary_loop(
+    landmarks: npt.NDArray[np.floating],
+) -> tuple[npt.NDArray[np.bool_], int]:
+    """Valid-landmark mask and total NaN count in one pass
+
+    Args:
+        landmarks: Landmark array (n_landmarks, 3)
+
+    Returns:
+        Tuple of (boolean mask (n_landmarks,), number of NaN coordinates)
+    """
+    n = landmarks.shape[0]
+    mask = np.empty(n, dtype=np.bool_)
+    nan_count = 0
+    for i in range(n):
+        row_nans = 0
+        for k in range(3):
+            if np.isnan(landmarks[i, k]):
+                row_nans += 1
+        mask[i] = row_nans == 0
+        nan_count += row_nans
+    return mask, nan_count
+
+
+def _sq_distances_loop(
+    a: npt.NDArray[np.floating], b: npt.NDArray[np.floating]
+) -> npt.NDArray[np.floating]:
+    """Squared Euclidean distances between matching rows of a and b
+
+    Args:
+        a: Landmark array (n_landmarks, 3)
+        b: Landmark array of the same shape
+
+    Returns:
+        Array of squared distances (n_landmarks,)
+    """
+    n = a.shape[0]
+    out = np.empty(n, dtype=a.dtype)
+    for i in range(n):
+        dx = b[i, 0] - a[i, 0]
+        dy = b[i, 1] - a[i, 1]
+        dz = b[i, 2] - a[i, 2]
+        out[i] = dx * dx + dy * dy + dz * dz
+    return out
+
+
+def _largest_eigenvector4(
+    matrix: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """Eigenvector of the largest eigenvalue of a symmetric 4x4 matrix
+
+    Uses cyclic Jacobi rotations, which converge in a handful of sweeps at
+    this size and need no LAPACK call.
+    """
+    a = matrix.copy()
+    v = np.eye(4)
+    total = 0.0
+    for p in range(4):
+        for q in range(4):
+            total += a[p, q] * a[p, q]
+
+    for _ in range(50):
+        off = 0.0
+        for p in range(3):
+            for q in range(p + 1, 4):
+                off += a[p, q] * a[p, q]
+        if off <= 1e-30 * total:
+            break
+
+        for p in range(3):
+            for q in range(p + 1, 4):
+                apq = a[p, q]
+                if apq == 0.0:
+                    continue
+                theta = (a[q, q] - a[p, p]) / (2.0 * apq)
+                t = 1.0 / (abs(theta) + np.sqrt(theta * theta + 1.0))
+                if theta < 0.0:
+                    t = -t
+                c = 1.0 / np.sqrt(t * t + 1.0)
+                s = t * c
+                for k in range(4):
+                    akp = a[k, p]
+                    akq = a[k, q]
+                    a[k, p] = c * akp - s * akq
+                    a[k, q] = s * akp + c * akq
+                for k in range(4):
+                    apk = a[p, k]
+                    aqk = a[q, k]
+                    a[p, k] = c * apk - s * aqk
+                    a[q, k] = s * apk + c * aqk
+                for k in range(4):
+                    vkp = v[k, p]
+                    vkq = v[k, q]
+                    v[k, p] = c * vkp - s * vkq
+                    v[k, q] = s * vkp + c * vkq
+
+    best = 0
+    for k in range(1, 4):
+        if a[k, k] > a[best, best]:
+            best = k
+    return v[:, best].copy()
+
+
+def _kabsch_align_loop(
+    landmarks: npt.NDArray[np.floating],
+    indices: npt.NDArray[np.intp],
+    use_all: bool,
+    base_centered: npt.NDArray[np.float64],
+    base_center: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    """Rigidly align landmarks to a pre-centered base (Horn's quaternion method)
+
+    Args:
+        landmarks: Landmarks to align (n_points, 3)
+        indices: Landmark indices used for the fit (non-empty); ignored if
+            use_all is True
+        use_all: Fit on all landmarks instead of those at indices
+        base_centered: Base landmarks used for the fit minus base_center
+        base_center: Center of the base landmarks used for the fit
+
+    Returns:
+        Aligned landmarks (n_points, 3) as float64
+    """
+    n = landmarks.shape[0]
+    count = n if use_all else indices.shape[0]
+
+    cx = 0.0
+    cy = 0.0
+    cz = 0.0
+    for j in range(count):
+        i = j if use_all else indices[j]
+        cx += landmarks[i, 0]
+        cy += landmarks[i, 1]
+        cz += landmarks[i, 2]
+    cx /= count
+    cy /= count
+    cz /= count
+
+    # Cross-covariance H = X^T Y of centered source X and target Y
+    sxx = sxy = sxz = syx = syy = syz = szx = szy = szz = 0.0
+    for j in range(count):
+        i = j if use_all else indices[j]
+        x0 = landmarks[i, 0] - cx
+        x1 = landmarks[i, 1] - cy
+        x2 = landmarks[i, 2] - cz
+        y0 = base_centered[j, 0]
+        y1 = base_centered[j, 1]
+        y2 = base_centered[j, 2]
+        sxx += x0 * y0
+        sxy += x0 * y1
+        sxz += x0 * y2
+        syx += x1 * y0
+        syy += x1 * y1
+        syz += x1 * y2
+        szx += x2 * y0
+        szy += x2 * y1
+        szz += x2 * y2
+
+    n4 = np.empty((4, 4))
+    n4[0, 0] = sxx + syy + szz
+    n4[0, 1] = n4[1, 0] = syz - szy
+    n4[0, 2] = n4[2, 0] = szx - sxz
+    n4[0, 3] = n4[3, 0] = sxy - syx
+    n4[1, 1] = sxx - syy - szz
+    n4[1, 2] = n4[2, 1] = sxy + syx
+    n4[1, 3] = n4[3, 1] = szx + sxz
+    n4[2, 2] = -sxx + syy - szz
+    n4[2, 3] = n4[3, 2] = syz + szy
+    n4[3, 3] = -sxx - syy + szz
+
+    if np.abs(n4).max() == 0.0:
+        w, x, y, z = 1.0, 0.0, 0.0, 0.0
+    else:
+        q = _largest_eigenvector4(n4)
+        w, x, y, z = q[0], q[1], q[2], q[3]
+
+    r00 = w * w + x * x - y * y - z * z
+    r01 = 2.0 * (x * y - w * z)
+    r02 = 2.0 * (x * z + w * y)
+    r10 = 2.0 * (x * y + w * z)
+    r11 = w * w - x * x + y * y - z * z
+    r12 = 2.0 * (y * z - w * x)
+    r20 = 2.0 * (x * z - w * y)
+    r21 = 2.0 * (y * z + w * x)
+    r22 = w * w - x * x - y * y + z * z
+
+    out = np.empty((n, 3))
+    for i in range(n):
+        px = landmarks[i, 0] - cx
+        py = landmarks[i, 1] - cy
+        pz = landmarks[i, 2] - cz
+        out[i, 0] = r00 * px + r01 * py + r02 * pz + base_center[0]
+        out[i, 1] = r10 * px + r11 * py + r12 * pz + base_center[1]
+        out[i, 2] = r20 * px + r21 * py + r22 * pz + base_center[2]
+    return out
+
+
+# Whether the loop kernels are compiled; alignment only uses its kernel then
+HAVE_NUMBA = njit is not None
+
+if njit is not None:
+    # No fastmath for the mask: it lets LLVM assume NaNs never occur
+    valid_mask = njit(cache=True)(_valid_mask_loop)
+    nan_summary = njit(cache=True)(_nan_summary_loop)
+    sq_distances = njit(cache=True, fastmath=True)(_sq_distances_loop)
+    # Rebound so the compiled alignment kernel calls the compiled solver
+    _largest_eigenvector4 = njit(cache=True)(_largest_eigenvector4)
+    kabsch_align = njit(cache=True)(_kabsch_align_loop)
+else:
+    valid_mask = _valid_mask_numpy
+    nan_summary = _nan_summary_numpy
+    sq_distances = _sq_distances_numpy
+    kabsch_align = None
@@ -3,8 +3,10 @@ Dialog for selecting which landmarks to use for alignment.
 """
 
 import logging
-from typing import Optional
+from typing import Iterable, Optional
 
+import numpy as np
+import numpy.typing as npt
 from PySide6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -15,8 +17,8 @@ from PySide6.QtWidgets import (
     QGridLayout,
     QCheckBox,
     QLabel,
+    QButtonGroup,
 )
-from PySide6.QtCore import Qt
 
 from vptry_facelandmarkview.constants import DEFAULT_ALIGNMENT_LANDMARKS
 
@@ -34,12 +36,16 @@ class LandmarkSelectorDialog(QDialog):
         self.setWindowTitle("Choose Alignment Landmarks")
         self.setModal(True)
 
-        # Initialize selected landmarks to the default set
-        self.selected_landmarks: set[int] = set(DEFAULT_ALIGNMENT_LANDMARKS)
+        # Selection as a boolean mask over all landmarks, initialized to the default set
+        self._selection: npt.NDArray[np.bool_] = np.zeros(TOTAL_LANDMARKS, dtype=bool)
+        self._selection[list(DEFAULT_ALIGNMENT_LANDMARKS)] = True
 
         # Store checkboxes for each landmark
         self.checkboxes: list[QCheckBox] = []
 
+        # Set while checkboxes are updated programmatically from the selection
+        self._syncing_checkboxes: bool = False
+
         self.init_ui()
 
         # Set initial state based on selected_landmarks
@@ -85,14 +91,18 @@ class LandmarkSelectorDialog(QDialog):
         container = QWidget()
         grid_layout = QGridLayout(container)
 
+        # A single non-exclusive button group reports toggles by landmark index,
+        # instead of one connected lambda per checkbox
+        self._checkbox_group = QButtonGroup(self)
+        self._checkbox_group.setExclusive(False)
+        self._checkbox_group.idToggled.connect(self._on_checkbox_changed)
+
         # Create checkboxes in a grid (e.g., 10 columns)
         columns = 10
         for i in range(TOTAL_LANDMARKS):
             checkbox = QCheckBox(str(i))
-            checkbox.setChecked(i in self.selected_landmarks)
-            checkbox.stateChanged.connect(
-                lambda state, idx=i: self._on_checkbox_changed(idx, state)
-            )
+            checkbox.setChecked(bool(self._selection[i]))
+            self._checkbox_group.addButton(checkbox, i)
             self.checkboxes.append(checkbox)
 
             row = i // columns
@@ -116,41 +126,62 @@ class LandmarkSelectorDialog(QDialog):
         button_box_layout.addStretch()
         layout.addLayout(button_box_layout)
 
-    def _on_checkbox_changed(self, landmark_idx: int, state: int) -> None:
+    @property
+    def selected_landmarks(self) -> set[int]:
+        """Set of currently selected landmark indices"""
+        return set(np.flatnonzero(self._selection).tolist())
+
+    @selected_landmarks.setter
+    def selected_landmarks(self, landmarks: Iterable[int]) -> None:
+        self._selection[:] = False
+        self._selection[[i for i in landmarks if 0 <= i < TOTAL_LANDMARKS]] = True
+
+    def set_selected_landmarks(self, landmarks: Iterable[int]) -> None:
+        """Replace the selection and update the checkboxes to match
+
+        Args:
+            landmarks: Landmark indices to select
+        """
+        self.selected_landmarks = landmarks
+        self._update_checkboxes_from_selection()
+
+    def _on_checkbox_changed(self, landmark_idx: int, checked: bool) -> None:
         """Handle checkbox state change
 
         Args:
             landmark_idx: Index of the landmark
-            state: Qt.CheckState value
+            checked: Whether the checkbox is now checked
         """
-        if state == Qt.CheckState.Checked.value:
-            self.selected_landmarks.add(landmark_idx)
-        else:
-            self.selected_landmarks.discard(landmark_idx)
+        if self._syncing_checkboxes:
+            return
+
+        self._selection[landmark_idx] = checked
 
         logger.debug(
-            f"Landmark {landmark_idx} {'added to' if state == Qt.CheckState.Checked.value else 'removed from'} selection. "
-            f"Total: {len(self.selected_landmarks)}"
+            f"Landmark {landmark_idx} {'added to' if checked else 'removed from'} selection. "
+            f"Total: {int(self._selection.sum())}"
         )
 
     def _update_checkboxes_from_selection(self) -> None:
-        """Update all checkboxes based on current selected_landmarks set"""
-        for i, checkbox in enumerate(self.checkboxes):
-            # Temporarily block signals to avoid triggering _on_checkbox_changed
-            checkbox.blockSignals(True)
-            checkbox.setChecked(i in self.selected_landmarks)
-            checkbox.blockSignals(False)
+        """Update all checkboxes based on the current selection"""
+        # A single flag avoids blocking/unblocking signals on every checkbox
+        self._syncing_checkboxes = True
+        try:
+            for checkbox, selected in zip(self.checkboxes, self._selection.tolist()):
+                checkbox.setChecked(selected)
+        finally:
+            self._syncing_checkboxes = False
 
     def select_all(self) -> None:
         """Select all landmarks"""
         logger.info("Selecting all landmarks")
-        self.selected_landmarks = set(range(TOTAL_LANDMARKS))
+        self._selection[:] = True
         self._update_checkboxes_from_selection()
 
     def select_none(self) -> None:
         """Deselect all landmarks"""
         logger.info("Deselecting all landmarks")
-        self.selected_landmarks = set()
+        self._selection[:] = False
         self._update_checkboxes_from_selection()
 
     def select_default(self) -> None:
@@ -158,7 +189,7 @@ class LandmarkSelectorDialog(QDialog):
         logger.info(
             f"Selecting default landmarks ({len(DEFAULT_ALIGNMENT_LANDMARKS)} landmarks)"
         )
-        self.selected_landmarks = set(DEFAULT_ALIGNMENT_LANDMARKS)
+        self.selected_landmarks = DEFAULT_ALIGNMENT_LANDMARKS
         self._update_checkboxes_from_selection()
 
     def get_selected_landmarks(self) -> list[int]:
@@ -167,4 +198,4 @@ class LandmarkSelectorDialog(QDialog):
         Returns:
             Sorted list of selected landmark indices
         """
-        return sorted(list(self.selected_landmarks))
+        return np.flatnonzero(self._selection).tolist()
@@ -9,6 +9,7 @@ from pathlib import Path
 
 from PySide6.QtWidgets import QApplication
 from PySide6.QtGui import QSurfaceFormat
+from PySide6.QtCore import Qt
 
 from vptry_facelandmarkview.viewer import FaceLandmarkViewer
 
@@ -43,6 +44,9 @@ def main() -> None:
     fmt.setSamples(4)  # Enable multisampling for better quality
     QSurfaceFormat.setDefaultFormat(fmt)
 
+    # Let the projection widgets share one vertex buffer between their contexts
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
+
     app = QApplication(sys.argv)
     viewer = FaceLandmarkViewer(
         initial_file=args.file, initial_base_frame=args.base_frame
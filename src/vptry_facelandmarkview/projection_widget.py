@@ -3,17 +3,16 @@ OpenGL widget for rendering 2D projections of face landmarks.
 """
 
 import logging
-from functools import partial
 from typing import Optional
 
 import numpy as np
 import numpy.typing as npt
 from PySide6.QtWidgets import QWidget
+from PySide6.QtGui import QOpenGLContext
 from PySide6.QtOpenGLWidgets import QOpenGLWidget
 import OpenGL.GL as gl
 
 from vptry_facelandmarkview.constants import (
-    DEFAULT_ALIGNMENT_LANDMARKS,
     ProjectionType,
     PROJECTION_VIEWPORT_FILL,
     PROJECTION_Z_SCALE,
@@ -21,11 +20,97 @@ from vptry_facelandmarkview.constants import (
     CURRENT_LANDMARK_COLOR,
     VECTOR_COLOR,
     DisplayState,
+    SMOOTH_PRIMITIVES,
 )
-from vptry_facelandmarkview.utils import filter_nan_landmarks
+from vptry_facelandmarkview.frame_delta import FrameDelta, FrameDeltaModel
 
 logger = logging.getLogger(__name__)
 
+# Rows select the horizontal and vertical screen axes from scaled (x, y, z)
+PROJECTION_MATRICES = {
+    # X-Z projection (top view) - x horizontal, z vertical (negated) with additional z-scale
+    ProjectionType.XZ: np.array(
+        [[1.0, 0.0, 0.0], [0.0, 0.0, -PROJECTION_Z_SCALE]], dtype=np.float32
+    ),
+    # Y-Z projection (side view) - z horizontal with additional z-scale, y vertical (negated, top is -y)
+    ProjectionType.YZ: np.array(
+        [[0.0, 0.0, PROJECTION_Z_SCALE], [0.0, -1.0, 0.0]], dtype=np.float32
+    ),
+    # X-Y projection (not used currently)
+    ProjectionType.XY: np.array([[1.0, 0.0, 0.0], [0.0, -1.0, 0.0]], dtype=np.float32),
+}
+
+
+def projection_modelview(
+    projection: npt.NDArray[np.float32],
+) -> npt.NDArray[np.float32]:
+    """Build a column-major modelview matrix from a (2, 3) projection matrix
+
+    The resulting matrix maps scaled (x, y, z) vertices onto the screen axes
+    and flattens depth to 0, ready for glLoadMatrixf.
+    """
+    modelview = np.zeros((4, 4), dtype=np.float32)
+    modelview[:2, :3] = projection
+    modelview[3, 3] = 1.0
+    return np.ascontiguousarray(modelview.T)
+
+
+class SharedSceneBuffer:
+    """Vertex buffer of scaled 3D landmarks that projection widgets can share
+
+    The vertices are the same for every projection; only the modelview matrix
+    differs. Widgets whose GL contexts share objects (see
+    Qt.AA_ShareOpenGLContexts) can hold one instance, so the first widget to
+    paint after a change uploads the scene and the others just bind it.
+    """
+
+    def __init__(self) -> None:
+        self.vbo: Optional[int] = None
+        self.context: Optional[QOpenGLContext] = None
+        self.counts: tuple[int, int, int] = (0, 0, 0)
+        self.key: Optional[tuple] = None
+
+    def upload(
+        self,
+        key: tuple,
+        base: npt.NDArray[np.float32],
+        current: npt.NDArray[np.float32],
+        vectors: Optional[npt.NDArray[np.float32]],
+    ) -> None:
+        """Store base points, current points and vector endpoints back to back
+
+        Must be called with a current GL context that shares objects with
+        self.context (or any context, the first time).
+        """
+        if self.vbo is None:
+            self.vbo = gl.glGenBuffers(1)
+            self.context = QOpenGLContext.currentContext()
+
+        parts = [base, current]
+        if vectors is not None:
+            parts.append(vectors)
+        vertices = np.concatenate(parts)
+        self.counts = (
+            len(base),
+            len(current),
+            0 if vectors is None else len(vectors),
+        )
+
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, self.vbo)
+        gl.glBufferData(
+            gl.GL_ARRAY_BUFFER, vertices.nbytes, vertices, gl.GL_DYNAMIC_DRAW
+        )
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+        self.key = key
+
+    def release(self) -> None:
+        """Delete the buffer; must be called with self.context current"""
+        if self.vbo is not None:
+            gl.glDeleteBuffers(1, [self.vbo])
+        self.vbo = None
+        self.context = None
+        self.key = None
+
 
 class ProjectionWidget(QOpenGLWidget):
     """OpenGL widget for rendering 2D projections of landmarks"""
@@ -44,20 +129,51 @@ class ProjectionWidget(QOpenGLWidget):
         """
         super().__init__(parent)
         self.projection_type = projection_type
-        self.data: Optional[npt.NDArray[np.float64]] = None
+        self._modelview = projection_modelview(PROJECTION_MATRICES[projection_type])
+        self.data: Optional[npt.NDArray[np.float32]] = None
         self.state = DisplayState()
 
         # Store shared center and scale from main widget
         self.center: Optional[npt.NDArray[np.float64]] = None
         self.scale: Optional[float] = None
 
-    def set_data(self, data: npt.NDArray[np.float64]) -> None:
-        """Set the landmark data"""
+        # Filtered/aligned landmarks, shared with other widgets when injected
+        self._frame_delta_model = FrameDeltaModel()
+
+        # Key of the scene the current state describes (starting with the frame
+        # delta it is built from), recomputed only after a setter marks it dirty
+        self._scene_key: Optional[tuple] = None
+        self._scene_dirty: bool = True
+
+        # Vertex buffer of the scaled scene; the viewer shares one between
+        # projections so each frame change is uploaded once
+        self._scene_buffer = SharedSceneBuffer()
+
+    def set_data(
+        self,
+        data: npt.NDArray[np.float32],
+        valid_mask: Optional[npt.NDArray[np.bool_]] = None,
+    ) -> None:
+        """Set the landmark data and, optionally, its precomputed NaN mask"""
         logger.debug(
             f"{self.projection_type} projection: Setting data with shape: {data.shape}"
         )
-        self.data = data
-        self.update()
+        # The model keeps a float32 copy, shared with the other widgets
+        self._frame_delta_model.set_data(data, valid_mask)
+        self.data = self._frame_delta_model.data
+        self._invalidate_scene()
+
+    def set_frame_delta_model(self, model: FrameDeltaModel) -> None:
+        """Use a frame delta model shared with other widgets"""
+        self._frame_delta_model = model
+        if self.data is not None:
+            model.set_data(self.data)
+        self._invalidate_scene()
+
+    def set_scene_buffer(self, scene_buffer: SharedSceneBuffer) -> None:
+        """Use a vertex buffer shared with other projection widgets"""
+        self._scene_buffer = scene_buffer
+        self._invalidate_scene()
 
     def set_base_frame(self, frame: int) -> None:
         """Set the base frame"""
@@ -65,15 +181,15 @@ class ProjectionWidget(QOpenGLWidget):
             f"{self.projection_type} projection: Setting base frame to: {frame}"
         )
         self.state.base_frame = frame
-        self.update()
+        self._invalidate_scene()
 
     def set_current_frame(self, frame: int) -> None:
         """Set the current frame"""
         logger.debug(
-            f"{self.projection_type} projection: Setting current frame to: {frame}"
+            "%s projection: Setting current frame to: %d", self.projection_type, frame
         )
         self.state.current_frame = frame
-        self.update()
+        self._invalidate_scene()
 
     def set_show_vectors(self, show: bool) -> None:
         """Set whether to show vectors"""
@@ -81,7 +197,7 @@ class ProjectionWidget(QOpenGLWidget):
             f"{self.projection_type} projection: Setting show_vectors to: {show}"
         )
         self.state.show_vectors = show
-        self.update()
+        self._invalidate_scene()
 
     def set_align_faces(self, align: bool) -> None:
         """Set whether to align faces to base frame"""
@@ -89,7 +205,7 @@ class ProjectionWidget(QOpenGLWidget):
             f"{self.projection_type} projection: Setting align_faces to: {align}"
         )
         self.state.align_faces = align
-        self.update()
+        self._invalidate_scene()
 
     def set_use_static_points(self, use_static: bool) -> None:
         """Set whether to use only static points for alignment"""
@@ -97,7 +213,7 @@ class ProjectionWidget(QOpenGLWidget):
             f"{self.projection_type} projection: Setting use_static_points to: {use_static}"
         )
         self.state.use_static_points = use_static
-        self.update()
+        self._invalidate_scene()
 
     def set_alignment_method(self, method: str) -> None:
         """Set the alignment method to use"""
@@ -105,7 +221,7 @@ class ProjectionWidget(QOpenGLWidget):
             f"{self.projection_type} projection: Setting alignment_method to: {method}"
         )
         self.state.alignment_method = method
-        self.update()
+        self._invalidate_scene()
 
     def set_alignment_landmarks(self, landmarks: list[int]) -> None:
         """Set custom landmarks to use for alignment calculation"""
@@ -113,36 +229,16 @@ class ProjectionWidget(QOpenGLWidget):
             f"{self.projection_type} projection: Setting alignment_landmarks to {len(landmarks)} landmarks"
         )
         self.state.alignment_landmarks = landmarks
-        self.update()
+        self._invalidate_scene()
 
     def set_center_and_scale(
         self, center: npt.NDArray[np.float64], scale: float
     ) -> None:
         """Set the center and scale from the main widget"""
-        self.center = center
+        # Match the data dtype so centering doesn't upcast to float64
+        self.center = np.asarray(center, dtype=np.float32)
         self.scale = scale
-        self.update()
-
-    def _project_to_2d(
-        self, scaled_point: npt.NDArray[np.float64]
-    ) -> tuple[float, float]:
-        """Project a scaled 3D point to 2D based on projection type
-
-        Args:
-            scaled_point: 3D point already scaled and centered
-
-        Returns:
-            Tuple of (x, y) coordinates in 2D projection space
-        """
-        if self.projection_type == ProjectionType.XZ:
-            # X-Z projection (top view) - x horizontal, z vertical (negated) with additional z-scale
-            return scaled_point[0], -scaled_point[2] * PROJECTION_Z_SCALE
-        elif self.projection_type == ProjectionType.YZ:
-            # Y-Z projection (side view) - z horizontal with additional z-scale, y vertical (negated, top is -y)
-            return scaled_point[2] * PROJECTION_Z_SCALE, -scaled_point[1]
-        else:  # xy
-            # X-Y projection (not used currently)
-            return scaled_point[0], -scaled_point[1]
+        self._invalidate_scene()
 
     def initializeGL(self) -> None:
         """Initialize OpenGL"""
@@ -151,12 +247,26 @@ class ProjectionWidget(QOpenGLWidget):
         )
         gl.glEnable(gl.GL_BLEND)
         gl.glBlendFunc(gl.GL_SRC_ALPHA, gl.GL_ONE_MINUS_SRC_ALPHA)
-        gl.glEnable(gl.GL_POINT_SMOOTH)
-        gl.glEnable(gl.GL_LINE_SMOOTH)
-        gl.glHint(gl.GL_POINT_SMOOTH_HINT, gl.GL_NICEST)
-        gl.glHint(gl.GL_LINE_SMOOTH_HINT, gl.GL_NICEST)
+        if SMOOTH_PRIMITIVES:
+            gl.glEnable(gl.GL_POINT_SMOOTH)
+            gl.glEnable(gl.GL_LINE_SMOOTH)
+            gl.glHint(gl.GL_POINT_SMOOTH_HINT, gl.GL_NICEST)
+            gl.glHint(gl.GL_LINE_SMOOTH_HINT, gl.GL_NICEST)
+        else:
+            gl.glDisable(gl.GL_POINT_SMOOTH)
+            gl.glDisable(gl.GL_LINE_SMOOTH)
         gl.glClearColor(1.0, 1.0, 1.0, 1.0)
 
+        self.context().aboutToBeDestroyed.connect(self._cleanup_gl)
+
+    def _cleanup_gl(self) -> None:
+        """Release the vertex buffer if it was created in this context"""
+        if self._scene_buffer.context is not self.context():
+            return
+        self.makeCurrent()
+        self._scene_buffer.release()
+        self.doneCurrent()
+
     def resizeGL(self, w: int, h: int) -> None:
         """Handle window resize"""
         logger.debug(
@@ -176,149 +286,156 @@ class ProjectionWidget(QOpenGLWidget):
 
     def paintGL(self) -> None:
         """Render the scene"""
-        logger.debug(f"{self.projection_type} projection: paintGL called")
+        logger.debug("%s projection: paintGL called", self.projection_type)
         gl.glClear(gl.GL_COLOR_BUFFER_BIT)
         gl.glLoadIdentity()
 
         if self.data is None or self.center is None or self.scale is None:
-            logger.debug(f"{self.projection_type} projection: No data to render")
+            logger.debug("%s projection: No data to render", self.projection_type)
             return
 
-        # Get landmark data
-        base_landmarks = self.data[self.state.base_frame]
-        current_landmarks = self.data[self.state.current_frame]
+        # Paint events for exposure alone reuse the cached scene key
+        if self._scene_dirty:
+            self._update_scene_key()
+            self._scene_dirty = False
 
-        # Filter out NaN values
-        base_landmarks_valid, base_valid_mask = filter_nan_landmarks(base_landmarks)
-        current_landmarks_valid, current_valid_mask = filter_nan_landmarks(
-            current_landmarks
-        )
+        if self._scene_key is None:
+            return
 
-        if len(base_landmarks_valid) == 0:
-            logger.error(
-                f"{self.projection_type} projection: No valid base landmarks to render"
+        scene_buffer = self._get_scene_buffer()
+        if scene_buffer.key != self._scene_key:
+            scene_buffer.upload(
+                self._scene_key, *self._compute_scaled_scene(self._scene_key[0])
             )
-            return
+        base_count, current_count, vector_count = scene_buffer.counts
+
+        gl.glLoadMatrixf(self._modelview)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, scene_buffer.vbo)
+        gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glVertexPointer(3, gl.GL_FLOAT, 0, None)
 
         # Draw base frame landmarks (blue)
+        self._draw_projection_landmarks(0, base_count, BASE_LANDMARK_COLOR, "base")
+
+        # Draw current frame landmarks (red)
         self._draw_projection_landmarks(
-            base_landmarks_valid, BASE_LANDMARK_COLOR, "base"
+            base_count, current_count, CURRENT_LANDMARK_COLOR, "current"
         )
 
-        # Create alignment function if enabled
-        alignment_fn = None
-        if self.state.align_faces and len(current_landmarks_valid) > 0:
-            # Import alignment method
-            from vptry_facelandmarkview.alignments import get_alignment_method
-
-            # Get the selected alignment function
-            align_func = get_alignment_method(self.state.alignment_method)
-
-            alignment_indices = None
-            if self.state.use_static_points:
-                alignment_indices = (
-                    self.state.alignment_landmarks
-                    if self.state.alignment_landmarks is not None
-                    else DEFAULT_ALIGNMENT_LANDMARKS
-                )
-
-            alignment_fn = partial(
-                align_func,
-                base_landmarks=base_landmarks_valid,
-                alignment_indices=alignment_indices,
+        # Draw vectors if enabled
+        if vector_count > 0:
+            self._draw_projection_vectors(base_count + current_count, vector_count)
+
+        gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
+        gl.glBindBuffer(gl.GL_ARRAY_BUFFER, 0)
+
+    def _get_scene_buffer(self) -> SharedSceneBuffer:
+        """Get the scene buffer, switching to a private one if it isn't usable
+
+        A shared buffer only works if this widget's context shares objects
+        with the context it was created in; otherwise fall back to a buffer
+        of our own.
+        """
+        buffer_context = self._scene_buffer.context
+        if buffer_context is not None and not QOpenGLContext.areSharing(
+            buffer_context, self.context()
+        ):
+            logger.warning(
+                f"{self.projection_type} projection: GL context is not shared, "
+                "using a private vertex buffer"
             )
+            self._scene_buffer = SharedSceneBuffer()
+        return self._scene_buffer
 
-        # Draw current frame landmarks (red)
-        self._draw_projection_landmarks(
-            current_landmarks_valid,
-            CURRENT_LANDMARK_COLOR,
-            "current",
-            alignment_fn=alignment_fn,
+    def _invalidate_scene(self) -> None:
+        """Mark the cached scene key as stale and schedule a repaint"""
+        self._scene_dirty = True
+        self.update()
+
+    def _update_scene_key(self) -> None:
+        """Look up the frame delta for the current state and key the scene on it
+
+        The key holds everything the uploaded vertices depend on, so widgets
+        showing the same state share one upload.
+        """
+        state = self.state
+        delta = self._frame_delta_model.get(
+            state.base_frame,
+            state.current_frame,
+            state.align_faces,
+            state.use_static_points,
+            state.alignment_method,
+            state.alignment_landmarks,
         )
+        if delta is None:
+            logger.error(
+                f"{self.projection_type} projection: No valid base landmarks to render"
+            )
+            self._scene_key = None
+            return
 
-        # Draw vectors if enabled
-        if self.state.show_vectors and len(current_landmarks_valid) > 0:
-            both_valid_mask = base_valid_mask & current_valid_mask
-            base_landmarks_both = base_landmarks[both_valid_mask]
-            current_landmarks_both = current_landmarks[both_valid_mask]
-
-            if self.state.align_faces and len(current_landmarks_both) > 0:
-                # Import alignment method
-                from vptry_facelandmarkview.alignments import get_alignment_method
-
-                # Get the selected alignment function
-                align_func = get_alignment_method(self.state.alignment_method)
-
-                if self.state.use_static_points:
-                    vector_alignment_indices = (
-                        self.state.alignment_landmarks
-                        if self.state.alignment_landmarks is not None
-                        else DEFAULT_ALIGNMENT_LANDMARKS
-                    )
-                else:
-                    vector_alignment_indices = None
-                current_landmarks_both = align_func(
-                    current_landmarks_both,
-                    base_landmarks_both,
-                    alignment_indices=vector_alignment_indices,
-                )
-
-            if len(base_landmarks_both) > 0:
-                self._draw_projection_vectors(
-                    base_landmarks_both, current_landmarks_both
-                )
+        self._scene_key = (
+            delta,
+            state.show_vectors,
+            tuple(self.center.tolist()),
+            self.scale,
+        )
+
+    def _compute_scaled_scene(
+        self, delta: FrameDelta
+    ) -> tuple[
+        npt.NDArray[np.float32],
+        npt.NDArray[np.float32],
+        Optional[npt.NDArray[np.float32]],
+    ]:
+        """Center and scale the landmarks of a frame delta for display
+
+        Returns:
+            Tuple of (base, current, vectors) float32 (n, 3) arrays, where
+            vectors holds interleaved base/current endpoints or is None when
+            vectors are hidden.
+        """
+        base = (delta.base_valid - self.center) * self.scale
+        current = (delta.current_aligned - self.center) * self.scale
+
+        vectors = None
+        if self.state.show_vectors and len(delta.current_aligned) > 0:
+            # Interleave base/current endpoints so each consecutive pair is one line
+            vectors = np.empty((2 * len(delta.base_both), 3), dtype=np.float32)
+            vectors[0::2] = (delta.base_both - self.center) * self.scale
+            vectors[1::2] = (delta.current_both - self.center) * self.scale
+
+        return (
+            base.astype(np.float32, copy=False),
+            current.astype(np.float32, copy=False),
+            vectors,
+        )
 
     def _draw_projection_landmarks(
         self,
-        landmarks: npt.NDArray[np.float64],
+        first: int,
+        count: int,
         color: tuple[float, float, float, float],
         label: str,
-        alignment_fn: Optional = None,
     ) -> None:
-        """Draw landmarks as 2D projection"""
-        if len(landmarks) == 0:
+        """Draw a range of the bound vertex buffer as points"""
+        if count == 0:
             return
 
-        # Apply alignment if provided
-        if alignment_fn is not None:
-            landmarks = alignment_fn(landmarks)
-
         logger.debug(
-            f"{self.projection_type} projection: Drawing {len(landmarks)} {label} landmarks"
+            "%s projection: Drawing %d %s landmarks", self.projection_type, count, label
         )
         gl.glPointSize(2.0)
         gl.glColor4f(*color)
-        gl.glBegin(gl.GL_POINTS)
+        gl.glDrawArrays(gl.GL_POINTS, first, count)
 
-        for point in landmarks:
-            # Project to 2D based on projection type
-            scaled_point = (point - self.center) * self.scale
-            x, y = self._project_to_2d(scaled_point)
-            gl.glVertex2f(x, y)
-
-        gl.glEnd()
-
-    def _draw_projection_vectors(
-        self,
-        base_landmarks: npt.NDArray[np.float64],
-        current_landmarks: npt.NDArray[np.float64],
-    ) -> None:
-        """Draw vectors as 2D projection"""
+    def _draw_projection_vectors(self, first: int, count: int) -> None:
+        """Draw a range of interleaved base/current endpoints as lines"""
         logger.debug(
-            f"{self.projection_type} projection: Drawing {len(base_landmarks)} vectors (green)"
+            "%s projection: Drawing %d vectors (green)",
+            self.projection_type,
+            count // 2,
         )
         gl.glLineWidth(1.0)
         gl.glColor4f(*VECTOR_COLOR)
-        gl.glBegin(gl.GL_LINES)
-
-        for base_pt, curr_pt in zip(base_landmarks, current_landmarks):
-            scaled_base = (base_pt - self.center) * self.scale
-            scaled_curr = (curr_pt - self.center) * self.scale
-
-            base_x, base_y = self._project_to_2d(scaled_base)
-            curr_x, curr_y = self._project_to_2d(scaled_curr)
-
-            gl.glVertex2f(base_x, base_y)
-            gl.glVertex2f(curr_x, curr_y)
-
-        gl.glEnd()
+        gl.glDrawArrays(gl.GL_LINES, first, count)
@@ -8,23 +8,62 @@ import numpy as np
 import numpy.typing as npt
 import OpenGL.GL as gl
 
-from vptry_facelandmarkview.constants import POINT_SIZE, SCALE_MARGIN
+from vptry_facelandmarkview.constants import (
+    DEFAULT_ALIGNMENT_LANDMARKS,
+    POINT_SIZE,
+    SCALE_MARGIN,
+)
 
 logger = logging.getLogger(__name__)
 
+# DEFAULT_ALIGNMENT_LANDMARKS as an index array, built once at import so
+# repaints don't re-materialize the indexer
+DEFAULT_ALIGNMENT_INDICES = np.asarray(DEFAULT_ALIGNMENT_LANDMARKS, dtype=np.intp)
+DEFAULT_ALIGNMENT_INDICES.setflags(write=False)
+
+
+def valid_landmark_mask(
+    landmarks: npt.NDArray[np.floating],
+) -> npt.NDArray[np.bool_]:
+    """Mask of landmarks whose coordinates are all non-NaN
+
+    Checks x, y and z separately and combines them, so no (..., 3) boolean
+    intermediate is built. Works on a single frame (n_landmarks, 3) or the
+    whole data cube (n_frames, n_landmarks, 3).
+
+    Args:
+        landmarks: Landmark array with coordinates on the last axis
+
+    Returns:
+        Boolean array with the last axis removed
+    """
+    invalid = np.isnan(landmarks[..., 0])
+    invalid |= np.isnan(landmarks[..., 1])
+    invalid |= np.isnan(landmarks[..., 2])
+    return ~invalid
+
 
 def filter_nan_landmarks(
     landmarks: npt.NDArray[np.float64],
+    assume_clean: bool = False,
+    valid_mask: Optional[npt.NDArray[np.bool_]] = None,
 ) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.bool_]]:
     """Filter out landmarks with NaN values
 
     Args:
         landmarks: Landmark array to filter
+        assume_clean: If True, the caller knows there are no NaNs; the scan is
+            skipped and landmarks are returned as-is with an all-True mask
+        valid_mask: Optional precomputed mask for these landmarks (e.g. a row
+            of a mask cached at load time); skips the NaN scan
 
     Returns:
         Tuple of (valid_landmarks, valid_mask)
     """
-    valid_mask = ~np.isnan(landmarks).any(axis=1)
+    if assume_clean:
+        return landmarks, np.ones(len(landmarks), dtype=np.bool_)
+    if valid_mask is None:
+        valid_mask = valid_landmark_mask(landmarks)
     valid_landmarks = landmarks[valid_mask]
     return valid_landmarks, valid_mask
 
@@ -41,17 +80,140 @@ def calculate_center_and_scale(
         Tuple of (center, scale)
     """
     center = base_landmarks.mean(axis=0)
-    extent = base_landmarks.max(axis=0) - base_landmarks.min(axis=0)
-    max_extent = extent.max()
+    extent = np.ptp(base_landmarks, axis=0)
+    max_extent = float(extent.max())
     # Apply margin to give 20% extra space
     scale = (2.0 / SCALE_MARGIN) / max_extent if max_extent > 0 else 1.0
     return center, scale
 
 
+def scale_landmarks_for_display(
+    landmarks: npt.NDArray[np.floating],
+    center: npt.NDArray[np.floating],
+    scale: float,
+) -> npt.NDArray[np.floating]:
+    """Center, scale and Y-flip landmarks into view coordinates
+
+    Args:
+        landmarks: Landmarks to transform (n_points, 3)
+        center: Data center for transformation
+        scale: Scale factor for transformation
+
+    Returns:
+        Transformed landmarks (n_points, 3), ready to be drawn
+    """
+    # Cast once so float32 landmarks aren't upcast by a float64 center
+    center = np.asarray(center, dtype=landmarks.dtype)
+    # Flip Y coordinate to fix upside-down display, folded into the scale
+    axis_scale = np.array([scale, -scale, scale], dtype=landmarks.dtype)
+    scaled = landmarks - center
+    scaled *= axis_scale
+    return scaled
+
+
+def perspective_matrix(
+    fov_y: float, aspect: float, near: float, far: float
+) -> npt.NDArray[np.float32]:
+    """Build a perspective projection matrix equivalent to gluPerspective
+
+    The matrix is laid out so that it can be passed directly to
+    glLoadMatrixf (OpenGL expects column-major order).
+
+    Args:
+        fov_y: Vertical field of view in degrees
+        aspect: Viewport aspect ratio (width / height)
+        near: Distance to the near clipping plane
+        far: Distance to the far clipping plane
+
+    Returns:
+        4x4 float32 projection matrix
+    """
+    f = 1.0 / np.tan(np.radians(fov_y) / 2.0)
+    return np.array(
+        [
+            [f / aspect, 0.0, 0.0, 0.0],
+            [0.0, f, 0.0, 0.0],
+            [0.0, 0.0, (far + near) / (near - far), -1.0],
+            [0.0, 0.0, (2.0 * far * near) / (near - far), 0.0],
+        ],
+        dtype=np.float32,
+    )
+
+
+def camera_matrix(
+    zoom: float, rotation_x: float, rotation_y: float
+) -> npt.NDArray[np.float32]:
+    """Build the modelview matrix for the orbit camera
+
+    Equivalent to glTranslatef(0, 0, -zoom) followed by
+    glRotatef(rotation_x, 1, 0, 0) and glRotatef(rotation_y, 0, 1, 0),
+    laid out so that it can be passed directly to glLoadMatrixf.
+
+    Args:
+        zoom: Distance of the camera from the origin
+        rotation_x: Rotation around the X axis in degrees
+        rotation_y: Rotation around the Y axis in degrees
+
+    Returns:
+        4x4 float32 modelview matrix (column-major)
+    """
+    cx, sx = np.cos(np.radians(rotation_x)), np.sin(np.radians(rotation_x))
+    cy, sy = np.cos(np.radians(rotation_y)), np.sin(np.radians(rotation_y))
+    translate = np.eye(4)
+    translate[2, 3] = -zoom
+    rotate_x = np.array(
+        [
+            [1.0, 0.0, 0.0, 0.0],
+            [0.0, cx, -sx, 0.0],
+            [0.0, sx, cx, 0.0],
+            [0.0, 0.0, 0.0, 1.0],
+        ]
+    )
+    rotate_y = np.array(
+        [
+            [cy, 0.0, sy, 0.0],
+            [0.0, 1.0, 0.0, 0.0],
+            [-sy, 0.0, cy, 0.0],
+            [0.0, 0.0, 0.0, 1.0],
+        ]
+    )
+    # Transpose to column-major order for OpenGL
+    return np.ascontiguousarray((translate @ rotate_x @ rotate_y).T, dtype=np.float32)
+
+
+def aabb_outside_frustum(
+    lo: npt.NDArray[np.floating],
+    hi: npt.NDArray[np.floating],
+    clip_matrix: npt.NDArray[np.float32],
+) -> bool:
+    """Check whether an axis-aligned box is entirely outside the view frustum
+
+    The eight corners are taken to clip space; the box is culled only when
+    all of them lie beyond the same frustum plane, so this never rejects
+    anything visible (it may keep some boxes that are not).
+
+    Args:
+        lo: Minimum corner of the box (3,)
+        hi: Maximum corner of the box (3,)
+        clip_matrix: Combined modelview-projection matrix in the column-major
+            layout passed to glLoadMatrixf (modelview @ projection)
+
+    Returns:
+        True if nothing inside the box can be visible
+    """
+    corners = np.ones((8, 4), dtype=np.float32)
+    corners[:, 0] = np.where(np.arange(8) & 1, hi[0], lo[0])
+    corners[:, 1] = np.where(np.arange(8) & 2, hi[1], lo[1])
+    corners[:, 2] = np.where(np.arange(8) & 4, hi[2], lo[2])
+    clip = corners @ clip_matrix
+    w = clip[:, 3:]
+    return bool(((clip[:, :3] < -w).all(axis=0) | (clip[:, :3] > w).all(axis=0)).any())
+
+
 def align_landmarks_to_base(
     landmarks: npt.NDArray[np.float64],
     base_landmarks: npt.NDArray[np.float64],
-    alignment_indices: Optional[set[int] | list[int]] = None,
+    alignment_indices: Optional[set[int] | list[int] | tuple[int, ...]] = None,
 ) -> npt.NDArray[np.float64]:
     """Align landmarks to base landmarks using Procrustes alignment
 
@@ -65,7 +227,7 @@ def align_landmarks_to_base(
     Args:
         landmarks: Landmarks to align (n_points, 3)
         base_landmarks: Base landmarks to align to (n_points, 3)
-        alignment_indices: Optional set or list of landmark indices to use for
+        alignment_indices: Optional set, list or tuple of landmark indices to use for
             calculating alignment. If provided, only these landmarks are used
             to compute the transformation, which is then applied to all landmarks.
             If None, all landmarks are used for alignment calculation.
@@ -88,6 +250,8 @@ def draw_landmarks(
     alignment_fn: Optional[
         Callable[[npt.NDArray[np.float64]], npt.NDArray[np.float64]]
     ] = None,
+    presented_points: Optional[npt.NDArray[np.floating]] = None,
+    clip_matrix: Optional[npt.NDArray[np.float32]] = None,
 ) -> None:
     """Draw landmarks as points
 
@@ -98,25 +262,43 @@ def draw_landmarks(
         color: RGBA color tuple
         label: Label for logging
         alignment_fn: Optional function to align landmarks before drawing
+        presented_points: Optional landmarks already transformed with
+            scale_landmarks_for_display. If given, alignment and scaling
+            are skipped and these points are drawn as-is.
+        clip_matrix: Optional modelview-projection matrix (see
+            aabb_outside_frustum). If given, nothing is submitted when the
+            points' bounding box is entirely off-screen.
     """
-    if len(landmarks) == 0:
+    if presented_points is None:
+        if len(landmarks) == 0:
+            return
+
+        # Apply alignment if provided
+        if alignment_fn is not None:
+            landmarks = alignment_fn(landmarks)
+
+        presented_points = scale_landmarks_for_display(landmarks, center, scale)
+
+    if len(presented_points) == 0:
         return
 
-    # Apply alignment if provided
-    if alignment_fn is not None:
-        landmarks = alignment_fn(landmarks)
+    if clip_matrix is not None and aabb_outside_frustum(
+        presented_points.min(axis=0), presented_points.max(axis=0), clip_matrix
+    ):
+        logger.debug("Skipping %s landmarks: outside the view frustum", label)
+        return
 
-    logger.debug(f"Drawing {len(landmarks)} {label} landmarks")
+    logger.debug(
+        "Drawing %d %s landmarks, first scaled landmark: %s",
+        len(presented_points),
+        label,
+        presented_points[0],
+    )
+    # Submit all points in one call from a contiguous float32 client array
+    vertices = np.ascontiguousarray(presented_points, dtype=np.float32)
     gl.glPointSize(POINT_SIZE)
     gl.glColor4f(*color)
-    gl.glBegin(gl.GL_POINTS)
-    for i, point in enumerate(landmarks):
-        # Flip Y coordinate to fix upside-down display
-        scaled_point = (point - center) * scale
-        scaled_point[1] = -scaled_point[1]  # Flip Y
-        if i == 0:  # Log first point as example
-            logger.debug(
-                f"First {label} landmark: original={point}, scaled={scaled_point}"
-            )
-        gl.glVertex3f(scaled_point[0], scaled_point[1], scaled_point[2])
-    gl.glEnd()
+    gl.glEnableClientState(gl.GL_VERTEX_ARRAY)
+    gl.glVertexPointerf(vertices)
+    gl.glDrawArrays(gl.GL_POINTS, 0, len(vertices))
+    gl.glDisableClientState(gl.GL_VERTEX_ARRAY)
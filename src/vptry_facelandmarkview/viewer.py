@@ -22,16 +22,26 @@ from PySide6.QtWidgets import (
     QSpinBox,
     QComboBox,
 )
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QTimer, Signal, SignalInstance
 
 from vptry_facelandmarkview.gl_widget import LandmarkGLWidget
-from vptry_facelandmarkview.projection_widget import ProjectionWidget
+from vptry_facelandmarkview.projection_widget import (
+    ProjectionWidget,
+    SharedSceneBuffer,
+)
 from vptry_facelandmarkview.histogram_widget import HistogramWidget
+from vptry_facelandmarkview.frame_delta import FrameDeltaModel
+from vptry_facelandmarkview.kernels import nan_summary
 from vptry_facelandmarkview.landmark_selector_dialog import LandmarkSelectorDialog
+from vptry_facelandmarkview.utils import (
+    calculate_center_and_scale,
+    filter_nan_landmarks,
+)
 from vptry_facelandmarkview.constants import (
     ProjectionType,
     PROJECTION_SIZE_PX,
     DEFAULT_ALIGNMENT_LANDMARKS,
+    FRAME_UPDATE_INTERVAL_MS,
 )
 
 # UI text constants
@@ -56,7 +66,11 @@ logger = logging.getLogger(__name__)
 class VisualizationWidget(Protocol):
     """Protocol for visualization widgets that can be updated together"""
 
-    def set_data(self, data: npt.NDArray[np.float64]) -> None: ...
+    def set_data(
+        self,
+        data: npt.NDArray[np.float32],
+        valid_mask: Optional[npt.NDArray[np.bool_]] = None,
+    ) -> None: ...
     def set_base_frame(self, frame: int) -> None: ...
     def set_current_frame(self, frame: int) -> None: ...
     def set_show_vectors(self, show: bool) -> None: ...
@@ -69,11 +83,24 @@ class VisualizationWidget(Protocol):
 class FaceLandmarkViewer(QMainWindow):
     """Main window for the face landmark viewer application"""
 
+    # View state changes, connected to every visualization widget's setter
+    frameChanged = Signal(int)
+    baseFrameChanged = Signal(int)
+    showVectorsChanged = Signal(bool)
+    alignFacesChanged = Signal(bool)
+    useStaticPointsChanged = Signal(bool)
+    alignmentMethodChanged = Signal(str)
+    alignmentLandmarksChanged = Signal(list)
+
     def __init__(
         self, initial_file: Optional[Path] = None, initial_base_frame: int = 0
     ) -> None:
         super().__init__()
-        self.data: Optional[npt.NDArray[np.float64]] = None
+        self.data: Optional[npt.NDArray[np.float32]] = None
+        # Whether the loaded data has any NaN; lets NaN filtering be skipped
+        self.data_has_nan: bool = True
+        # Per-frame landmark validity (n_frames, n_landmarks), computed on load
+        self.valid_mask: Optional[npt.NDArray[np.bool_]] = None
         self.base_frame: int = initial_base_frame
         self.current_frame: int = 0
         self.show_vectors: bool = False
@@ -85,6 +112,23 @@ class FaceLandmarkViewer(QMainWindow):
         # Store selected landmarks for alignment (initialized to default)
         self.selected_alignment_landmarks: list[int] = list(DEFAULT_ALIGNMENT_LANDMARKS)
 
+        # Projection center/scale per base frame, cleared when new data is loaded
+        self._base_cache: dict[
+            int, Optional[tuple[npt.NDArray[np.float64], float]]
+        ] = {}
+
+        # Frame label texts ("i / last"), built once per loaded file
+        self._frame_labels: list[str] = []
+
+        # Latest slider value not yet pushed to the widgets. The first value
+        # of a drag is applied at once; later ones are throttled to one
+        # widget update per FRAME_UPDATE_INTERVAL_MS
+        self._pending_frame: Optional[int] = None
+        self._frame_update_timer = QTimer(self)
+        self._frame_update_timer.setSingleShot(True)
+        self._frame_update_timer.setInterval(FRAME_UPDATE_INTERVAL_MS)
+        self._frame_update_timer.timeout.connect(self._flush_frame_update)
+
         self.setWindowTitle(WINDOW_TITLE)
         self.setGeometry(100, 100, 1200, 800)
 
@@ -199,6 +243,36 @@ class FaceLandmarkViewer(QMainWindow):
         self.yz_widget.setFixedWidth(PROJECTION_SIZE_PX)
         viz_grid.addWidget(self.yz_widget, 1, 1)
 
+        # Widgets that receive every state change, built once for
+        # _update_all_widgets
+        self._visualization_widgets: tuple[VisualizationWidget, ...] = (
+            self.gl_widget,
+            self.xz_widget,
+            self.yz_widget,
+            self.histogram_widget,
+        )
+        # State changes fan out through Qt signal dispatch
+        for widget in self._visualization_widgets:
+            self.frameChanged.connect(widget.set_current_frame)
+            self.baseFrameChanged.connect(widget.set_base_frame)
+            self.showVectorsChanged.connect(widget.set_show_vectors)
+            self.alignFacesChanged.connect(widget.set_align_faces)
+            self.useStaticPointsChanged.connect(widget.set_use_static_points)
+            self.alignmentMethodChanged.connect(widget.set_alignment_method)
+            self.alignmentLandmarksChanged.connect(widget.set_alignment_landmarks)
+
+        # Projections and histogram filter/align the same frame pair, so let
+        # them share one model instead of each repeating the work
+        self.frame_delta_model = FrameDeltaModel()
+        for widget in (self.xz_widget, self.yz_widget, self.histogram_widget):
+            widget.set_frame_delta_model(self.frame_delta_model)
+
+        # Both projections draw the same scaled vertices with different
+        # modelview matrices, so upload them once per change
+        self.projection_scene_buffer = SharedSceneBuffer()
+        for widget in (self.xz_widget, self.yz_widget):
+            widget.set_scene_buffer(self.projection_scene_buffer)
+
         # Set stretch factors so main plot takes up most space
         viz_grid.setRowStretch(0, 0)  # Top row (x-z) doesn't stretch
         viz_grid.setRowStretch(1, 1)  # Bottom row (main + y-z) stretches
@@ -221,34 +295,29 @@ class FaceLandmarkViewer(QMainWindow):
         Args:
             update_fn: Function that takes a widget and performs the update
         """
-        for widget in [
-            self.gl_widget,
-            self.xz_widget,
-            self.yz_widget,
-            self.histogram_widget,
-        ]:
+        for widget in self._visualization_widgets:
             update_fn(widget)
 
     def _handle_checkbox_change(
         self,
         state: int,
         attr_name: str,
-        setter_fn: Callable[[VisualizationWidget, bool], None],
+        signal: SignalInstance,
     ) -> None:
         """Handle checkbox state change and update widgets
 
         Args:
             state: Qt.CheckState value (0=Unchecked, 2=Checked)
             attr_name: Name of the instance attribute to update
-            setter_fn: Function that takes a widget and bool value to perform the update
+            signal: Signal to emit with the new bool value
         """
         # Convert Qt state to boolean
         bool_value = state == Qt.CheckState.Checked.value
         setattr(self, attr_name, bool_value)
-        logger.debug(f"{attr_name} changed to: {bool_value} (state={state})")
+        logger.debug("%s changed to: %s (state=%s)", attr_name, bool_value, state)
 
         if self.data is not None:
-            self._update_all_widgets(lambda w: setter_fn(w, bool_value))
+            signal.emit(bool_value)
 
     def load_file(self) -> None:
         """Load a .npy file via file dialog"""
@@ -270,38 +339,68 @@ class FaceLandmarkViewer(QMainWindow):
 
         logger.info(f"Loading file: {file_path}")
         try:
-            self.data = np.load(file_path)
-            logger.info(f"Loaded data shape: {self.data.shape}")
+            # Map the file read-only instead of reading it into memory: the
+            # float32 conversion below then reads straight from the page
+            # cache, without holding a full-precision copy alongside it.
+            # Landmark files are plain float arrays, so pickled data is refused
+            try:
+                raw = np.load(file_path, mmap_mode="r", allow_pickle=False)
+            except ValueError as e:
+                # Raised by np.load for pickled / object arrays
+                logger.error(f"Unsupported file contents: {str(e)}")
+                self.info_label.setText(
+                    f"Error: {file_path.name} is not a plain numeric array "
+                    f"(pickled data is not supported): {str(e)}"
+                )
+                self.data = None
+                self.valid_mask = None
+                return
+            self._base_cache.clear()
+            logger.info(f"Loaded data shape: {raw.shape}")
 
             # Validate data shape
-            if len(self.data.shape) != 3 or self.data.shape[2] != 3:
-                logger.error(f"Invalid data shape: {self.data.shape}")
+            if len(raw.shape) != 3 or raw.shape[2] != 3:
+                logger.error(f"Invalid data shape: {raw.shape}")
                 self.info_label.setText(
-                    f"Error: Invalid data shape {self.data.shape}. "
+                    f"Error: Invalid data shape {raw.shape}. "
                     "Expected (n_frames, n_landmarks, 3)"
                 )
                 self.data = None
+                self.valid_mask = None
+                del raw
                 return
 
+            # float32 is plenty for landmark coordinates and halves the memory
+            # traffic of every pass over the data; widgets then share this copy.
+            # Always copy, so nothing downstream holds on to the memmap
+            self.data = np.array(raw, dtype=np.float32, order="C")
+            del raw
+
             n_frames, n_landmarks, _ = self.data.shape
             logger.info(f"Valid data: {n_frames} frames, {n_landmarks} landmarks")
 
             # Check for NaN values
-            nan_count = np.isnan(self.data).sum()
+            # One pass gives both the NaN count and the per-landmark mask,
+            # which is shared with the widgets so none of them rescans the data
+            valid, nan_count = nan_summary(self.data.reshape(-1, 3))
+            self.valid_mask = valid.reshape(n_frames, n_landmarks)
+            self.data_has_nan = bool(nan_count)
             if nan_count > 0:
-                nan_landmarks = np.isnan(self.data).any(axis=2).sum()
+                nan_landmarks = self.valid_mask.size - self.valid_mask.sum()
                 logger.warning(
                     f"Data contains {nan_count} NaN values across {nan_landmarks} landmark positions"
                 )
                 logger.warning("NaN landmarks will be filtered out during rendering")
 
-            # Log data range for debugging
-            logger.debug(
-                f"Data min: {np.nanmin(self.data)}, max: {np.nanmax(self.data)}"
-            )
-            logger.debug(f"Data mean: {np.nanmean(self.data, axis=(0, 1))}")
+            # Log data range for debugging (skip the reductions otherwise)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Data min: %s, max: %s", np.nanmin(self.data), np.nanmax(self.data)
+                )
+                logger.debug("Data mean: %s", np.nanmean(self.data, axis=(0, 1)))
 
             # Update UI
+            self._build_frame_labels(n_frames)
             self.frame_slider.setMaximum(n_frames - 1)
             self.frame_slider.setEnabled(True)
             self.base_frame_spinbox.setMaximum(n_frames - 1)
@@ -309,7 +408,7 @@ class FaceLandmarkViewer(QMainWindow):
             # Set base frame (use the value from initialization or 0)
             if self.base_frame < n_frames:
                 self.base_frame_spinbox.setValue(self.base_frame)
-                logger.debug(f"Base frame set to: {self.base_frame}")
+                logger.debug("Base frame set to: %d", self.base_frame)
             else:
                 self.base_frame = 0
                 self.base_frame_spinbox.setValue(0)
@@ -326,7 +425,7 @@ class FaceLandmarkViewer(QMainWindow):
 
             # Update OpenGL widgets
             logger.info("Updating OpenGL widgets with data")
-            self._update_all_widgets(lambda w: w.set_data(self.data))
+            self._update_all_widgets(lambda w: w.set_data(self.data, self.valid_mask))
 
             # Update projections with center and scale from main widget
             self._update_projection_center_scale()
@@ -335,46 +434,61 @@ class FaceLandmarkViewer(QMainWindow):
             logger.exception(f"Error loading file: {str(e)}")
             self.info_label.setText(f"Error loading file: {str(e)}")
             self.data = None
+            self.valid_mask = None
 
     def on_frame_changed(self, value: int) -> None:
         """Handle frame slider change"""
         self.current_frame = value
         if self.data is not None:
-            self.frame_label.setText(f"{value} / {self.data.shape[0] - 1}")
-            self._update_all_widgets(lambda w: w.set_current_frame(value))
+            # Data may also be assigned without load_file_from_path
+            if len(self._frame_labels) != len(self.data):
+                self._build_frame_labels(len(self.data))
+            self.frame_label.setText(self._frame_labels[value])
+            self._pending_frame = value
+            if not self._frame_update_timer.isActive():
+                self._flush_frame_update()
+                self._frame_update_timer.start()
+
+    def _build_frame_labels(self, n_frames: int) -> None:
+        """Build the frame label texts ("i / last") for n_frames frames"""
+        last_frame = n_frames - 1
+        self._frame_labels = [f"{i} / {last_frame}" for i in range(n_frames)]
+
+    def _flush_frame_update(self) -> None:
+        """Push the latest pending slider value to all widgets once"""
+        frame = self._pending_frame
+        self._pending_frame = None
+        if frame is not None and self.data is not None:
+            self.frameChanged.emit(frame)
 
     def on_base_frame_changed(self, value: int) -> None:
         """Handle base frame spinbox change"""
         self.base_frame = value
         if self.data is not None:
-            self._update_all_widgets(lambda w: w.set_base_frame(value))
+            self.baseFrameChanged.emit(value)
             # Update center and scale for projections
             self._update_projection_center_scale()
 
     def on_show_vectors_changed(self, state: int) -> None:
         """Handle show vectors checkbox change"""
-        self._handle_checkbox_change(
-            state, "show_vectors", lambda w, v: w.set_show_vectors(v)
-        )
+        self._handle_checkbox_change(state, "show_vectors", self.showVectorsChanged)
 
     def on_align_faces_changed(self, state: int) -> None:
         """Handle align faces checkbox change"""
-        self._handle_checkbox_change(
-            state, "align_faces", lambda w, v: w.set_align_faces(v)
-        )
+        self._handle_checkbox_change(state, "align_faces", self.alignFacesChanged)
 
     def on_use_static_points_changed(self, state: int) -> None:
         """Handle use static points checkbox change"""
         self._handle_checkbox_change(
-            state, "use_static_points", lambda w, v: w.set_use_static_points(v)
+            state, "use_static_points", self.useStaticPointsChanged
         )
 
     def on_alignment_method_changed(self, method: str) -> None:
         """Handle alignment method dropdown change"""
         self.alignment_method = method
-        logger.debug(f"Alignment method changed to: {method}")
+        logger.debug("Alignment method changed to: %s", method)
         if self.data is not None:
-            self._update_all_widgets(lambda w: w.set_alignment_method(method))
+            self.alignmentMethodChanged.emit(method)
 
     def open_landmark_selector(self) -> None:
         """Open the landmark selector dialog"""
@@ -382,8 +496,7 @@ class FaceLandmarkViewer(QMainWindow):
         dialog = LandmarkSelectorDialog(self)
 
         # Initialize the dialog with current selection
-        dialog.selected_landmarks = set(self.selected_alignment_landmarks)
-        dialog._update_checkboxes_from_selection()
+        dialog.set_selected_landmarks(self.selected_alignment_landmarks)
 
         if dialog.exec():  # User clicked OK
             # Update the stored selection
@@ -394,30 +507,40 @@ class FaceLandmarkViewer(QMainWindow):
 
             # Update all widgets with new landmarks
             if self.data is not None:
-                self._update_all_widgets(
-                    lambda w: w.set_alignment_landmarks(
-                        self.selected_alignment_landmarks
-                    )
-                )
+                self.alignmentLandmarksChanged.emit(self.selected_alignment_landmarks)
         else:
             logger.info("Landmark selection cancelled")
 
+    def _get_base_center_scale(
+        self, base_frame: int
+    ) -> Optional[tuple[npt.NDArray[np.float64], float]]:
+        """Get projection center and scale for a base frame, computing it once
+
+        Returns:
+            Tuple of (center, scale), or None if the frame has no valid landmarks
+        """
+        if base_frame not in self._base_cache:
+            base_landmarks_valid, _ = filter_nan_landmarks(
+                self.data[base_frame],
+                assume_clean=not self.data_has_nan,
+                valid_mask=(
+                    None if self.valid_mask is None else self.valid_mask[base_frame]
+                ),
+            )
+            self._base_cache[base_frame] = (
+                calculate_center_and_scale(base_landmarks_valid)
+                if len(base_landmarks_valid) > 0
+                else None
+            )
+        return self._base_cache[base_frame]
+
     def _update_projection_center_scale(self) -> None:
         """Update projection widgets with center and scale from base frame"""
         if self.data is None:
             return
 
-        # Import here to avoid circular dependency
-        from vptry_facelandmarkview.utils import (
-            filter_nan_landmarks,
-            calculate_center_and_scale,
-        )
-
-        # Get base frame landmarks and calculate center/scale
-        base_landmarks = self.data[self.base_frame]
-        base_landmarks_valid, _ = filter_nan_landmarks(base_landmarks)
-
-        if len(base_landmarks_valid) > 0:
-            center, scale = calculate_center_and_scale(base_landmarks_valid)
+        center_scale = self._get_base_center_scale(self.base_frame)
+        if center_scale is not None:
+            center, scale = center_scale
             self.xz_widget.set_center_and_scale(center, scale)
             self.yz_widget.set_center_and_scale(center, scale)
@@ -0,0 +1,168 @@
+"""
+Shared data and statistics for the histogram demo scripts.
+"""
+
+from functools import cache
+
+import numpy as np
+import numpy.typing as npt
+
+# Text box styles shared by the demo annotations (matplotlib copies these,
+# so one dict per style is enough)
+WHEAT_BOX = dict(boxstyle="round", facecolor="wheat", alpha=0.5)
+LIGHTYELLOW_BOX = dict(boxstyle="round", facecolor="lightyellow", alpha=0.5)
+LIGHTBLUE_BOX = dict(boxstyle="round", facecolor="lightblue", alpha=0.6)
+LIGHTGREEN_BOX = dict(boxstyle="round", facecolor="lightgreen", alpha=0.7)
+YELLOW_BOX = dict(boxstyle="round", facecolor="yellow", alpha=0.7)
+
+
+def draw_histogram_bars(ax, hist_values, bin_edges, outlier_count: int) -> tuple:
+    """Draw the histogram bars, plus a red outlier bar after the last bin
+
+    Args:
+        ax: Matplotlib axes to draw on
+        hist_values: Counts per bin
+        bin_edges: Bin edges (len(hist_values) + 1,)
+        outlier_count: Number of outliers; no outlier bar is drawn if zero
+
+    Returns:
+        Tuple of (bar_width, outlier_position), the bin width and the x
+        position of the outlier bar
+    """
+    bar_width = bin_edges[1] - bin_edges[0]
+    bar_positions = bin_edges[:-1] + bar_width / 2
+    outlier_position = bin_edges[-1] + bar_width
+
+    ax.bar(
+        bar_positions,
+        hist_values,
+        width=bar_width * 0.9,
+        color="gray",
+        edgecolor="black",
+        linewidth=0.5,
+    )
+    if outlier_count > 0:
+        ax.bar(
+            outlier_position,
+            outlier_count,
+            width=bar_width * 0.9,
+            color="red",
+            edgecolor="darkred",
+            linewidth=0.5,
+        )
+    return bar_width, outlier_position
+
+
+def fill_uniform(
+    rng: np.random.Generator, out: npt.NDArray[np.float64], low: float, high: float
+) -> None:
+    """Fill out in place with uniform samples from [low, high)
+
+    Draws the same values as rng.uniform(low, high, len(out)), which has no
+    out argument.
+    """
+    rng.random(out=out)
+    out *= high - low
+    out += low
+
+
+@cache
+def sample_distances(
+    n_normal: int = 190, n_outliers: int = 10, seed: int = 42
+) -> npt.NDArray[np.float64]:
+    """Simulated landmark distances with a few large outliers
+
+    Most distances are small (0-0.5), with n_outliers large ones (1-2).
+    The result is cached and read-only.
+
+    Args:
+        n_normal: Number of small distances
+        n_outliers: Number of outlier distances
+        seed: Random seed
+
+    Returns:
+        Distances (n_normal + n_outliers,)
+    """
+    rng = np.random.default_rng(seed)
+    distances = np.empty(n_normal + n_outliers)
+    fill_uniform(rng, distances[:n_normal], 0, 0.5)
+    fill_uniform(rng, distances[n_normal:], 1.0, 2.0)
+    distances.flags.writeable = False
+    return distances
+
+
+def mean_and_variance(values: npt.NDArray[np.floating]) -> tuple[float, float]:
+    """Mean and (population) variance from one sum and one dot product
+
+    Uses var = E[x^2] - E[x]^2, which is fine for the small, well-scaled
+    demo distances.
+
+    Args:
+        values: Values (n,)
+
+    Returns:
+        Tuple of (mean, variance)
+    """
+    n = len(values)
+    mean = values.sum() / n
+    variance = max(np.dot(values, values) / n - mean * mean, 0.0)
+    return mean, variance
+
+
+def split_outliers(
+    distances: npt.NDArray[np.floating], percentile: float = 95
+) -> tuple[float, npt.NDArray[np.floating], int]:
+    """Split distances at a percentile into histogram values and outliers
+
+    Args:
+        distances: Distances (n,)
+        percentile: Percentile above which distances count as outliers
+
+    Returns:
+        Tuple of (threshold, distances at or below it, number of outliers)
+    """
+    # Same value as np.percentile's default linear interpolation, but only
+    # the two order statistics around the percentile are selected (O(n))
+    position = (len(distances) - 1) * percentile / 100
+    lower = int(position)
+    upper = min(lower + 1, len(distances) - 1)
+    partitioned = np.partition(distances, (lower, upper))
+    threshold = partitioned[lower] + (position - lower) * (
+        partitioned[upper] - partitioned[lower]
+    )
+
+    # Everything up to the lower order statistic is below the threshold, so
+    # only the part above it needs to be compared
+    head = partitioned[: lower + 1]
+    tail = partitioned[lower + 1 :]
+    tail_kept = tail.compress(tail <= threshold)
+    non_outlier_distances = np.concatenate([head, tail_kept])
+    outlier_count = len(tail) - len(tail_kept)
+    return threshold, non_outlier_distances, outlier_count
+
+
+def uniform_histogram(
+    values: npt.NDArray[np.floating], bins: int, upper: float
+) -> tuple[npt.NDArray[np.intp], npt.NDArray[np.float64]]:
+    """Histogram over [0, upper] with equal-width bins, like np.histogram
+
+    Bin indices are computed by scaling instead of searchsorted and counted
+    with np.bincount. Values outside the range are ignored, and the last bin
+    includes upper, as in np.histogram.
+
+    Args:
+        values: Values to bin
+        bins: Number of bins
+        upper: Upper edge of the last bin
+
+    Returns:
+        Tuple of (hist_values, bin_edges)
+    """
+    bin_edges = np.linspace(0, upper, bins + 1)
+    values = values[(values >= 0) & (values <= upper)]
+    indices = (values * (bins / upper)).astype(np.intp)
+    np.minimum(indices, bins - 1, out=indices)
+    # Fix values that rounding put one bin off, as np.histogram does
+    indices[values < bin_edges[indices]] -= 1
+    indices[(values >= bin_edges[indices + 1]) & (indices != bins - 1)] += 1
+    return np.bincount(indices, minlength=bins), bin_edges
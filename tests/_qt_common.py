@@ -0,0 +1,23 @@
+"""
+Shared Qt setup for the GUI test scripts.
+"""
+
+import sys
+from functools import cache
+
+from PySide6.QtWidgets import QApplication
+
+
+@cache
+def get_qapp() -> QApplication:
+    """The process-wide QApplication, created on first use
+
+    Qt allows only one QApplication per process, so all GUI tests (including
+    tests from different modules in one pytest session) share this instance.
+    The cache also keeps a reference to it, so it is not garbage collected
+    between tests.
+    """
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication(sys.argv)
+    return app
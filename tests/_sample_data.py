@@ -0,0 +1,51 @@
+"""
+Shared access to the sample landmark data for the test scripts.
+"""
+
+from functools import cache
+from pathlib import Path
+
+import numpy as np
+
+from generate_sample_data import generate_sample_data
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Written to the repository root by generate_sample_data.py
+SAMPLE_FILE = Path(__file__).parent.parent / "sample_landmarks.npy"
+
+
+def get_sample_landmarks_path() -> Path:
+    """Return the sample data file, generating a small one if it is missing
+
+    An existing file (e.g. from generate_sample_data.py) is reused as is.
+    Generation happens under a file lock where available, so test runs in
+    parallel do not write the file at the same time.
+    """
+    if SAMPLE_FILE.exists():
+        return SAMPLE_FILE
+
+    with open(SAMPLE_FILE.with_suffix(".lock"), "w") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        # Another process may have written the file while we waited
+        if not SAMPLE_FILE.exists():
+            # Same data as generate_sample_data.py writes, seeded so reruns
+            # write the same file
+            generate_sample_data(output_file=SAMPLE_FILE, seed=0)
+
+    return SAMPLE_FILE
+
+
+@cache
+def load_sample_landmarks() -> np.ndarray:
+    """Memory-map the sample data once and share it between the tests
+
+    The file is resolved relative to this module, so the tests do not
+    depend on the working directory, and generated if it is missing. The
+    returned array is read-only.
+    """
+    return np.load(get_sample_landmarks_path(), mmap_mode="r")
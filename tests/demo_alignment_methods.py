@@ -50,7 +50,9 @@ def demo_alignment_methods():
     cos_a, sin_a = np.cos(angle), np.sin(angle)
     rotation = np.array([[cos_a, -sin_a, 0], [sin_a, cos_a, 0], [0, 0, 1]])
     translation = np.array([5.0, 3.0, -2.0])
-    current = (rotation @ base.T).T + translation
+    current = np.empty_like(base)
+    np.matmul(base, rotation.T, out=current)
+    current += translation
 
     print(f"Base landmarks shape: {base.shape}")
     print(f"Current landmarks shape: {current.shape}")
@@ -67,16 +69,20 @@ def demo_alignment_methods():
     print(f"  Max:  {original_distances.max():.6f}")
     print()
 
-    for method_name in methods:
+    # Apply every alignment method, then compute the quality metrics for all
+    # of them at once on the (n_methods, n_points, 3) stack
+    aligned_stack = np.stack(
+        [get_alignment_method(method_name)(current, base) for method_name in methods]
+    )
+    all_aligned_distances = np.linalg.norm(aligned_stack - base, axis=-1)
+    base_center = base.mean(axis=0)
+    center_diffs = np.linalg.norm(aligned_stack.mean(axis=1) - base_center, axis=-1)
+
+    for i, method_name in enumerate(methods):
         print(f"\nTesting '{method_name}' method:")
         print("-" * 35)
 
-        # Get and apply alignment method
-        align_func = get_alignment_method(method_name)
-        aligned = align_func(current, base)
-
-        # Calculate alignment quality metrics
-        aligned_distances = np.linalg.norm(aligned - base, axis=1)
+        aligned_distances = all_aligned_distances[i]
 
         print("  Aligned distances from base (per landmark):")
         print(f"    Mean: {aligned_distances.mean():.6f}")
@@ -84,10 +90,7 @@ def demo_alignment_methods():
         print(f"    Max:  {aligned_distances.max():.6f}")
 
         # Check if centers match
-        base_center = base.mean(axis=0)
-        aligned_center = aligned.mean(axis=0)
-        center_diff = np.linalg.norm(aligned_center - base_center)
-        print(f"  Center alignment error: {center_diff:.6f}")
+        print(f"  Center alignment error: {center_diffs[i]:.6f}")
 
         # Method-specific notes
         if method_name == "default":
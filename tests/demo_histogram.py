@@ -5,65 +5,47 @@ This shows what the histogram widget will display.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
-matplotlib.use("Agg")  # Non-interactive backend
+from _histogram_common import (
+    LIGHTYELLOW_BOX,
+    WHEAT_BOX,
+    draw_histogram_bars,
+    fill_uniform,
+    sample_distances,
+    split_outliers,
+    uniform_histogram,
+)
 
-# Set random seed for reproducibility
-np.random.seed(42)
+# One figure reused by both demos, cleared and resized for each; it is
+# drawn straight to an Agg canvas (PNG output only, no pyplot)
+_FIG = Figure(layout="constrained")
+FigureCanvasAgg(_FIG)
 
 
 def create_demo_histogram(output_file="histogram_demo.png"):
     """Create a demo histogram showing the concept"""
 
-    # Simulate landmark distances with some outliers
-    # Most distances are small (0-0.5), with a few large outliers
-    normal_distances = np.random.uniform(0, 0.5, 190)
-    outlier_distances = np.random.uniform(1.0, 2.0, 10)
-    all_distances = np.concatenate([normal_distances, outlier_distances])
+    # Simulated landmark distances with some outliers
+    all_distances = sample_distances()
 
-    # Calculate 95th percentile
-    percentile_95 = np.percentile(all_distances, 95)
-
-    # Separate outliers
-    outlier_mask = all_distances > percentile_95
-    non_outlier_distances = all_distances[~outlier_mask]
-    outlier_count = outlier_mask.sum()
+    # Calculate 95th percentile and separate outliers
+    percentile_95, non_outlier_distances, outlier_count = split_outliers(all_distances)
 
     # Create histogram
-    hist_values, bin_edges = np.histogram(
-        non_outlier_distances, bins=20, range=(0, percentile_95)
-    )
+    hist_values, bin_edges = uniform_histogram(non_outlier_distances, 20, percentile_95)
 
     # Create the plot
-    fig, ax = plt.subplots(figsize=(4, 3))
+    _FIG.clear()
+    _FIG.set_size_inches(4, 3)
+    ax = _FIG.add_subplot()
 
     # Plot histogram bars
-    bar_width = bin_edges[1] - bin_edges[0]
-    bar_positions = bin_edges[:-1] + bar_width / 2
-
-    ax.bar(
-        bar_positions,
-        hist_values,
-        width=bar_width * 0.9,
-        color="gray",
-        edgecolor="black",
-        linewidth=0.5,
+    bar_width, outlier_position = draw_histogram_bars(
+        ax, hist_values, bin_edges, outlier_count
     )
 
-    # Add outlier bar at the end (in red)
-    if outlier_count > 0:
-        outlier_position = bin_edges[-1] + bar_width
-        ax.bar(
-            outlier_position,
-            outlier_count,
-            width=bar_width * 0.9,
-            color="red",
-            edgecolor="darkred",
-            linewidth=0.5,
-        )
-
     # Set labels and title
     ax.set_xlabel("Distance from Base Frame", fontsize=9)
     ax.set_ylabel("Count", fontsize=9)
@@ -92,7 +74,7 @@ def create_demo_histogram(output_file="histogram_demo.png"):
         ha="right",
         va="top",
         fontsize=8,
-        bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.5),
+        bbox=WHEAT_BOX,
     )
 
     if outlier_count > 0:
@@ -105,11 +87,10 @@ def create_demo_histogram(output_file="histogram_demo.png"):
             va="top",
             fontsize=8,
             color="red",
-            bbox=dict(boxstyle="round", facecolor="lightyellow", alpha=0.5),
+            bbox=LIGHTYELLOW_BOX,
         )
 
-    plt.tight_layout()
-    plt.savefig(output_file, dpi=150, bbox_inches="tight")
+    _FIG.savefig(output_file, dpi=150, pil_kwargs={"compress_level": 1})
     print(f"Demo histogram saved to: {output_file}")
 
     # Print statistics
@@ -123,78 +104,55 @@ def create_demo_histogram(output_file="histogram_demo.png"):
     print(f"  Median distance: {np.median(all_distances):.4f}")
 
 
-def create_comparison_demo(output_file="histogram_comparison_demo.png"):
-    """Create a demo showing histograms before and after alignment"""
+def plot_histogram(ax, distances, title):
+    """Plot one histogram panel of the comparison demo"""
+    percentile_95, non_outlier_distances, outlier_count = split_outliers(distances)
 
-    # Simulate distances before and after alignment
-    np.random.seed(42)
+    hist_values, bin_edges = uniform_histogram(non_outlier_distances, 20, percentile_95)
 
-    # Before alignment: larger distances
-    before_normal = np.random.uniform(0.5, 1.5, 180)
-    before_outliers = np.random.uniform(3.0, 5.0, 20)
-    before_distances = np.concatenate([before_normal, before_outliers])
+    draw_histogram_bars(ax, hist_values, bin_edges, outlier_count)
 
-    # After alignment: smaller distances (alignment reduces movement)
-    after_normal = np.random.uniform(0, 0.5, 190)
-    after_outliers = np.random.uniform(1.0, 2.0, 10)
-    after_distances = np.concatenate([after_normal, after_outliers])
+    ax.set_xlabel("Distance", fontsize=9)
+    ax.set_ylabel("Count", fontsize=9)
+    ax.set_title(title, fontsize=10, fontweight="bold")
+    ax.grid(True, alpha=0.3, linestyle="--")
 
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(8, 3))
+    ax.text(
+        0.98,
+        0.98,
+        f"Mean: {distances.mean():.3f}",
+        transform=ax.transAxes,
+        ha="right",
+        va="top",
+        fontsize=8,
+        bbox=WHEAT_BOX,
+    )
 
-    def plot_histogram(ax, distances, title):
-        percentile_95 = np.percentile(distances, 95)
-        outlier_mask = distances > percentile_95
-        non_outlier_distances = distances[~outlier_mask]
-        outlier_count = outlier_mask.sum()
 
-        hist_values, bin_edges = np.histogram(
-            non_outlier_distances, bins=20, range=(0, percentile_95)
-        )
+def create_comparison_demo(output_file="histogram_comparison_demo.png"):
+    """Create a demo showing histograms before and after alignment"""
 
-        bar_width = bin_edges[1] - bin_edges[0]
-        bar_positions = bin_edges[:-1] + bar_width / 2
+    # Simulate distances before and after alignment
+    rng = np.random.default_rng(42)
 
-        ax.bar(
-            bar_positions,
-            hist_values,
-            width=bar_width * 0.9,
-            color="gray",
-            edgecolor="black",
-            linewidth=0.5,
-        )
+    # Before alignment: larger distances
+    before_distances = np.empty(200)
+    fill_uniform(rng, before_distances[:180], 0.5, 1.5)
+    fill_uniform(rng, before_distances[180:], 3.0, 5.0)
 
-        if outlier_count > 0:
-            outlier_position = bin_edges[-1] + bar_width
-            ax.bar(
-                outlier_position,
-                outlier_count,
-                width=bar_width * 0.9,
-                color="red",
-                edgecolor="darkred",
-                linewidth=0.5,
-            )
-
-        ax.set_xlabel("Distance", fontsize=9)
-        ax.set_ylabel("Count", fontsize=9)
-        ax.set_title(title, fontsize=10, fontweight="bold")
-        ax.grid(True, alpha=0.3, linestyle="--")
+    # After alignment: smaller distances (alignment reduces movement)
+    after_distances = np.empty(200)
+    fill_uniform(rng, after_distances[:190], 0, 0.5)
+    fill_uniform(rng, after_distances[190:], 1.0, 2.0)
 
-        ax.text(
-            0.98,
-            0.98,
-            f"Mean: {distances.mean():.3f}",
-            transform=ax.transAxes,
-            ha="right",
-            va="top",
-            fontsize=8,
-            bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.5),
-        )
+    _FIG.clear()
+    _FIG.set_size_inches(8, 3)
+    ax1, ax2 = _FIG.subplots(1, 2)
 
     plot_histogram(ax1, before_distances, "Before Alignment")
     plot_histogram(ax2, after_distances, "After Alignment")
 
-    plt.tight_layout()
-    plt.savefig(output_file, dpi=150, bbox_inches="tight")
+    _FIG.savefig(output_file, dpi=150, pil_kwargs={"compress_level": 1})
     print(f"\nComparison demo saved to: {output_file}")
 
     print("\nComparison Statistics:")
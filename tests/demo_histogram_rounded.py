@@ -4,44 +4,42 @@ Demonstrate the histogram with rounded x-max and y-max values.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib
-
-matplotlib.use("Agg")  # Non-interactive backend
-
-# Set random seed for reproducibility
-np.random.seed(42)
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from _histogram_common import (
+    LIGHTBLUE_BOX,
+    LIGHTGREEN_BOX,
+    LIGHTYELLOW_BOX,
+    YELLOW_BOX,
+    draw_histogram_bars,
+    mean_and_variance,
+    sample_distances,
+    split_outliers,
+    uniform_histogram,
+)
 
 
 def create_rounded_histogram_demo(output_file="histogram_demo_rounded.png"):
     """Create a demo histogram showing rounded x-max and y-max"""
 
-    # Simulate landmark distances with some outliers
-    # Most distances are small (0-0.5), with a few large outliers
-    normal_distances = np.random.uniform(0, 0.5, 190)
-    outlier_distances = np.random.uniform(1.0, 2.0, 10)
-    all_distances = np.concatenate([normal_distances, outlier_distances])
+    # Simulated landmark distances with some outliers
+    all_distances = sample_distances()
 
     # Calculate statistics
-    mean_dist = all_distances.mean()
-    var_dist = all_distances.var()
+    mean_dist, var_dist = mean_and_variance(all_distances)
 
-    # Calculate 95th percentile
-    percentile_95 = np.percentile(all_distances, 95)
+    # Calculate 95th percentile and separate outliers
+    percentile_95, non_outlier_distances, outlier_count = split_outliers(all_distances)
 
     # Round x-max to nearest 0.5 (shown as 50 when ×100)
     percentile_95_rounded = np.ceil(percentile_95 / 0.5) * 0.5
 
-    # Separate outliers
-    outlier_mask = all_distances > percentile_95
-    non_outlier_distances = all_distances[~outlier_mask]
-    outlier_count = outlier_mask.sum()
-
     # Create histogram
-    hist_values, bin_edges = np.histogram(
+    hist_values, bin_edges = uniform_histogram(
         non_outlier_distances,
-        bins=20,
-        range=(0, percentile_95_rounded),  # Using rounded value
+        20,
+        percentile_95_rounded,  # Using rounded value
     )
 
     # Round y-max to nearest 50
@@ -49,33 +47,16 @@ def create_rounded_histogram_demo(output_file="histogram_demo_rounded.png"):
     max_count_rounded = int(np.ceil(max_count_raw / 50) * 50)
 
     # Create the plot
-    fig, ax = plt.subplots(figsize=(6, 5))
+    # Drawn straight to an Agg canvas (PNG output only, no pyplot)
+    fig = Figure(figsize=(6, 5), layout="constrained")
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
 
     # Plot histogram bars
-    bar_width = bin_edges[1] - bin_edges[0]
-    bar_positions = bin_edges[:-1] + bar_width / 2
-
-    ax.bar(
-        bar_positions,
-        hist_values,
-        width=bar_width * 0.9,
-        color="gray",
-        edgecolor="black",
-        linewidth=0.5,
+    bar_width, outlier_position = draw_histogram_bars(
+        ax, hist_values, bin_edges, outlier_count
     )
 
-    # Add outlier bar at the end (in red)
-    if outlier_count > 0:
-        outlier_position = bin_edges[-1] + bar_width
-        ax.bar(
-            outlier_position,
-            outlier_count,
-            width=bar_width * 0.9,
-            color="red",
-            edgecolor="darkred",
-            linewidth=0.5,
-        )
-
     # Set labels and title
     ax.set_xlabel("Distance from Base Frame (×100)", fontsize=10, fontweight="bold")
     ax.set_ylabel("Count", fontsize=10)
@@ -150,7 +131,7 @@ def create_rounded_histogram_demo(output_file="histogram_demo_rounded.png"):
         ha="center",
         va="top",
         fontsize=9,
-        bbox=dict(boxstyle="round", facecolor="lightblue", alpha=0.6),
+        bbox=LIGHTBLUE_BOX,
     )
 
     # Add annotations showing the rounding
@@ -166,7 +147,7 @@ def create_rounded_histogram_demo(output_file="histogram_demo_rounded.png"):
         ha="right",
         va="top",
         fontsize=8,
-        bbox=dict(boxstyle="round", facecolor="yellow", alpha=0.7),
+        bbox=YELLOW_BOX,
     )
 
     if outlier_count > 0:
@@ -179,7 +160,7 @@ def create_rounded_histogram_demo(output_file="histogram_demo_rounded.png"):
             va="top",
             fontsize=9,
             color="red",
-            bbox=dict(boxstyle="round", facecolor="lightyellow", alpha=0.5),
+            bbox=LIGHTYELLOW_BOX,
         )
 
     # Highlight the changes
@@ -191,11 +172,10 @@ def create_rounded_histogram_demo(output_file="histogram_demo_rounded.png"):
         ha="left",
         va="top",
         fontsize=8,
-        bbox=dict(boxstyle="round", facecolor="lightgreen", alpha=0.7),
+        bbox=LIGHTGREEN_BOX,
     )
 
-    plt.tight_layout()
-    plt.savefig(output_file, dpi=150, bbox_inches="tight")
+    fig.savefig(output_file, dpi=150, pil_kwargs={"compress_level": 1})
     print(f"Rounded histogram demo saved to: {output_file}")
 
     # Print statistics
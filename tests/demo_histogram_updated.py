@@ -3,66 +3,43 @@
 Demonstrate the updated histogram visualization with y-axis tick and scaled x-axis.
 """
 
-import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
 
-matplotlib.use("Agg")  # Non-interactive backend
-
-# Set random seed for reproducibility
-np.random.seed(42)
+from _histogram_common import (
+    LIGHTGREEN_BOX,
+    LIGHTYELLOW_BOX,
+    WHEAT_BOX,
+    draw_histogram_bars,
+    sample_distances,
+    split_outliers,
+    uniform_histogram,
+)
 
 
 def create_updated_histogram_demo(output_file="histogram_demo_updated.png"):
     """Create a demo histogram showing the updated features"""
 
-    # Simulate landmark distances with some outliers
-    # Most distances are small (0-0.5), with a few large outliers
-    normal_distances = np.random.uniform(0, 0.5, 190)
-    outlier_distances = np.random.uniform(1.0, 2.0, 10)
-    all_distances = np.concatenate([normal_distances, outlier_distances])
-
-    # Calculate 95th percentile
-    percentile_95 = np.percentile(all_distances, 95)
+    # Simulated landmark distances with some outliers
+    all_distances = sample_distances()
 
-    # Separate outliers
-    outlier_mask = all_distances > percentile_95
-    non_outlier_distances = all_distances[~outlier_mask]
-    outlier_count = outlier_mask.sum()
+    # Calculate 95th percentile and separate outliers
+    percentile_95, non_outlier_distances, outlier_count = split_outliers(all_distances)
 
     # Create histogram
-    hist_values, bin_edges = np.histogram(
-        non_outlier_distances, bins=20, range=(0, percentile_95)
-    )
+    hist_values, bin_edges = uniform_histogram(non_outlier_distances, 20, percentile_95)
 
     # Create the plot
-    fig, ax = plt.subplots(figsize=(5, 4))
+    # Drawn straight to an Agg canvas (PNG output only, no pyplot)
+    fig = Figure(figsize=(5, 4), layout="constrained")
+    FigureCanvasAgg(fig)
+    ax = fig.subplots()
 
     # Plot histogram bars
-    bar_width = bin_edges[1] - bin_edges[0]
-    bar_positions = bin_edges[:-1] + bar_width / 2
-
-    ax.bar(
-        bar_positions,
-        hist_values,
-        width=bar_width * 0.9,
-        color="gray",
-        edgecolor="black",
-        linewidth=0.5,
+    bar_width, outlier_position = draw_histogram_bars(
+        ax, hist_values, bin_edges, outlier_count
     )
 
-    # Add outlier bar at the end (in red)
-    if outlier_count > 0:
-        outlier_position = bin_edges[-1] + bar_width
-        ax.bar(
-            outlier_position,
-            outlier_count,
-            width=bar_width * 0.9,
-            color="red",
-            edgecolor="darkred",
-            linewidth=0.5,
-        )
-
     # Set labels and title
     ax.set_xlabel("Distance from Base Frame (×100)", fontsize=10, fontweight="bold")
     ax.set_ylabel("Count", fontsize=10)
@@ -113,7 +90,7 @@ def create_updated_histogram_demo(output_file="histogram_demo_updated.png"):
         ha="right",
         va="top",
         fontsize=9,
-        bbox=dict(boxstyle="round", facecolor="wheat", alpha=0.5),
+        bbox=WHEAT_BOX,
     )
 
     if outlier_count > 0:
@@ -126,7 +103,7 @@ def create_updated_histogram_demo(output_file="histogram_demo_updated.png"):
             va="top",
             fontsize=9,
             color="red",
-            bbox=dict(boxstyle="round", facecolor="lightyellow", alpha=0.5),
+            bbox=LIGHTYELLOW_BOX,
         )
 
     # Highlight the changes
@@ -138,11 +115,10 @@ def create_updated_histogram_demo(output_file="histogram_demo_updated.png"):
         ha="left",
         va="top",
         fontsize=8,
-        bbox=dict(boxstyle="round", facecolor="lightgreen", alpha=0.7),
+        bbox=LIGHTGREEN_BOX,
     )
 
-    plt.tight_layout()
-    plt.savefig(output_file, dpi=150, bbox_inches="tight")
+    fig.savefig(output_file, dpi=150, pil_kwargs={"compress_level": 1})
     print(f"Updated histogram demo saved to: {output_file}")
 
     # Print statistics
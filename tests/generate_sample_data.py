@@ -3,7 +3,7 @@
 Generate sample face landmark data for testing
 """
 
-from typing import Union
+from typing import Optional, Union
 import numpy as np
 import numpy.typing as npt
 from pathlib import Path
@@ -13,6 +13,7 @@ def generate_sample_data(
     n_frames: int = 50,
     n_landmarks: int = 68,
     output_file: Union[str, Path] = "sample_landmarks.npy",
+    seed: Optional[int] = None,
 ) -> npt.NDArray[np.float64]:
     """
     Generate sample face landmark data with animation
@@ -21,6 +22,7 @@ def generate_sample_data(
         n_frames: Number of frames
         n_landmarks: Number of landmarks (default 68 for face)
         output_file: Output filename
+        seed: Optional seed for the noise, to write the same file every time
     """
     output_path = Path(output_file)
     # Create base landmarks in a face-like pattern
@@ -36,6 +38,8 @@ def generate_sample_data(
     # Create data array
     data = np.zeros((n_frames, n_landmarks, 3))
 
+    rng = np.random.default_rng(seed)
+
     # Generate animation: face moves and deforms over time
     for frame in range(n_frames):
         t = frame / n_frames
@@ -57,9 +61,9 @@ def generate_sample_data(
         y += deformation * np.sin(angles)
 
         # Add some noise
-        x += np.random.normal(0, 0.01, n_landmarks)
-        y += np.random.normal(0, 0.01, n_landmarks)
-        z += np.random.normal(0, 0.01, n_landmarks)
+        x += rng.normal(0, 0.01, n_landmarks)
+        y += rng.normal(0, 0.01, n_landmarks)
+        z += rng.normal(0, 0.01, n_landmarks)
 
         data[frame, :, 0] = x
         data[frame, :, 1] = y
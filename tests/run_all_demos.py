@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Run all demo scripts in one process.
+
+matplotlib (and its font cache) is loaded once and shared by every
+histogram demo, instead of once per script.
+"""
+
+import demo_histogram
+import demo_histogram_final
+import demo_histogram_rounded
+import demo_histogram_updated
+from demo_alignment_methods import demo_alignment_methods
+
+
+def main():
+    demo_histogram.main()
+    print()
+    demo_histogram_final.main()
+    print()
+    demo_histogram_rounded.main()
+    print()
+    demo_histogram_updated.main()
+    print()
+    demo_alignment_methods()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,26 @@
 Test alignment functionality
 """
 
+import math
+
 import numpy as np
+from vptry_facelandmarkview.alignments import align_landmarks_batch
 from vptry_facelandmarkview.utils import align_landmarks_to_base
 
+from _sample_data import load_sample_landmarks
+
+
+def _rot_z(angle: float) -> np.ndarray:
+    """Rotation matrix for the given angle around the Z axis"""
+    cos_a, sin_a = np.cos(angle), np.sin(angle)
+    return np.array(
+        [[cos_a, -sin_a, 0.0], [sin_a, cos_a, 0.0], [0.0, 0.0, 1.0]], dtype=np.float64
+    )
+
+
+# Rotations used by the tests, built once at import time
+ROT_Z = {angle: _rot_z(angle) for angle in (np.pi / 4, np.pi / 6)}
+
 
 def test_alignment_identity():
     """Test that aligning identical landmarks returns the same landmarks"""
@@ -18,14 +35,15 @@ def test_alignment_identity():
             [1.0, 0.0, 0.0],
             [0.0, 1.0, 0.0],
             [0.0, 0.0, 1.0],
-        ]
+        ],
+        dtype=np.float32,
     )
 
     # Align to itself - should return the same
     aligned = align_landmarks_to_base(base, base)
 
     # Check that they are approximately equal
-    np.testing.assert_array_almost_equal(aligned, base, decimal=5)
+    np.testing.assert_allclose(aligned, base, rtol=0, atol=1.5e-5)
     print("  ✓ Identity alignment works correctly")
 
 
@@ -40,7 +58,8 @@ def test_alignment_translation():
             [1.0, 0.0, 0.0],
             [0.0, 1.0, 0.0],
             [0.0, 0.0, 1.0],
-        ]
+        ],
+        dtype=np.float32,
     )
 
     # Create translated landmarks (moved by [5, 3, -2])
@@ -51,7 +70,7 @@ def test_alignment_translation():
     aligned = align_landmarks_to_base(translated, base)
 
     # Should be approximately equal to base
-    np.testing.assert_array_almost_equal(aligned, base, decimal=5)
+    np.testing.assert_allclose(aligned, base, rtol=0, atol=1.5e-5)
     print("  ✓ Translation removed correctly")
 
 
@@ -66,23 +85,21 @@ def test_alignment_rotation():
             [-1.0, 1.0, 0.0],
             [-1.0, -1.0, 0.0],
             [1.0, -1.0, 0.0],
-        ]
+        ],
+        dtype=np.float32,
     )
 
-    # Create rotation matrix (45 degrees around Z axis)
-    angle = np.pi / 4  # 45 degrees
-    cos_a = np.cos(angle)
-    sin_a = np.sin(angle)
-    rotation = np.array([[cos_a, -sin_a, 0], [sin_a, cos_a, 0], [0, 0, 1]])
+    # Rotation matrix (45 degrees around Z axis)
+    rotation = ROT_Z[np.pi / 4]
 
-    # Rotate landmarks
-    rotated = (rotation @ base.T).T
+    # Rotate landmarks (row vectors, so R x becomes x @ R.T)
+    rotated = base @ rotation.T
 
     # Align rotated back to base
     aligned = align_landmarks_to_base(rotated, base)
 
     # Should be approximately equal to base
-    np.testing.assert_array_almost_equal(aligned, base, decimal=5)
+    np.testing.assert_allclose(aligned, base, rtol=0, atol=1.5e-5)
     print("  ✓ Rotation removed correctly")
 
 
@@ -97,24 +114,22 @@ def test_alignment_combined():
             [0.0, 1.0, 0.0],
             [0.0, 0.0, 1.0],
             [1.0, 1.0, 1.0],
-        ]
+        ],
+        dtype=np.float32,
     )
 
-    # Create rotation matrix (30 degrees around Z axis)
-    angle = np.pi / 6  # 30 degrees
-    cos_a = np.cos(angle)
-    sin_a = np.sin(angle)
-    rotation = np.array([[cos_a, -sin_a, 0], [sin_a, cos_a, 0], [0, 0, 1]])
+    # Rotation matrix (30 degrees around Z axis)
+    rotation = ROT_Z[np.pi / 6]
 
     # Apply rotation and translation
     translation = np.array([10.0, -5.0, 3.0])
-    transformed = (rotation @ base.T).T + translation
+    transformed = base @ rotation.T + translation
 
     # Align transformed back to base
     aligned = align_landmarks_to_base(transformed, base)
 
     # Should be approximately equal to base
-    np.testing.assert_array_almost_equal(aligned, base, decimal=5)
+    np.testing.assert_allclose(aligned, base, rtol=0, atol=1.5e-5)
     print("  ✓ Combined transformation removed correctly")
 
 
@@ -122,8 +137,8 @@ def test_alignment_empty():
     """Test alignment with empty arrays"""
     print("\nTest: Alignment with empty arrays")
 
-    empty = np.array([]).reshape(0, 3)
-    base = np.array([[1.0, 2.0, 3.0]])
+    empty = np.empty((0, 3), dtype=np.float32)
+    base = np.array([[1.0, 2.0, 3.0]], dtype=np.float32)
 
     # Aligning empty should return empty
     result = align_landmarks_to_base(empty, base)
@@ -136,7 +151,7 @@ def test_alignment_with_sample_data():
     print("\nTest: Alignment with real sample data")
 
     try:
-        data = np.load("sample_landmarks.npy")
+        data = load_sample_landmarks()
         print(f"  Loaded sample data: {data.shape}")
 
         # Get base and current frame
@@ -158,12 +173,19 @@ def test_alignment_with_sample_data():
 
         print(f"  Base center: {base_center}")
         print(f"  Aligned center: {aligned_center}")
-        print(f"  Center difference: {np.linalg.norm(aligned_center - base_center)}")
+        print(f"  Center difference: {math.dist(aligned_center, base_center)}")
 
         # Centers should be close (translation removed)
-        np.testing.assert_array_almost_equal(aligned_center, base_center, decimal=5)
+        np.testing.assert_allclose(aligned_center, base_center, rtol=0, atol=1.5e-5)
         print("  ✓ Sample data alignment works correctly")
 
+        # Align every frame at once (one batched matmul and SVD) and check it
+        # against the per-frame result
+        aligned_all = align_landmarks_batch(data, base_frame)
+        assert aligned_all.shape == data.shape
+        np.testing.assert_allclose(aligned_all[10], aligned, rtol=0, atol=1.5e-5)
+        print(f"  ✓ Batch alignment of all {len(data)} frames matches per-frame")
+
     except FileNotFoundError:
         print("  ⚠ Sample data not found, skipping this test")
 
@@ -180,16 +202,14 @@ def test_alignment_with_indices():
             [0.0, 1.0, 0.0],
             [0.0, 0.0, 1.0],
             [1.0, 1.0, 1.0],
-        ]
+        ],
+        dtype=np.float32,
     )
 
     # Create translated and rotated landmarks
-    angle = np.pi / 6  # 30 degrees
-    cos_a = np.cos(angle)
-    sin_a = np.sin(angle)
-    rotation = np.array([[cos_a, -sin_a, 0], [sin_a, cos_a, 0], [0, 0, 1]])
+    rotation = ROT_Z[np.pi / 6]  # 30 degrees
     translation = np.array([5.0, 3.0, -2.0])
-    current = (rotation @ base.T).T + translation
+    current = base @ rotation.T + translation
 
     # Align using only first 3 points (indices 0, 1, 2)
     alignment_indices = [0, 1, 2]
@@ -204,7 +224,7 @@ def test_alignment_with_indices():
     # Check that the alignment was computed using only specified points
     # The first 3 points should be very close to base
     for i in alignment_indices:
-        diff = np.linalg.norm(aligned[i] - base[i])
+        diff = math.dist(aligned[i], base[i])
         print(f"  Point {i} difference: {diff:.6f}")
         assert diff < 0.01, f"Point {i} should be well-aligned"
 
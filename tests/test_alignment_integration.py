@@ -30,12 +30,10 @@ def test_alignment_with_draw_landmarks():
 
     # Test that alignment_fn works
     aligned = alignment_fn(current)
-    np.testing.assert_array_almost_equal(aligned, base, decimal=5)
+    np.testing.assert_allclose(aligned, base, rtol=0, atol=1.5e-5)
     print("  ✓ Alignment function created with partial works correctly")
 
     # Test that draw_landmarks accepts alignment_fn (won't actually draw, but should not crash)
-    base.mean(axis=0)
-
     try:
         # This will fail because OpenGL is not initialized, but we can catch that
         # The important thing is that the function signature is correct
@@ -79,7 +77,7 @@ def test_alignment_preserves_expression():
         ]
     )
     translation = np.array([10.0, -5.0, 3.0])
-    transformed = (rotation @ expression.T).T + translation
+    transformed = expression @ rotation.T + translation
 
     # Align back to base
     aligned = align_landmarks_to_base(transformed, base)
@@ -90,17 +88,19 @@ def test_alignment_preserves_expression():
     aligned_center = aligned.mean(axis=0)
 
     # Centers should match (translation removed)
-    np.testing.assert_array_almost_equal(aligned_center, base_center, decimal=5)
+    np.testing.assert_allclose(aligned_center, base_center, rtol=0, atol=1.5e-5)
     print("  ✓ Center alignment correct")
 
     # The top point should still be elevated relative to the base
     # (expression preserved after removing head movement)
-    expression_change = expression - base
-    aligned_change = aligned - base
-
-    # The magnitude of change should be similar (expression preserved)
-    expression_magnitude = np.linalg.norm(expression_change, axis=1)
-    aligned_magnitude = np.linalg.norm(aligned_change, axis=1)
+    # The magnitude of change should be similar (expression preserved);
+    # both per-point magnitudes come from one subtraction and one reduction,
+    # done in place in the stacked buffer
+    changes = np.stack([expression, aligned])
+    np.subtract(changes, base, out=changes)
+    expression_magnitude, aligned_magnitude = np.sqrt(
+        np.einsum("kij,kij->ki", changes, changes)
+    )
 
     # Point 2 (the one that moved) should have similar magnitude of change
     print(f"  Expression change magnitude at point 2: {expression_magnitude[2]:.3f}")
@@ -3,12 +3,62 @@
 Test different alignment methods
 """
 
+from unittest.mock import patch
+
 import numpy as np
 from vptry_facelandmarkview.alignments import (
     get_available_alignment_methods,
     get_alignment_method,
+    align_landmarks_batch,
     align_landmarks_default,
     align_landmarks_scipy_procrustes,
+    create_aligner,
+    rigid_transforms_batch,
+    ProcrustesAligner,
+)
+from vptry_facelandmarkview.alignments.common import resolve_alignment_indices
+from vptry_facelandmarkview.alignments.default import (
+    rotation_from_covariance_horn,
+    rotation_from_covariance_svd,
+)
+from vptry_facelandmarkview.kernels import HAVE_NUMBA, kabsch_align
+from vptry_facelandmarkview.constants import DEFAULT_ALIGNMENT_LANDMARKS
+
+
+def _build_fixture(
+    base_points: list[list[float]],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Base landmarks and a rotated (30 degrees around Z) and translated copy
+
+    Both arrays are read-only, so the tests can share them.
+    """
+    base = np.array(base_points)
+    angle = np.pi / 6
+    cos_a, sin_a = np.cos(angle), np.sin(angle)
+    rotation = np.array([[cos_a, -sin_a, 0], [sin_a, cos_a, 0], [0, 0, 1]])
+    current = base @ rotation.T + np.array([5.0, 3.0, -2.0])
+    base.flags.writeable = False
+    current.flags.writeable = False
+    return base, current
+
+
+# Shared test landmarks, built once at import time
+_BASE, _CURRENT = _build_fixture(
+    [
+        [0.0, 0.0, 0.0],
+        [1.0, 0.0, 0.0],
+        [0.0, 1.0, 0.0],
+        [0.0, 0.0, 1.0],
+    ]
+)
+_BASE_5, _CURRENT_5 = _build_fixture(
+    [
+        [0.0, 0.0, 0.0],
+        [1.0, 0.0, 0.0],
+        [0.0, 1.0, 0.0],
+        [0.0, 0.0, 1.0],
+        [1.0, 1.0, 1.0],
+    ]
 )
 
 
@@ -43,39 +93,30 @@ def test_alignment_methods_work():
     """Test that all alignment methods produce valid results"""
     print("\nTest: All alignment methods work")
 
-    # Create test data
-    base = np.array(
-        [
-            [0.0, 0.0, 0.0],
-            [1.0, 0.0, 0.0],
-            [0.0, 1.0, 0.0],
-            [0.0, 0.0, 1.0],
-        ]
-    )
+    # Base landmarks and a translated and rotated copy
+    base, current = _BASE, _CURRENT
 
-    # Create translated and rotated landmarks
-    angle = np.pi / 6  # 30 degrees
-    cos_a = np.cos(angle)
-    sin_a = np.sin(angle)
-    rotation = np.array([[cos_a, -sin_a, 0], [sin_a, cos_a, 0], [0, 0, 1]])
-    translation = np.array([5.0, 3.0, -2.0])
-    current = (rotation @ base.T).T + translation
+    # Resolve every method once, then align with all of them
+    funcs = [
+        (method_name, get_alignment_method(method_name))
+        for method_name in get_available_alignment_methods()
+    ]
+    aligned_all = np.stack([align_func(current, base) for _, align_func in funcs])
 
-    methods = get_available_alignment_methods()
-    for method_name in methods:
-        print(f"\n  Testing method: {method_name}")
-        align_func = get_alignment_method(method_name)
+    # Mean distances for every method in one pass
+    original_distance = np.linalg.norm(current - base, axis=1).mean()
+    aligned_distances = np.linalg.norm(aligned_all - base, axis=-1).mean(axis=1)
 
-        # Align current to base
-        aligned = align_func(current, base)
+    for (method_name, _), aligned, aligned_distance in zip(
+        funcs, aligned_all, aligned_distances
+    ):
+        print(f"\n  Testing method: {method_name}")
 
         # Check that shape is preserved
         assert aligned.shape == current.shape
         print(f"    ✓ Shape preserved: {aligned.shape}")
 
         # Check that alignment brings landmarks closer to base
-        original_distance = np.mean(np.linalg.norm(current - base, axis=1))
-        aligned_distance = np.mean(np.linalg.norm(aligned - base, axis=1))
 
         print(f"    Original mean distance: {original_distance:.6f}")
         print(f"    Aligned mean distance: {aligned_distance:.6f}")
@@ -92,31 +133,17 @@ def test_alignment_with_indices():
     """Test that alignment methods work with specified indices"""
     print("\nTest: Alignment methods work with indices")
 
-    # Create test data
-    base = np.array(
-        [
-            [0.0, 0.0, 0.0],
-            [1.0, 0.0, 0.0],
-            [0.0, 1.0, 0.0],
-            [0.0, 0.0, 1.0],
-            [1.0, 1.0, 1.0],
-        ]
-    )
-
-    # Create transformed landmarks
-    angle = np.pi / 6  # 30 degrees
-    cos_a = np.cos(angle)
-    sin_a = np.sin(angle)
-    rotation = np.array([[cos_a, -sin_a, 0], [sin_a, cos_a, 0], [0, 0, 1]])
-    translation = np.array([5.0, 3.0, -2.0])
-    current = (rotation @ base.T).T + translation
+    # Base landmarks and a transformed copy
+    base, current = _BASE_5, _CURRENT_5
 
     alignment_indices = [0, 1, 2]
 
-    methods = get_available_alignment_methods()
-    for method_name in methods:
+    funcs = [
+        (method_name, get_alignment_method(method_name))
+        for method_name in get_available_alignment_methods()
+    ]
+    for method_name, align_func in funcs:
         print(f"\n  Testing method with indices: {method_name}")
-        align_func = get_alignment_method(method_name)
 
         # Align using only first 3 points
         aligned = align_func(current, base, alignment_indices=alignment_indices)
@@ -126,15 +153,176 @@ def test_alignment_with_indices():
         print(f"    ✓ Shape preserved: {aligned.shape}")
 
         # Check that the specified points are well-aligned
-        for i in alignment_indices:
-            diff = np.linalg.norm(aligned[i] - base[i])
+        diffs = np.linalg.norm(
+            aligned[alignment_indices] - base[alignment_indices], axis=1
+        )
+        for i, diff in zip(alignment_indices, diffs):
             print(f"    Point {i} difference: {diff:.6f}")
-            # Allow reasonable tolerance for alignment
-            assert diff < 1.0, f"Point {i} should be reasonably aligned"
+        # Allow reasonable tolerance for alignment
+        misaligned = np.asarray(alignment_indices)[diffs >= 1.0]
+        assert len(misaligned) == 0, (
+            f"Points {misaligned.tolist()} should be reasonably aligned"
+        )
 
         print(f"    ✓ {method_name} works with indices")
 
 
+def test_alignment_with_tuple_indices():
+    """Test that tuple indices (e.g. DEFAULT_ALIGNMENT_LANDMARKS) are accepted"""
+    print("\nTest: Alignment with tuple indices")
+
+    assert isinstance(DEFAULT_ALIGNMENT_LANDMARKS, tuple)
+
+    rng = np.random.default_rng(0)
+    base = rng.standard_normal((478, 3))
+    landmarks = base + np.array([0.5, -0.2, 0.1])
+
+    for method_name in get_available_alignment_methods():
+        align_func = get_alignment_method(method_name)
+        aligned_tuple = align_func(landmarks, base, DEFAULT_ALIGNMENT_LANDMARKS)
+        aligned_list = align_func(landmarks, base, list(DEFAULT_ALIGNMENT_LANDMARKS))
+        np.testing.assert_allclose(aligned_tuple, aligned_list)
+        print(f"  ✓ {method_name}: tuple and list indices give the same result")
+
+    # Index arrays are memoized and validated against the landmark count
+    first = resolve_alignment_indices(DEFAULT_ALIGNMENT_LANDMARKS, 478)
+    second = resolve_alignment_indices(DEFAULT_ALIGNMENT_LANDMARKS, 478)
+    assert first is second, "Index array should be reused for the same indices"
+    assert resolve_alignment_indices(DEFAULT_ALIGNMENT_LANDMARKS, 100) is None
+    index_array = np.asarray(DEFAULT_ALIGNMENT_LANDMARKS, dtype=np.intp)
+    assert resolve_alignment_indices(index_array, 478) is index_array
+    print("  ✓ Index arrays are cached and validated")
+
+
+def test_create_aligner():
+    """Test that aligners bound to a base match the alignment functions"""
+    print("\nTest: Aligners bound to a base frame")
+
+    rng = np.random.default_rng(1)
+    base = rng.standard_normal((478, 3))
+    frames = [base + np.array([0.1 * i, 0.0, -0.05 * i]) for i in range(3)]
+
+    for method_name in get_available_alignment_methods():
+        align_func = get_alignment_method(method_name)
+        aligner = create_aligner(method_name, base, DEFAULT_ALIGNMENT_LANDMARKS)
+        for landmarks in frames:
+            np.testing.assert_allclose(
+                aligner(landmarks),
+                align_func(landmarks, base, DEFAULT_ALIGNMENT_LANDMARKS),
+            )
+        print(f"  ✓ {method_name}: aligner matches the alignment function")
+
+
+def test_empty_alignment_indices():
+    """Test that an empty selection falls back to all landmarks"""
+    print("\nTest: Empty alignment indices")
+
+    # The fixture is an exact rigid copy, so aligning on all landmarks
+    # recovers the base
+    for indices in ([], set(), np.empty(0, dtype=np.intp)):
+        aligner = ProcrustesAligner(_BASE_5, indices)
+        assert aligner.indices is None
+        np.testing.assert_allclose(aligner(_CURRENT_5), _BASE_5, atol=1e-10)
+    print("  ✓ Empty selection aligns on all landmarks")
+
+    # The same on the NumPy path used when numba is not installed
+    with patch("vptry_facelandmarkview.alignments.default.HAVE_NUMBA", False):
+        aligned = ProcrustesAligner(_BASE_5, [])(_CURRENT_5)
+    np.testing.assert_allclose(aligned, _BASE_5, atol=1e-10)
+    print("  ✓ NumPy path falls back the same way")
+
+
+def test_rotation_solvers_agree():
+    """Test that Horn's quaternion method matches the SVD solution"""
+    print("\nTest: Horn quaternion and SVD rotations agree")
+
+    rng = np.random.default_rng(2)
+    for _ in range(20):
+        source = rng.standard_normal((50, 3))
+        target = rng.standard_normal((50, 3))
+        H = (source - source.mean(axis=0)).T @ (target - target.mean(axis=0))
+        np.testing.assert_allclose(
+            rotation_from_covariance_horn(H),
+            rotation_from_covariance_svd(H),
+            atol=1e-8,
+        )
+
+    print("  ✓ Rotations match")
+
+
+def test_kabsch_kernel():
+    """Test the compiled alignment kernel against the SVD solution"""
+    print("\nTest: Compiled alignment kernel")
+
+    if not HAVE_NUMBA:
+        print("  - numba not installed, skipping")
+        return
+
+    rng = np.random.default_rng(3)
+    base = rng.standard_normal((478, 3))
+    landmarks = base[:, [1, 0, 2]] * np.array([1.0, -1.0, 1.0]) + 0.3
+    indices = np.asarray(DEFAULT_ALIGNMENT_LANDMARKS, dtype=np.intp)
+
+    for kernel_indices, use_all, fit in (
+        (np.empty(0, dtype=np.intp), True, slice(None)),
+        (indices, False, indices),
+    ):
+        base_center = base[fit].mean(axis=0)
+        landmarks_center = landmarks[fit].mean(axis=0)
+        H = (landmarks[fit] - landmarks_center).T @ (base[fit] - base_center)
+        expected = (
+            rotation_from_covariance_svd(H) @ (landmarks - landmarks_center).T
+        ).T + base_center
+        aligned = kabsch_align(
+            landmarks, kernel_indices, use_all, base[fit] - base_center, base_center
+        )
+        np.testing.assert_allclose(aligned, expected, atol=1e-10)
+
+    print("  ✓ Kernel matches the SVD alignment")
+
+
+def test_align_landmarks_batch():
+    """Test that batch alignment matches aligning frames one at a time"""
+    print("\nTest: Batch alignment")
+
+    rng = np.random.default_rng(4)
+    base = rng.standard_normal((478, 3))
+    frames = base + 0.05 * rng.standard_normal((5, 478, 3))
+    frames[1] = frames[1] @ np.array(
+        [[0.0, -1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]]
+    )
+    frames[2] = frames[2] * np.array([1.0, 1.0, -1.0])  # Reflected
+
+    # An empty selection falls back to all landmarks, like the per-frame path
+    for indices in (None, DEFAULT_ALIGNMENT_LANDMARKS, []):
+        aligned = align_landmarks_batch(frames, base, indices)
+        expected = np.stack(
+            [align_landmarks_default(frame, base, indices) for frame in frames]
+        )
+        np.testing.assert_allclose(aligned, expected, atol=1e-8)
+
+    print("  ✓ Batch alignment matches per-frame alignment")
+
+    # Precomputed transforms reproduce the aligned frames
+    rotations, translations = rigid_transforms_batch(
+        frames, base, DEFAULT_ALIGNMENT_LANDMARKS
+    )
+    expected = align_landmarks_batch(frames, base, DEFAULT_ALIGNMENT_LANDMARKS)
+    for f in range(len(frames)):
+        np.testing.assert_allclose(
+            frames[f] @ rotations[f].T + translations[f], expected[f], atol=1e-8
+        )
+    np.testing.assert_allclose(np.linalg.det(rotations), 1.0)
+    print("  ✓ Per-frame rigid transforms match batch alignment")
+
+    # Empty indices give the all-landmark transforms, not NaN
+    rotations_all, translations_all = rigid_transforms_batch(frames, base)
+    rotations_empty, translations_empty = rigid_transforms_batch(frames, base, [])
+    np.testing.assert_allclose(rotations_empty, rotations_all)
+    np.testing.assert_allclose(translations_empty, translations_all)
+    print("  ✓ Empty indices fall back to all landmarks")
+
+
 def main():
     """Run all alignment method tests"""
     print("=" * 60)
@@ -147,6 +335,12 @@ def main():
         test_get_alignment_method()
         test_alignment_methods_work()
         test_alignment_with_indices()
+        test_alignment_with_tuple_indices()
+        test_create_aligner()
+        test_empty_alignment_indices()
+        test_rotation_solvers_agree()
+        test_kabsch_kernel()
+        test_align_landmarks_batch()
 
         print()
         print("=" * 60)
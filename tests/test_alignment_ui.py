@@ -3,25 +3,24 @@
 Test alignment UI integration
 """
 
-import sys
-import numpy as np
-from vptry_facelandmarkview import FaceLandmarkViewer
-from PySide6.QtWidgets import QApplication
+from _sample_data import load_sample_landmarks
 
 
 def test_alignment_ui():
     """Test that the alignment UI works correctly"""
     print("Test: Alignment UI integration")
 
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
+    # Qt is imported here so collecting this module stays cheap
+    from _qt_common import get_qapp
+    from vptry_facelandmarkview import FaceLandmarkViewer
+
+    get_qapp()
 
     # Create viewer
     viewer = FaceLandmarkViewer()
 
     # Load sample data
-    data = np.load("sample_landmarks.npy")
+    data = load_sample_landmarks()
     viewer.data = data
     n_frames, n_landmarks, _ = data.shape
 
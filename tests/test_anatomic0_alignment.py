@@ -10,27 +10,76 @@ from vptry_facelandmarkview.constants import (
     ANATOMIC0_MIDPOINT_PAIRS,
 )
 
+# Midpoint pairs as an index array (n_pairs, 2), for gathering all pairs at once
+MIDPOINT_PAIRS = np.asarray(ANATOMIC0_MIDPOINT_PAIRS, dtype=np.intp)
 
-def test_anatomic0_with_mediapipe_landmarks():
-    """Test anatomic0 alignment with 478 MediaPipe landmarks"""
-    print("Test: Anatomic0 alignment with MediaPipe landmarks")
+# MediaPipe Face Landmarker produces 478 landmarks
+N_LANDMARKS = 478
+
+
+def _perturbable_indices(n_landmarks: int) -> np.ndarray:
+    """Indices that are neither nose landmarks nor part of a midpoint pair"""
+    mask = np.ones(n_landmarks, dtype=bool)
+    mask[list(NOSE_LANDMARKS)] = False
+    mask[MIDPOINT_PAIRS.ravel()] = False
+    return np.flatnonzero(mask)
 
-    # MediaPipe Face Landmarker produces 478 landmarks
-    n_landmarks = 478
 
-    # Create synthetic base landmarks
-    np.random.seed(42)
-    base = np.random.randn(n_landmarks, 3) * 0.1
+# Landmarks anatomic0 should ignore, computed once at import time
+PERTURBABLE = _perturbable_indices(N_LANDMARKS)
+
+
+def _build_fixture(
+    n_landmarks: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Synthetic face landmarks and two transformed copies
+
+    Returns the base landmarks, a rotated (45 degrees around Z) and
+    translated copy, and a slightly perturbed copy with large noise on a
+    few non-anatomic landmarks. All arrays are float32 and read-only, so
+    the tests can share them.
+    """
+    rng = np.random.default_rng(42)
+    base = rng.standard_normal((n_landmarks, 3), dtype=np.float32)
+    base *= 0.1
     # Make it look more like a face (centered around origin)
     base[:, 2] -= 0.5  # Push z back a bit
 
-    # Create transformed current landmarks (rotation + translation)
-    angle = np.pi / 4  # 45 degrees
-    cos_a = np.cos(angle)
-    sin_a = np.sin(angle)
-    rotation = np.array([[cos_a, -sin_a, 0], [sin_a, cos_a, 0], [0, 0, 1]])
-    translation = np.array([0.5, 0.3, -0.2])
-    current = (rotation @ base.T).T + translation
+    angle = np.pi / 4
+    cos_a, sin_a = np.cos(angle), np.sin(angle)
+    rotation = np.array(
+        [[cos_a, -sin_a, 0], [sin_a, cos_a, 0], [0, 0, 1]], dtype=np.float32
+    )
+    translation = np.array([0.5, 0.3, -0.2], dtype=np.float32)
+    rotated = base @ rotation.T + translation
+
+    perturbed = base + rng.standard_normal((n_landmarks, 3), dtype=np.float32) * 0.01
+    # Apply large changes to non-anatomic landmarks
+    # (to ensure alignment ignores these)
+    perturbed[PERTURBABLE[:10]] += rng.standard_normal((10, 3), dtype=np.float32) * 2.0
+
+    for array in (base, rotated, perturbed):
+        array.flags.writeable = False
+    return base, rotated, perturbed
+
+
+# Shared test landmarks, built once at import time
+_BASE, _CURRENT_ROTATED, _CURRENT_PERTURBED = _build_fixture(N_LANDMARKS)
+
+
+def _squared_distances(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise squared Euclidean distances between a and b (n, 3)"""
+    diff = a - b
+    return np.einsum("ij,ij->i", diff, diff)
+
+
+def test_anatomic0_with_mediapipe_landmarks():
+    """Test anatomic0 alignment with 478 MediaPipe landmarks"""
+    print("Test: Anatomic0 alignment with MediaPipe landmarks")
+
+    # Synthetic base landmarks and a rotated + translated copy
+    base = _BASE
+    current = _CURRENT_ROTATED
 
     # Get the anatomic0 alignment method
     align_func = get_alignment_method("anatomic0")
@@ -39,12 +88,12 @@ def test_anatomic0_with_mediapipe_landmarks():
     aligned = align_func(current, base)
 
     # Verify shape is preserved
-    assert aligned.shape == current.shape == (n_landmarks, 3)
+    assert aligned.shape == current.shape == (N_LANDMARKS, 3)
     print(f"  ✓ Shape preserved: {aligned.shape}")
 
     # Check that alignment improves distance
-    original_distance = np.mean(np.linalg.norm(current - base, axis=1))
-    aligned_distance = np.mean(np.linalg.norm(aligned - base, axis=1))
+    original_distance = np.sqrt(_squared_distances(current, base)).mean()
+    aligned_distance = np.sqrt(_squared_distances(aligned, base)).mean()
 
     print(f"  Original mean distance: {original_distance:.6f}")
     print(f"  Aligned mean distance: {aligned_distance:.6f}")
@@ -62,49 +111,39 @@ def test_anatomic0_uses_correct_landmarks():
     """Test that anatomic0 uses nose landmarks and midpoints correctly"""
     print("\nTest: Anatomic0 uses correct anatomic landmarks")
 
-    n_landmarks = 478
-    np.random.seed(42)
-    base = np.random.randn(n_landmarks, 3) * 0.1
-
-    # Create a copy with slight perturbations
-    current = base.copy()
-    current += np.random.randn(n_landmarks, 3) * 0.01
-
-    # Apply large changes to non-anatomic landmarks
-    # (to ensure alignment ignores these)
-    non_anatomic_indices = [i for i in range(n_landmarks) if i not in NOSE_LANDMARKS]
-    # Take a subset that doesn't include midpoint pairs
-    excluded_from_midpoints = set()
-    for idx1, idx2 in ANATOMIC0_MIDPOINT_PAIRS:
-        excluded_from_midpoints.add(idx1)
-        excluded_from_midpoints.add(idx2)
-
-    perturbable = [i for i in non_anatomic_indices if i not in excluded_from_midpoints]
-    if len(perturbable) > 10:
-        # Add large noise to some non-anatomic landmarks
-        current[perturbable[:10]] += np.random.randn(10, 3) * 2.0
+    # A slightly perturbed copy of the base, with large noise on a few
+    # landmarks that are neither nose landmarks nor midpoint pairs
+    base = _BASE
+    current = _CURRENT_PERTURBED
 
     # Align using anatomic0
     align_func = get_alignment_method("anatomic0")
     aligned = align_func(current, base)
 
     # Check that nose landmarks are well-aligned
-    nose_aligned_distance = np.mean(
-        np.linalg.norm(aligned[NOSE_LANDMARKS] - base[NOSE_LANDMARKS], axis=1)
-    )
+    nose_indices = list(NOSE_LANDMARKS)
+    nose_aligned_distance = np.sqrt(
+        _squared_distances(aligned[nose_indices], base[nose_indices])
+    ).mean()
     print(f"  Nose landmarks mean distance: {nose_aligned_distance:.6f}")
     assert nose_aligned_distance < 0.05, "Nose landmarks should be well-aligned"
     print("  ✓ Nose landmarks are well-aligned")
 
     # Check that midpoint landmarks are well-aligned
-    for idx1, idx2 in ANATOMIC0_MIDPOINT_PAIRS:
-        midpoint_aligned = (aligned[idx1] + aligned[idx2]) / 2.0
-        midpoint_base = (base[idx1] + base[idx2]) / 2.0
-        midpoint_distance = np.linalg.norm(midpoint_aligned - midpoint_base)
-        print(f"  Midpoint ({idx1}, {idx2}) distance: {midpoint_distance:.6f}")
-        assert midpoint_distance < 0.1, (
-            f"Midpoint ({idx1}, {idx2}) should be well-aligned"
+    midpoints_aligned = aligned[MIDPOINT_PAIRS].mean(axis=1)
+    midpoints_base = base[MIDPOINT_PAIRS].mean(axis=1)
+    midpoint_sq_distances = _squared_distances(midpoints_aligned, midpoints_base)
+    for (idx1, idx2), midpoint_sq_distance in zip(
+        ANATOMIC0_MIDPOINT_PAIRS, midpoint_sq_distances
+    ):
+        print(
+            f"  Midpoint ({idx1}, {idx2}) distance: {np.sqrt(midpoint_sq_distance):.6f}"
         )
+    # Compared squared, against the squared threshold (0.1 ** 2)
+    worst = int(np.argmax(midpoint_sq_distances))
+    assert midpoint_sq_distances[worst] < 0.1**2, (
+        f"Midpoint {ANATOMIC0_MIDPOINT_PAIRS[worst]} should be well-aligned"
+    )
 
     print("  ✓ Midpoint landmarks are well-aligned")
 
@@ -118,7 +157,8 @@ def test_anatomic0_landmark_constants():
     print(f"  ✓ NOSE_LANDMARKS defined with {len(NOSE_LANDMARKS)} landmarks")
 
     # Check that all nose landmarks are valid MediaPipe indices
-    assert all(0 <= idx < 478 for idx in NOSE_LANDMARKS), (
+    nose = np.asarray(NOSE_LANDMARKS, dtype=np.intp)
+    assert nose.min() >= 0 and nose.max() < N_LANDMARKS, (
         "All NOSE_LANDMARKS should be valid MediaPipe indices (0-477)"
     )
     print("  ✓ All nose landmarks are valid MediaPipe indices")
@@ -132,21 +172,26 @@ def test_anatomic0_landmark_constants():
     )
 
     # Check that all midpoint pairs contain valid indices
-    for idx1, idx2 in ANATOMIC0_MIDPOINT_PAIRS:
-        assert 0 <= idx1 < 478, f"Midpoint index {idx1} should be valid (0-477)"
-        assert 0 <= idx2 < 478, f"Midpoint index {idx2} should be valid (0-477)"
-        assert idx1 != idx2, (
-            f"Midpoint pair ({idx1}, {idx2}) should have different indices"
-        )
+    assert MIDPOINT_PAIRS.min() >= 0 and MIDPOINT_PAIRS.max() < N_LANDMARKS, (
+        f"Midpoint indices should be valid (0-477), got {ANATOMIC0_MIDPOINT_PAIRS}"
+    )
+    assert (MIDPOINT_PAIRS[:, 0] != MIDPOINT_PAIRS[:, 1]).all(), (
+        f"Midpoint pairs should have different indices, got {ANATOMIC0_MIDPOINT_PAIRS}"
+    )
+    # (a, b) and (b, a) describe the same midpoint, so compare sorted pairs
+    unique_pairs = np.unique(np.sort(MIDPOINT_PAIRS, axis=1), axis=0)
+    assert len(unique_pairs) == len(MIDPOINT_PAIRS), (
+        f"Midpoint pairs should not repeat, got {ANATOMIC0_MIDPOINT_PAIRS}"
+    )
 
     print("  ✓ All midpoint pairs are valid")
 
     # Verify the specific pairs mentioned in the issue
     expected_pairs = [(33, 133), (362, 263)]
-    for pair in expected_pairs:
-        assert pair in ANATOMIC0_MIDPOINT_PAIRS, (
-            f"Expected midpoint pair {pair} not found in ANATOMIC0_MIDPOINT_PAIRS"
-        )
+    missing_pairs = set(expected_pairs).difference(ANATOMIC0_MIDPOINT_PAIRS)
+    assert not missing_pairs, (
+        f"Expected midpoint pairs {missing_pairs} not found in ANATOMIC0_MIDPOINT_PAIRS"
+    )
     print(f"  ✓ All required midpoint pairs present: {expected_pairs}")
 
 
@@ -4,13 +4,14 @@ Test script to validate the application loads and functions correctly
 """
 
 import sys
-import numpy as np
+
+from _sample_data import load_sample_landmarks
 
 
 # Test data loading
 def test_data_loading():
     """Test that sample data can be loaded"""
-    data = np.load("sample_landmarks.npy")
+    data = load_sample_landmarks()
     print("✓ Data loaded successfully")
     print(f"  Shape: {data.shape}")
 
@@ -41,12 +42,10 @@ def test_imports():
 def test_app_instantiation():
     """Test that the application can be instantiated"""
     try:
-        from PySide6.QtWidgets import QApplication
+        from _qt_common import get_qapp
         from vptry_facelandmarkview import FaceLandmarkViewer
 
-        app = QApplication.instance()
-        if app is None:
-            app = QApplication(sys.argv)
+        get_qapp()
 
         viewer = FaceLandmarkViewer()
         print("✓ Application instantiated successfully")
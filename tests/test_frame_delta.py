@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test the shared frame delta model
+"""
+
+import numpy as np
+from vptry_facelandmarkview.frame_delta import FrameDeltaModel
+from vptry_facelandmarkview.kernels import nan_summary
+
+
+def _make_data() -> np.ndarray:
+    """Create two frames with a few NaN landmarks"""
+    rng = np.random.default_rng(0)
+    data = rng.random((2, 478, 3))
+    data[1] = data[0] + 0.01
+    data[0, 5] = np.nan
+    data[1, 7] = np.nan
+    return data
+
+
+def test_frame_delta_values():
+    """Test filtering and distances without alignment"""
+    print("Test: Frame delta values")
+
+    data = _make_data()
+    model = FrameDeltaModel()
+    model.set_data(data)
+    delta = model.get(0, 1, False, False, "default", None)
+
+    assert delta is not None
+    assert delta.base_valid.shape == (477, 3)
+    assert delta.current_aligned.shape == (477, 3)
+    assert delta.base_both.shape == (476, 3)
+    assert delta.current_both.shape == (476, 3)
+
+    both = ~np.isnan(data[0]).any(axis=1) & ~np.isnan(data[1]).any(axis=1)
+    expected = np.sum((data[1][both] - data[0][both]) ** 2, axis=1)
+    assert np.allclose(delta.sq_distances, expected, atol=1e-6)
+
+    print("  ✓ Filtered landmarks and squared distances are correct")
+
+    # A mask precomputed by the caller gives the same result
+    model = FrameDeltaModel()
+    model.set_data(data, ~np.isnan(data).any(axis=2))
+    precomputed = model.get(0, 1, False, False, "default", None)
+    assert np.array_equal(precomputed.sq_distances, delta.sq_distances)
+    print("  ✓ Precomputed NaN mask is used")
+
+
+def test_frame_delta_cache():
+    """Test that results are reused until the data changes"""
+    print("\nTest: Frame delta cache")
+
+    data = _make_data()
+    model = FrameDeltaModel()
+    model.set_data(data)
+    delta = model.get(0, 1, True, True, "default", None)
+    assert model.get(0, 1, True, True, "default", None) is delta
+    print("  ✓ Same arguments return the cached result")
+
+    model.set_data(data)
+    assert model.get(0, 1, True, True, "default", None) is delta
+    print("  ✓ Setting the same data keeps the cache")
+
+    model.set_data(data.copy())
+    assert model.get(0, 1, True, True, "default", None) is not delta
+    print("  ✓ Setting new data invalidates the cache")
+
+
+def test_nan_summary():
+    """Test the one-pass NaN mask and count used when loading data"""
+    print("\nTest: NaN summary")
+
+    data = _make_data()
+    data[1, 9, 2] = np.nan
+    valid, nan_count = nan_summary(data.reshape(-1, 3))
+
+    assert np.array_equal(valid, ~np.isnan(data).any(axis=2).ravel())
+    assert nan_count == np.isnan(data).sum()
+    print("  ✓ Mask and NaN count match NumPy")
+
+
+def main():
+    """Run all tests"""
+    print("=" * 60)
+    print("Frame Delta Model Tests")
+    print("=" * 60)
+    print()
+
+    try:
+        test_frame_delta_values()
+        test_frame_delta_cache()
+        test_nan_summary()
+
+        print()
+        print("=" * 60)
+        print("All frame delta tests passed! ✓")
+        print("=" * 60)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main())
@@ -4,24 +4,26 @@ Comprehensive functionality test for Face Landmark Viewer
 """
 
 import sys
+
 import numpy as np
-from PySide6.QtWidgets import QApplication
-from PySide6.QtCore import Qt
-from vptry_facelandmarkview import FaceLandmarkViewer
+
+from _sample_data import load_sample_landmarks
 
 
 def test_load_data_programmatically():
     """Test loading data programmatically"""
     print("Test: Load data programmatically")
 
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
+    # Qt is imported here so test_data_access doesn't need it
+    from _qt_common import get_qapp
+    from vptry_facelandmarkview import FaceLandmarkViewer
+
+    get_qapp()
 
     viewer = FaceLandmarkViewer()
 
     # Load data
-    data = np.load("sample_landmarks.npy")
+    data = load_sample_landmarks()
     viewer.data = data
     n_frames, n_landmarks, _ = data.shape
 
@@ -89,6 +91,8 @@ def test_vector_display(viewer):
     """Test vector display toggle"""
     print("\nTest: Vector display")
 
+    from PySide6.QtCore import Qt
+
     # Test enabling vectors - manually call the handler with integer value
     viewer.show_vectors_checkbox.setChecked(True)
     viewer.on_show_vectors_changed(Qt.CheckState.Checked.value)
@@ -112,15 +116,13 @@ def test_data_access():
     """Test that data access patterns work correctly"""
     print("\nTest: Data access patterns")
 
-    data = np.load("sample_landmarks.npy")
+    data = load_sample_landmarks()
     n_frames, n_landmarks, _ = data.shape
 
     # Test accessing coordinates as specified in requirements
     fr = 0
     p = 0
-    x = data[fr][p][0]
-    y = data[fr][p][1]
-    z = data[fr][p][2]
+    x, y, z = data[fr, p]
 
     print(f"  ✓ dat[{fr}][{p}][0] (x) = {x:.3f}")
     print(f"  ✓ dat[{fr}][{p}][1] (y) = {y:.3f}")
@@ -128,7 +130,7 @@ def test_data_access():
 
     # Test base frame access
     base_frame = 0
-    base_landmarks = data[base_frame][:][:]
+    base_landmarks = data[base_frame]
     assert base_landmarks.shape == (n_landmarks, 3), (
         "Base landmarks shape should be (n_landmarks, 3)"
     )
@@ -140,6 +142,11 @@ def test_data_access():
     assert vectors.shape == (n_landmarks, 3), "Vectors shape should be (n_landmarks, 3)"
     print(f"  ✓ Vectors calculated correctly: shape {vectors.shape}")
 
+    # Vectors for every frame at once, broadcasting the base frame
+    all_vectors = data - data[base_frame : base_frame + 1]
+    np.testing.assert_array_equal(all_vectors[current_frame], vectors)
+    print(f"  ✓ Vectors for all frames calculated: shape {all_vectors.shape}")
+
 
 def main():
     """Run all functionality tests"""
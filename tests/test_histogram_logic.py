@@ -6,60 +6,67 @@ Test the histogram calculation logic without requiring GUI.
 import sys
 import numpy as np
 
+from _histogram_common import fill_uniform
+
+
+# Simple test data: 3 frames, 5 landmarks, 3 coordinates
+# (built once at import time and read-only)
+_DATA_3FRAMES = np.array(
+    [
+        # Frame 0 (base frame)
+        [
+            [0.0, 0.0, 0.0],
+            [1.0, 0.0, 0.0],
+            [0.0, 1.0, 0.0],
+            [0.0, 0.0, 1.0],
+            [1.0, 1.0, 1.0],
+        ],
+        # Frame 1 (moved slightly)
+        [
+            [0.1, 0.0, 0.0],
+            [1.1, 0.0, 0.0],
+            [0.0, 1.1, 0.0],
+            [0.0, 0.0, 1.1],
+            [1.0, 1.0, 1.0],
+        ],
+        # Frame 2 (moved more)
+        [
+            [0.5, 0.0, 0.0],
+            [1.5, 0.0, 0.0],
+            [0.0, 1.5, 0.0],
+            [0.0, 0.0, 1.5],
+            [1.0, 1.0, 1.0],
+        ],
+    ],
+    dtype=np.float64,
+)
+_DATA_3FRAMES.flags.writeable = False
+
+# Expected distances from the base frame for frames 1 and 2:
+# landmarks 0-3 moved by 0.1 (frame 1) and 0.5 (frame 2), landmark 4 didn't move
+_EXPECTED_DISTANCES = np.array([[0.1, 0.1, 0.1, 0.1, 0.0], [0.5, 0.5, 0.5, 0.5, 0.0]])
+_EXPECTED_DISTANCES.flags.writeable = False
+
 
 def test_distance_calculation():
     """Test that distance calculation works correctly"""
     print("Test: Distance calculation")
 
-    # Create simple test data
-    # 3 frames, 5 landmarks, 3 coordinates
-    data = np.array(
-        [
-            # Frame 0 (base frame)
-            [
-                [0.0, 0.0, 0.0],
-                [1.0, 0.0, 0.0],
-                [0.0, 1.0, 0.0],
-                [0.0, 0.0, 1.0],
-                [1.0, 1.0, 1.0],
-            ],
-            # Frame 1 (moved slightly)
-            [
-                [0.1, 0.0, 0.0],
-                [1.1, 0.0, 0.0],
-                [0.0, 1.1, 0.0],
-                [0.0, 0.0, 1.1],
-                [1.0, 1.0, 1.0],
-            ],
-            # Frame 2 (moved more)
-            [
-                [0.5, 0.0, 0.0],
-                [1.5, 0.0, 0.0],
-                [0.0, 1.5, 0.0],
-                [0.0, 0.0, 1.5],
-                [1.0, 1.0, 1.0],
-            ],
-        ]
-    )
-
     base_frame = 0
-    current_frame = 1
+    current_frames = [1, 2]
 
-    base_landmarks = data[base_frame]
-    current_landmarks = data[current_frame]
+    base_landmarks = _DATA_3FRAMES[base_frame]
+    current_landmarks = _DATA_3FRAMES[current_frames]
 
-    # Calculate distances manually
-    distances = np.linalg.norm(current_landmarks - base_landmarks, axis=1)
+    # Calculate distances manually, for all current frames at once
+    distances = np.linalg.norm(current_landmarks - base_landmarks, axis=-1)
 
     print(f"  Base landmarks:\n{base_landmarks}")
     print(f"  Current landmarks:\n{current_landmarks}")
     print(f"  Distances: {distances}")
 
     # Check expected distances
-    # Landmarks 0-3 moved by 0.1, landmark 4 didn't move
-    expected = np.array([0.1, 0.1, 0.1, 0.1, 0.0])
-
-    assert np.allclose(distances, expected), f"Expected {expected}, got {distances}"
+    np.testing.assert_allclose(distances, _EXPECTED_DISTANCES, rtol=0, atol=1e-12)
     print("  ✓ Distance calculation correct")
 
     return True
@@ -70,30 +77,38 @@ def test_histogram_creation():
     print("\nTest: Histogram creation with outliers")
 
     # Create data with some outliers
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
 
-    # Most values are small (0-1), with a few outliers (>2)
-    distances = np.concatenate(
-        [
-            np.random.uniform(0, 1, 95),  # 95 normal values
-            np.random.uniform(2, 5, 5),  # 5 outliers
-        ]
-    )
+    # Most values are small (0-1), with a few outliers (>2), drawn in place
+    distances = np.empty(100)
+    fill_uniform(rng, distances[:95], 0, 1)  # 95 normal values
+    fill_uniform(rng, distances[95:], 2, 5)  # 5 outliers
 
     print(f"  Total points: {len(distances)}")
     print(f"  Distance range: [{distances.min():.3f}, {distances.max():.3f}]")
 
-    # Calculate 95th percentile
-    percentile_95 = np.percentile(distances, 95)
+    # Calculate 95th percentile, as the widget does: the two order statistics
+    # around it come from an O(N) partition instead of a sort, and are
+    # interpolated linearly like np.percentile
+    n = len(distances)
+    position = 95 / 100 * (n - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, n - 1)
+    partitioned = np.partition(distances, (lower, upper))
+    percentile_95 = partitioned[lower] + (partitioned[upper] - partitioned[lower]) * (
+        position - lower
+    )
     print(f"  95th percentile: {percentile_95:.3f}")
 
-    # Count outliers
-    outlier_mask = distances > percentile_95
-    outlier_count = outlier_mask.sum()
+    # Count outliers. Everything up to the lower order statistic is at or
+    # below the percentile, so only the part above it needs comparing
+    tail = partitioned[lower + 1 :]
+    tail_kept = tail[tail <= percentile_95]
+    outlier_count = len(tail) - len(tail_kept)
     print(f"  Outlier count: {outlier_count}")
 
     # Create histogram for non-outliers
-    non_outlier_distances = distances[~outlier_mask]
+    non_outlier_distances = np.concatenate([partitioned[: lower + 1], tail_kept])
     hist_values, bin_edges = np.histogram(
         non_outlier_distances, bins=20, range=(0, percentile_95)
     )
@@ -148,24 +163,21 @@ def test_nan_handling():
     base_landmarks = data[0]
     current_landmarks = data[1]
 
-    # Filter out NaN values
-    base_valid_mask = ~np.isnan(base_landmarks).any(axis=1)
-    current_valid_mask = ~np.isnan(current_landmarks).any(axis=1)
-    both_valid_mask = base_valid_mask & current_valid_mask
-
-    base_both = base_landmarks[both_valid_mask]
-    current_both = current_landmarks[both_valid_mask]
+    # Filter out NaN values (one mask for landmarks valid in both frames)
+    nan_mask = np.isnan(base_landmarks) | np.isnan(current_landmarks)
+    both_valid_mask = ~nan_mask.any(axis=1)
+    valid_pairs = np.count_nonzero(both_valid_mask)
 
-    print(f"  Base landmarks valid: {base_valid_mask}")
-    print(f"  Current landmarks valid: {current_valid_mask}")
     print(f"  Both valid: {both_valid_mask}")
-    print(f"  Valid pairs: {len(base_both)}")
+    print(f"  Valid pairs: {valid_pairs}")
 
     # Only landmarks 0 and 3 are valid in both frames
-    assert len(base_both) == 2, f"Expected 2 valid pairs, got {len(base_both)}"
+    assert valid_pairs == 2, f"Expected 2 valid pairs, got {valid_pairs}"
 
     # Calculate distances for valid pairs
-    distances = np.linalg.norm(current_both - base_both, axis=1)
+    distances = np.linalg.norm(
+        current_landmarks[both_valid_mask] - base_landmarks[both_valid_mask], axis=1
+    )
     print(f"  Distances: {distances}")
 
     assert len(distances) == 2, f"Expected 2 distances, got {len(distances)}"
@@ -6,6 +6,10 @@ Test the histogram widget functionality without requiring full GUI rendering.
 import sys
 import numpy as np
 
+# Expected distances of frame 2 from the base frame in the creation test
+_EXPECTED_FRAME2_DISTANCES = np.full(4, 0.5)
+_EXPECTED_FRAME2_DISTANCES.flags.writeable = False
+
 
 def test_histogram_widget_creation():
     """Test that histogram widget can be created and data set"""
@@ -13,15 +17,13 @@ def test_histogram_widget_creation():
 
     try:
         # Skip if Qt is not available
-        from PySide6.QtWidgets import QApplication
+        from _qt_common import get_qapp
         from vptry_facelandmarkview.histogram_widget import HistogramWidget
     except ImportError as e:
         print(f"  ⚠ Skipping test (Qt not available): {e}")
         return True
 
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
+    get_qapp()
 
     # Create histogram widget
     widget = HistogramWidget()
@@ -36,7 +38,8 @@ def test_histogram_widget_creation():
             [[0.1, 0.0, 0.0], [1.1, 0.0, 0.0], [0.0, 1.1, 0.0], [0.0, 0.0, 1.1]],
             # Frame 2 (moved more)
             [[0.5, 0.0, 0.0], [1.5, 0.0, 0.0], [0.0, 1.5, 0.0], [0.0, 0.0, 1.5]],
-        ]
+        ],
+        dtype=np.float32,
     )
 
     # Set data
@@ -73,9 +76,9 @@ def test_histogram_widget_creation():
     # Distances should be recalculated
     assert widget.distances is not None, "Distances should be recalculated"
 
-    expected_distances = np.array([0.5, 0.5, 0.5, 0.5])
-    assert np.allclose(widget.distances, expected_distances), (
-        f"Expected distances {expected_distances}, got {widget.distances}"
+    # The widget works in float32, like the input data
+    np.testing.assert_allclose(
+        widget.distances, _EXPECTED_FRAME2_DISTANCES, rtol=0, atol=1e-6
     )
 
     print(f"  ✓ Distances recalculated: {widget.distances}")
@@ -95,15 +98,13 @@ def test_histogram_with_nan():
     print("\nTest: Histogram widget with NaN values")
 
     try:
-        from PySide6.QtWidgets import QApplication
+        from _qt_common import get_qapp
         from vptry_facelandmarkview.histogram_widget import HistogramWidget
     except ImportError as e:
         print(f"  ⚠ Skipping test (Qt not available): {e}")
         return True
 
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
+    get_qapp()
 
     widget = HistogramWidget()
 
@@ -124,7 +125,8 @@ def test_histogram_with_nan():
                 [0.5, 0.5, 0.0],
                 [0.0, 0.0, 1.1],
             ],
-        ]
+        ],
+        dtype=np.float32,
     )
 
     widget.set_data(data)
@@ -147,15 +149,13 @@ def test_histogram_no_data():
     print("\nTest: Histogram widget with no data")
 
     try:
-        from PySide6.QtWidgets import QApplication
+        from _qt_common import get_qapp
         from vptry_facelandmarkview.histogram_widget import HistogramWidget
     except ImportError as e:
         print(f"  ⚠ Skipping test (Qt not available): {e}")
         return True
 
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
+    get_qapp()
 
     widget = HistogramWidget()
 
@@ -4,18 +4,19 @@ Test script to validate the GUI layout improvements
 """
 
 import sys
-from PySide6.QtWidgets import QApplication, QVBoxLayout, QGridLayout
-from vptry_facelandmarkview import FaceLandmarkViewer
-from vptry_facelandmarkview.histogram_widget import HistogramWidget
 
 
 def test_layout_stretch_factors():
     """Test that layout components have correct stretch factors"""
     print("Test: Layout stretch factors")
 
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
+    # Qt is imported here so collecting this module stays cheap
+    from PySide6.QtWidgets import QVBoxLayout, QGridLayout
+    from _qt_common import get_qapp
+    from vptry_facelandmarkview import FaceLandmarkViewer
+    from vptry_facelandmarkview.histogram_widget import HistogramWidget
+
+    get_qapp()
 
     viewer = FaceLandmarkViewer()
 
@@ -32,31 +33,16 @@ def test_layout_stretch_factors():
     assert item_count == 4, f"Expected 4 items in layout, got {item_count}"
     print("  ✓ Layout has 4 items")
 
-    # Get stretch factors
-    # Item 0: control_layout
-    control_stretch = main_layout.stretch(0)
-    print(f"  ✓ control_layout stretch factor: {control_stretch}")
-    assert control_stretch == 0, (
-        f"control_layout should have stretch 0, got {control_stretch}"
-    )
-
-    # Item 1: slider_layout
-    slider_stretch = main_layout.stretch(1)
-    print(f"  ✓ slider_layout stretch factor: {slider_stretch}")
-    assert slider_stretch == 0, (
-        f"slider_layout should have stretch 0, got {slider_stretch}"
+    # Get stretch factors, all in one pass:
+    # control_layout, slider_layout, viz_grid (containing the 4 plot areas),
+    # info_label
+    stretches = tuple(main_layout.stretch(i) for i in range(item_count))
+    print(f"  ✓ Main layout stretch factors: {stretches}")
+    assert stretches == (0, 0, 1, 0), (
+        "control_layout, slider_layout, viz_grid, info_label should have "
+        f"stretch (0, 0, 1, 0), got {stretches}"
     )
 
-    # Item 2: viz_grid (containing the 4 plot areas)
-    viz_stretch = main_layout.stretch(2)
-    print(f"  ✓ viz_grid stretch factor: {viz_stretch}")
-    assert viz_stretch == 1, f"viz_grid should have stretch 1, got {viz_stretch}"
-
-    # Item 3: info_label
-    info_stretch = main_layout.stretch(3)
-    print(f"  ✓ info_label stretch factor: {info_stretch}")
-    assert info_stretch == 0, f"info_label should have stretch 0, got {info_stretch}"
-
     # Verify the viz_grid is a QGridLayout
     viz_grid_item = main_layout.itemAt(2)
     viz_grid = viz_grid_item.layout()
@@ -68,23 +54,19 @@ def test_layout_stretch_factors():
     assert grid_item_count == 4, f"Expected 4 items in viz_grid, got {grid_item_count}"
     print("  ✓ viz_grid has 4 widgets (xz, histogram, main, yz)")
 
-    # Verify grid stretch factors
-    row0_stretch = viz_grid.rowStretch(0)
-    row1_stretch = viz_grid.rowStretch(1)
-    col0_stretch = viz_grid.columnStretch(0)
-    col1_stretch = viz_grid.columnStretch(1)
-
-    print(f"  ✓ Grid row 0 (x-z) stretch: {row0_stretch}")
-    assert row0_stretch == 0, f"Grid row 0 should have stretch 0, got {row0_stretch}"
-
-    print(f"  ✓ Grid row 1 (main+yz) stretch: {row1_stretch}")
-    assert row1_stretch == 1, f"Grid row 1 should have stretch 1, got {row1_stretch}"
-
-    print(f"  ✓ Grid column 0 (x-z+main) stretch: {col0_stretch}")
-    assert col0_stretch == 1, f"Grid column 0 should have stretch 1, got {col0_stretch}"
-
-    print(f"  ✓ Grid column 1 (yz+histogram) stretch: {col1_stretch}")
-    assert col1_stretch == 0, f"Grid column 1 should have stretch 0, got {col1_stretch}"
+    # Verify grid stretch factors: row 0 (x-z), row 1 (main+yz),
+    # column 0 (x-z+main), column 1 (yz+histogram)
+    grid_stretches = (
+        viz_grid.rowStretch(0),
+        viz_grid.rowStretch(1),
+        viz_grid.columnStretch(0),
+        viz_grid.columnStretch(1),
+    )
+    print(f"  ✓ Grid row/column stretch factors: {grid_stretches}")
+    assert grid_stretches == (0, 1, 1, 0), (
+        "Grid rows 0, 1 and columns 0, 1 should have "
+        f"stretch (0, 1, 1, 0), got {grid_stretches}"
+    )
 
     # Verify histogram widget is present
     histogram_widget = viewer.histogram_widget
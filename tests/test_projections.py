@@ -4,22 +4,54 @@ Test script to validate the projection widgets work correctly
 """
 
 import sys
+import tempfile
+from functools import cache
+from pathlib import Path
+
 import numpy as np
-from PySide6.QtWidgets import QApplication
-from vptry_facelandmarkview import FaceLandmarkViewer
-from vptry_facelandmarkview.projection_widget import ProjectionWidget
 from vptry_facelandmarkview.constants import ProjectionType
 
 
+# Widgets that follow the viewer's frame and display settings, with the
+# names used in assertion messages
+SYNCED_WIDGETS = {"gl_widget": "Main", "xz_widget": "X-Z", "yz_widget": "Y-Z"}
+
+
+def _check_all(viewer, attr: str, expected: object) -> None:
+    """Assert that attr has the expected value in every synced widget's state
+
+    Booleans are compared by identity, like the `is True` checks they replace.
+    """
+    for widget_name, label in SYNCED_WIDGETS.items():
+        value = getattr(getattr(viewer, widget_name).state, attr)
+        matches = value is expected if isinstance(expected, bool) else value == expected
+        assert matches, f"{label} widget {attr} should be {expected}, got {value}"
+
+
+@cache
+def _shared_viewer():
+    """One viewer shared by the tests in this module, created on first use
+
+    Building a viewer (four visualization widgets and their GL setup) is the
+    slowest part of these tests. None of the tests depend on a fresh viewer:
+    only test_projection_sync changes its state, and the other tests check
+    widget types and fixed sizes.
+    """
+    # Qt is imported here so collecting this module stays cheap
+    from _qt_common import get_qapp
+    from vptry_facelandmarkview import FaceLandmarkViewer
+
+    get_qapp()
+    return FaceLandmarkViewer()
+
+
 def test_projection_widgets_exist():
     """Test that projection widgets are created"""
     print("Test: Projection widgets exist")
 
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
+    from vptry_facelandmarkview.projection_widget import ProjectionWidget
 
-    viewer = FaceLandmarkViewer()
+    viewer = _shared_viewer()
 
     # Check that projection widgets exist
     assert hasattr(viewer, "xz_widget"), "xz_widget should exist"
@@ -51,67 +83,48 @@ def test_projection_sync():
     """Test that projection widgets sync with main widget"""
     print("Test: Projection widgets sync with main widget")
 
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
+    viewer = _shared_viewer()
 
-    viewer = FaceLandmarkViewer()
+    # Create sample data. Only propagation is checked, so any deterministic,
+    # non-degenerate landmarks will do
+    sample_data = np.sin(np.arange(10 * 68 * 3, dtype=np.float32)).reshape(10, 68, 3)
 
-    # Create sample data
-    sample_data = np.random.randn(10, 68, 3)
+    # Load it through the viewer, which should pass it on to all widgets
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sample_file = Path(tmp_dir) / "projection_sync.npy"
+        np.save(sample_file, sample_data)
+        viewer.load_file_from_path(sample_file)
 
-    # Set data on viewer (which should update all widgets)
-    viewer.data = sample_data
-    viewer.gl_widget.set_data(sample_data)
-    viewer.xz_widget.set_data(sample_data)
-    viewer.yz_widget.set_data(sample_data)
-    viewer._update_projection_center_scale()
-
-    # Check that all widgets have data
-    assert viewer.gl_widget.data is not None, "Main widget should have data"
-    assert viewer.xz_widget.data is not None, "X-Z widget should have data"
-    assert viewer.yz_widget.data is not None, "Y-Z widget should have data"
+    # Check that all widgets share the viewer's data (not copies of it)
+    assert viewer.data is not None, "Viewer should have data"
+    assert viewer.gl_widget.data is viewer.data, "Main widget should share data"
+    assert viewer.xz_widget.data is viewer.data, "X-Z widget should share data"
+    assert viewer.yz_widget.data is viewer.data, "Y-Z widget should share data"
     print("  ✓ All widgets have data")
 
     # Test frame sync
     viewer.on_frame_changed(5)
-    assert viewer.gl_widget.current_frame == 5, "Main widget frame should be 5"
-    assert viewer.xz_widget.current_frame == 5, "X-Z widget frame should be 5"
-    assert viewer.yz_widget.current_frame == 5, "Y-Z widget frame should be 5"
+    _check_all(viewer, "current_frame", 5)
     print("  ✓ Frame changes sync across all widgets")
 
     # Test base frame sync
     viewer.on_base_frame_changed(3)
-    assert viewer.gl_widget.base_frame == 3, "Main widget base frame should be 3"
-    assert viewer.xz_widget.base_frame == 3, "X-Z widget base frame should be 3"
-    assert viewer.yz_widget.base_frame == 3, "Y-Z widget base frame should be 3"
+    _check_all(viewer, "base_frame", 3)
     print("  ✓ Base frame changes sync across all widgets")
 
     # Test show vectors sync
     viewer.on_show_vectors_changed(2)  # 2 = Checked
-    assert viewer.gl_widget.show_vectors is True, "Main widget should show vectors"
-    assert viewer.xz_widget.show_vectors is True, "X-Z widget should show vectors"
-    assert viewer.yz_widget.show_vectors is True, "Y-Z widget should show vectors"
+    _check_all(viewer, "show_vectors", True)
     print("  ✓ Show vectors setting syncs across all widgets")
 
     # Test align faces sync
     viewer.on_align_faces_changed(2)  # 2 = Checked
-    assert viewer.gl_widget.align_faces is True, "Main widget should align faces"
-    assert viewer.xz_widget.align_faces is True, "X-Z widget should align faces"
-    assert viewer.yz_widget.align_faces is True, "Y-Z widget should align faces"
+    _check_all(viewer, "align_faces", True)
     print("  ✓ Align faces setting syncs across all widgets")
 
     # Test static points sync
     viewer.on_use_static_points_changed(2)  # 2 = Checked
-    assert viewer.gl_widget.use_static_points is True, (
-        "Main widget should use static points"
-    )
-    assert viewer.xz_widget.use_static_points is True, (
-        "X-Z widget should use static points"
-    )
-    assert viewer.yz_widget.use_static_points is True, (
-        "Y-Z widget should use static points"
-    )
+    _check_all(viewer, "use_static_points", True)
     print("  ✓ Static points setting syncs across all widgets")
 
     # Check that center and scale are shared
@@ -128,11 +141,7 @@ def test_widget_dimensions():
     """Test that projection widgets have correct fixed dimensions"""
     print("Test: Projection widget dimensions")
 
-    app = QApplication.instance()
-    if app is None:
-        app = QApplication(sys.argv)
-
-    viewer = FaceLandmarkViewer()
+    viewer = _shared_viewer()
 
     # Check X-Z widget height
     assert viewer.xz_widget.maximumHeight() == 100, (
@@ -5,8 +5,8 @@ Test UI integration with alignment methods
 
 import sys
 from pathlib import Path
-import numpy as np
-from PySide6.QtWidgets import QApplication
+from _qt_common import get_qapp
+from _sample_data import get_sample_landmarks_path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -14,20 +14,18 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from vptry_facelandmarkview.viewer import FaceLandmarkViewer
 from vptry_facelandmarkview.alignments import get_available_alignment_methods
 
+# Method names the dropdown should offer, in any order
+EXPECTED_METHODS = frozenset(get_available_alignment_methods())
+
 
 def test_ui_integration():
     """Test that the UI integrates properly with alignment methods"""
     print("Test: UI integration with alignment methods")
 
-    QApplication(sys.argv)
+    get_qapp()
 
-    # Create sample data file if it doesn't exist
-    sample_file = Path("sample_landmarks.npy")
-    if not sample_file.exists():
-        print("  Generating sample data...")
-        # Create simple sample data
-        data = np.random.randn(10, 20, 3) * 10
-        np.save(sample_file, data)
+    # Sample data file, generated if it doesn't exist yet
+    sample_file = get_sample_landmarks_path()
 
     # Create viewer with sample data
     viewer = FaceLandmarkViewer(initial_file=sample_file)
@@ -38,20 +36,20 @@ def test_ui_integration():
 
     # Check dropdown items
     methods = get_available_alignment_methods()
-    combo_items = [
-        viewer.alignment_method_combo.itemText(i)
-        for i in range(viewer.alignment_method_combo.count())
-    ]
+    combo = viewer.alignment_method_combo
+    n_items = combo.count()
+    combo_items = [combo.itemText(i) for i in range(n_items)]
     print(f"  Dropdown items: {combo_items}")
-    assert set(combo_items) == set(methods)
+    assert frozenset(combo_items) == EXPECTED_METHODS
     print("  ✓ Dropdown contains all alignment methods")
 
-    # Test changing alignment method
+    # Test changing alignment method, checking all methods in one assertion
+    observed = []
     for method in methods:
-        index = combo_items.index(method)
-        viewer.alignment_method_combo.setCurrentIndex(index)
-        assert viewer.alignment_method == method
-        print(f"  ✓ Changed to method: {method}")
+        combo.setCurrentIndex(combo_items.index(method))
+        observed.append(viewer.alignment_method)
+    assert observed == methods, f"Expected methods {methods}, observed {observed}"
+    print(f"  ✓ Changed to each method: {', '.join(methods)}")
 
     # Test that widgets have the set_alignment_method method
     for widget_name in ["gl_widget", "xz_widget", "yz_widget", "histogram_widget"]:
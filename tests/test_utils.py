@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Test the NumPy helpers in the utils module
+"""
+
+import sys
+
+import numpy as np
+from vptry_facelandmarkview.utils import (
+    aabb_outside_frustum,
+    filter_nan_landmarks,
+    calculate_center_and_scale,
+    camera_matrix,
+    perspective_matrix,
+    scale_landmarks_for_display,
+    valid_landmark_mask,
+)
+
+# Test data with one NaN landmark (row 1)
+TEST_DATA = np.array(
+    [
+        [1.0, 2.0, 3.0],
+        [4.0, np.nan, 6.0],
+        [7.0, 8.0, 9.0],
+    ]
+)
+TEST_DATA.flags.writeable = False
+
+
+def test_valid_landmark_mask():
+    """Test the NaN mask on a single frame and on a data cube"""
+    print("Test: valid_landmark_mask")
+
+    _, valid_mask = filter_nan_landmarks(TEST_DATA)
+    cube = np.stack([TEST_DATA, TEST_DATA[::-1]])
+    assert np.array_equal(valid_landmark_mask(TEST_DATA), valid_mask)
+    assert np.array_equal(valid_landmark_mask(cube), ~np.isnan(cube).any(axis=2)), (
+        "Cube mask should match per-frame masks"
+    )
+    print("  ✓ valid_landmark_mask works")
+
+
+def test_assume_clean():
+    """Test that assume_clean skips the scan and keeps every landmark"""
+    print("\nTest: assume_clean")
+
+    clean = np.nan_to_num(TEST_DATA)
+    kept, kept_mask = filter_nan_landmarks(clean, assume_clean=True)
+    assert kept is clean and kept_mask.all() and len(kept_mask) == 3
+    print("  ✓ assume_clean skips NaN filtering")
+
+
+def test_scale_landmarks_for_display():
+    """Test centering, scaling and flipping Y for display"""
+    print("\nTest: scale_landmarks_for_display")
+
+    valid_landmarks, _ = filter_nan_landmarks(TEST_DATA)
+    center, scale = calculate_center_and_scale(valid_landmarks)
+    scaled = scale_landmarks_for_display(valid_landmarks, center, scale)
+    expected = (valid_landmarks - center) * scale
+    expected[:, 1] *= -1
+    np.testing.assert_allclose(scaled, expected)
+    print("  ✓ scale_landmarks_for_display works")
+
+
+def test_perspective_matrix():
+    """Test the projection matrix (90 degree FOV gives f = 1)"""
+    print("\nTest: perspective_matrix")
+
+    proj = perspective_matrix(90.0, 2.0, 1.0, 3.0)
+    assert proj.dtype == np.float32, "Projection matrix should be float32"
+    np.testing.assert_allclose(proj[0, 0], 0.5, rtol=1e-6)
+    np.testing.assert_allclose(proj[1, 1], 1.0, rtol=1e-6)
+    np.testing.assert_allclose(proj[2, 2], -2.0, rtol=1e-6)
+    np.testing.assert_allclose(proj[3, 2], -3.0, rtol=1e-6)
+    assert proj[2, 3] == -1.0, "Perspective divide term should be -1"
+    print("  ✓ perspective_matrix works")
+
+
+def test_camera_matrix():
+    """Test the camera matrix"""
+    print("\nTest: camera_matrix")
+
+    # Rotating 90 degrees around Y maps +X to -Z, then the zoom translation
+    # pushes it further back
+    view = camera_matrix(2.0, 0.0, 90.0).T  # back to row-major
+    np.testing.assert_allclose(view @ [1.0, 0.0, 0.0, 1.0], [0, 0, -3, 1], atol=1e-6)
+    print("  ✓ camera_matrix works")
+
+
+def test_aabb_outside_frustum():
+    """Test culling of bounding boxes against the view frustum"""
+    print("\nTest: aabb_outside_frustum")
+
+    # A box at the origin is in view, one far off to the side is not, and
+    # one enclosing the camera is not culled
+    clip_mtx = camera_matrix(3.0, 20.0, 30.0) @ perspective_matrix(
+        45.0, 1.0, 0.1, 100.0
+    )
+    assert not aabb_outside_frustum(-np.ones(3), np.ones(3), clip_mtx)
+    assert aabb_outside_frustum(np.full(3, 50.0), np.full(3, 51.0), clip_mtx)
+    assert not aabb_outside_frustum(np.full(3, -100.0), np.full(3, 100.0), clip_mtx)
+    print("  ✓ aabb_outside_frustum works")
+
+
+def main():
+    """Run all utils tests"""
+    print("=" * 60)
+    print("Utils Tests")
+    print("=" * 60)
+    print()
+
+    try:
+        test_valid_landmark_mask()
+        test_assume_clean()
+        test_scale_landmarks_for_display()
+        test_perspective_matrix()
+        test_camera_matrix()
+        test_aabb_outside_frustum()
+
+        print()
+        print("=" * 60)
+        print("All utils tests passed! ✓")
+        print("=" * 60)
+        return 0
+
+    except Exception as e:
+        print(f"\n✗ Test failed: {e}")
+        import traceback
+
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
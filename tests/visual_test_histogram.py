@@ -4,26 +4,41 @@ Visual test for the histogram widget - loads sample data and takes a screenshot.
 """
 
 import sys
-import time
 from pathlib import Path
 
-from PySide6.QtWidgets import QApplication
+from PySide6.QtTest import QTest
 
 from vptry_facelandmarkview import FaceLandmarkViewer
 
+from _qt_common import get_qapp
+from _sample_data import get_sample_landmarks_path
 
-def take_screenshot(viewer, filename="histogram_test.png"):
-    """Take a screenshot of the viewer window"""
-    # Wait a bit for rendering to complete
-    QApplication.processEvents()
-    time.sleep(0.5)
+# How long to keep processing events after a change before grabbing the
+# window. QTest.qWait pumps the event loop while it waits, so pending
+# updates are delivered instead of sleeping blindly.
+SETTLE_MS = 50
 
-    # Grab the window
-    pixmap = viewer.grab()
+# Qt maps PNG quality to zlib level as (100 - quality) * 9 / 91, so 80 gives
+# the fastest compressing level 1; the screenshots are only for review
+PNG_QUALITY = 80
+
+
+def take_screenshot(viewer, filename="histogram_test.png", full_window=False):
+    """Take a screenshot of the histogram widget, or of the whole viewer window
+
+    Grabbing only the histogram widget skips compositing the other widgets
+    and reading back the 3D view's framebuffer.
+    """
+    # Let pending updates run; grab() then renders the widget itself
+    QTest.qWait(SETTLE_MS)
+
+    # Grab the histogram (or the whole window)
+    target = viewer if full_window else viewer.histogram_widget
+    pixmap = target.grab()
 
     # Save the screenshot
     output_path = Path(filename)
-    pixmap.save(str(output_path))
+    pixmap.save(str(output_path), "PNG", PNG_QUALITY)
     print(f"Screenshot saved to: {output_path.absolute()}")
 
     return output_path
@@ -35,47 +50,44 @@ def main():
     print("Visual Test: Histogram Widget")
     print("=" * 60)
 
-    QApplication(sys.argv)
+    # Pass --full to capture the whole window instead of just the histogram
+    full_window = "--full" in sys.argv[1:]
+
+    get_qapp()
 
-    # Create viewer
-    sample_file = Path("sample_landmarks.npy")
-    if not sample_file.exists():
-        print(f"Error: {sample_file} not found. Run generate_sample_data.py first.")
-        return 1
+    # Create viewer, generating the sample data if it doesn't exist yet
+    sample_file = get_sample_landmarks_path()
 
     print(f"Loading sample data from: {sample_file}")
     viewer = FaceLandmarkViewer(initial_file=sample_file, initial_base_frame=0)
     viewer.show()
 
-    # Wait for window to be fully rendered
-    QApplication.processEvents()
-    time.sleep(0.2)
+    # Wait for window to be shown on screen
+    if not QTest.qWaitForWindowExposed(viewer):
+        print("Warning: window was not exposed, screenshots may be blank")
 
     # Set to a frame with some movement to see the histogram
     if viewer.data is not None and viewer.data.shape[0] > 10:
         viewer.frame_slider.setValue(10)
-        QApplication.processEvents()
-        time.sleep(0.2)
+        QTest.qWait(SETTLE_MS)
 
     # Take screenshot with default view
-    take_screenshot(viewer, "histogram_test_default.png")
+    take_screenshot(viewer, "histogram_test_default.png", full_window)
     print("✓ Screenshot 1: Default view")
 
     # Enable alignment mode
     viewer.align_faces_checkbox.setChecked(True)
-    QApplication.processEvents()
-    time.sleep(0.2)
+    QTest.qWait(SETTLE_MS)
 
-    take_screenshot(viewer, "histogram_test_aligned.png")
+    take_screenshot(viewer, "histogram_test_aligned.png", full_window)
     print("✓ Screenshot 2: With alignment enabled")
 
     # Move to a different frame with more movement
     if viewer.data is not None and viewer.data.shape[0] > 25:
         viewer.frame_slider.setValue(25)
-        QApplication.processEvents()
-        time.sleep(0.2)
+        QTest.qWait(SETTLE_MS)
 
-        take_screenshot(viewer, "histogram_test_frame25.png")
+        take_screenshot(viewer, "histogram_test_frame25.png", full_window)
         print("✓ Screenshot 3: Frame 25 with alignment")
 
     print()